@@ -13,6 +13,8 @@ NOTIFY_EMAIL = os.getenv("NOTIFY_EMAIL")
 
 # Tistory Blog (블로그 이름만 필요 - URL 생성용)
 TISTORY_BLOG_NAME = os.getenv("TISTORY_BLOG_NAME")
+# Tistory Open API (자동 발행용, 없으면 수동 발행)
+TISTORY_ACCESS_TOKEN = os.getenv("TISTORY_ACCESS_TOKEN")
 
 # Content Categories (weight 합계 = 1.0)
 CATEGORIES = {
@@ -56,4 +58,205 @@ ARTICLE_CONFIG = {
     "min_length": 1500,
     "max_length": 2500,
     "keyword_density": 0.025,  # 2.5%
+    "max_keyword_density": 0.06,  # 6% 초과 시 키워드 남용
+    "min_headings": 3,  # 최소 h2 소제목 수
+    "max_repairs": 1,  # 기준 미달 시 보정 요청 최대 횟수
+    # 소제목 변경 방식
+    # - diff: 소제목만 추출해서 {기존: 새 소제목} JSON을 받아 원문에 교체 (출력 토큰 최소화)
+    # - full: 본문 전체를 보내고 소제목이 바뀐 전체 HTML을 받음 (기존 방식)
+    "sub_title_mode": "diff",
+}
+
+# Headline History (이미 본 헤드라인 기록)
+HEADLINE_HISTORY = {
+    "ttl_days": 7,  # 이 기간 동안 다시 보이지 않으면 만료
+    "max_per_category": 5000,
+}
+
+# Publish Approval Server (gunicorn -w 4 "src.approval_server:create_app()")
+APPROVAL_SERVER = {
+    "host": "127.0.0.1",
+    "port": 8000,
+    "page_size": 20,
+    "preview_max_age": 3600,  # 미리보기 Cache-Control max-age (초)
+    # 승인 화면/미리보기/승인 요청에 필요한 토큰 (피드/사이트맵은 공개, 비우면 serve 실행 시 임시 토큰 생성)
+    "token": os.getenv("APPROVAL_TOKEN", ""),
+}
+
+# Tistory Publishing (python main.py publish)
+TISTORY_PUBLISH = {
+    "api_url": os.getenv("TISTORY_API_URL", "https://www.tistory.com/apis"),
+    "max_concurrency": 4,  # 동시 발행 수
+    "rate_per_sec": 1.0,  # 초당 최대 API 요청 수
+    "max_retries": 3,
+    "timeout": 30,
+    "visibility": 3,  # 0: 비공개, 1: 보호, 3: 발행
+}
+
+# Gemini Model Routing (작업별 모델 우선순위/출력 한도, 실패·지연 시 다음 모델로 폴백)
+MODEL_ROUTES = {
+    "unified": {
+        "models": ["gemini-2.5-flash", "gemini-2.0-flash"],
+        "max_output_tokens": 16384,
+        "response_mime_type": "application/json",
+        "timeout": 180,
+        "slow_seconds": 90,  # 이보다 느리면 해당 모델을 잠시 후순위로
+    },
+    "sub_title": {
+        "models": ["gemini-2.5-flash-lite", "gemini-2.0-flash-lite", "gemini-2.5-flash"],
+        "max_output_tokens": 16384,  # 본문 전체를 다시 씀 (잘리면 그대로 content로 저장됨)
+        "response_mime_type": "text/plain",
+        "timeout": 90,
+        "slow_seconds": 30,
+    },
+    "sub_title_diff": {
+        "models": ["gemini-2.5-flash-lite", "gemini-2.0-flash-lite", "gemini-2.5-flash"],
+        "max_output_tokens": 1024,
+        "response_mime_type": "application/json",
+        "timeout": 30,
+        "slow_seconds": 10,
+    },
+    "experience": {
+        "models": ["gemini-2.5-flash", "gemini-2.0-flash"],
+        "max_output_tokens": 16384,  # 글 전체를 생성하므로 unified와 같은 한도
+        "response_mime_type": "application/json",
+        "timeout": 120,
+        "slow_seconds": 60,
+    },
+    "repair": {
+        "models": ["gemini-2.5-flash", "gemini-2.0-flash"],
+        "max_output_tokens": 16384,  # 글 전체 JSON을 다시 출력
+        "response_mime_type": "application/json",
+        "timeout": 120,
+        "slow_seconds": 60,
+    },
+}
+
+MODEL_ROUTING = {
+    "error_cooldown": 300,  # 할당량/서버 오류 후 후순위 유지 시간 (초)
+    "slow_cooldown": 600,  # 지연 후 후순위 유지 시간 (초)
+}
+
+# 모델별 가격 (USD / 1M 토큰: 입력, 출력) - 비용 통계용
+MODEL_PRICING = {
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+}
+
+# Speculative Pre-generation (python main.py pregenerate → info --use-draft)
+PREGENERATION = {
+    "max_age_hours": 12,  # 이보다 오래된 초안은 사용하지 않음
+    "max_new_ratio": 0.6,  # 신선도 확인 시 새 헤드라인 비율이 이보다 크면 초안 폐기
+    "keep_per_category": 3,
+}
+
+# 모음 메일 (여러 글을 목차가 있는 메일 한 통으로, python main.py backfill --digest)
+EMAIL_DIGEST = {
+    "max_bytes": 18 * 1024 * 1024,  # 한 통의 예상 크기 상한 (Gmail 25MB 제한에 여유를 둠, 첨부 base64 포함)
+    "max_articles": 20,  # 한 통에 넣을 최대 글 수
+}
+
+# 프로파일링 (python main.py <명령> --profile cpu|mem|both)
+PROFILING = {
+    "sample_interval": 0.005,  # 스택 샘플링 간격 (초, flamegraph용)
+    "top_n": 15,  # 요약에 보여줄 상위 함수/할당 위치 수
+    "trace_frames": 1,  # tracemalloc 트레이스백 깊이
+}
+
+# 대량 재생성/백필 (python main.py backfill --workers N)
+BACKFILL = {
+    "workers": 2,
+    "requests_per_minute": 10,  # 모든 작업 프로세스 합산 Gemini 호출 수 제한
+    "lease_seconds": 900,  # 이 시간 안에 끝나지 않은 작업은 다른 프로세스가 다시 가져감
+    "max_attempts": 3,
+    "progress_interval": 5,  # 진행 상황 출력 간격 (초)
+}
+
+# 카테고리 스케줄러 (최근 생성 이력 + 새 뉴스량 기반, 장기적으로 CATEGORIES weight 비율 유지)
+CATEGORY_SCHEDULER = {
+    "window_days": 14,  # 생성 이력을 볼 기간
+    "volume_days": 3,  # 새 뉴스량을 볼 기간 (headline_store 수집 통계)
+    "volume_target": 0.5,  # 새 헤드라인 비율이 이 이상이면 가중치 그대로
+    "volume_floor": 0.25,  # 새 뉴스가 거의 없어도 가중치를 이 비율 아래로 줄이지 않음
+}
+
+# 중복 글 검사 (MinHash/LSH, 제목 + 선정 주제 + 태그)
+DEDUP = {
+    "bands": 16,  # bands x rows = MinHash 해시 수
+    "rows": 4,  # 유사도 약 (1/bands)^(1/rows) = 0.5 이상이면 후보로 잡힘
+    "threshold": 0.5,  # 이 이상이면 중복으로 판단
+    "shingle_size": 3,  # 글자 n-gram 크기
+    "window_days": 90,  # 이 기간 안의 글만 비교
+    "max_candidates": 32,  # LSH 후보 중 정밀 비교할 최대 수 (겹친 밴드 수 순)
+    "bucket_limit": 64,  # 버킷당 조회할 최대 글 수 (흔한 표현으로 커진 버킷 대비)
+    "max_regenerations": 1,  # 중복이면 제외 힌트를 넣어 다시 생성하는 횟수 (이후에는 표시만)
+}
+
+# 썸네일 (local: 표준 라이브러리로 즉시 렌더링, remote: Pollinations.ai 이미지 생성)
+THUMBNAIL = {
+    "default": "local",  # local 또는 remote (remote 실패/시간 초과 시 local로 대체)
+    "remote_timeout": 20,  # 원격 이미지 생성 대기 시간 (초)
+    "size": 1024,
+    "chunk_size": 64 * 1024,  # 원격 이미지를 이 크기씩 받아 바로 파일에 씀
+    # 축소본 (Pillow 설치 시 생성, size는 긴 변 기준 px)
+    "variants": {
+        "blog": {"size": 800, "format": "webp", "quality": 80},
+        "email": {"size": 480, "format": "jpeg", "quality": 82},
+    },
+    "email_embed": True,  # 이메일에 로컬 썸네일을 첨부 이미지(cid)로 넣음 (꺼두면 원격 URL)
+}
+
+# 외부 서비스 서킷 브레이커 (data/health.json, python main.py health로 확인)
+CIRCUIT_BREAKER = {
+    "failure_threshold": 3,  # 연속 실패 횟수가 이 이상이면 차단 (대체 경로 사용)
+    "open_seconds": 300,  # 차단 후 시험 호출까지 대기 시간 (초)
+    "max_open_seconds": 3600,  # 시험 호출이 실패할 때마다 대기 시간 2배, 최대값
+    "probe_seconds": 120,  # 시험 호출 하나가 진행 중인 동안 다른 프로세스는 대체 경로 사용
+}
+
+# 상위 헤드라인 본문 보강 (python main.py info --enrich, data/enrich_cache.db에 URL별 캐시)
+ENRICHMENT = {
+    "enabled": False,  # 기본값 (--enrich로 켬)
+    "top_k": 5,  # 본문을 받아 올 상위 헤드라인 수
+    "max_chars": 1200,  # 기사별 발췌 최대 글자 수 (문장 끝에서 자름)
+    "min_paragraph": 40,  # 이보다 짧은 문단은 본문 후보에서 제외
+    "concurrency": 8,  # 전체 동시 연결 수
+    "per_host": 2,  # 같은 사이트 동시 요청 수
+    "timeout": 8,  # 요청별 시간 제한 (초)
+    "deadline": 12,  # 보강 단계 전체 대기 시간 상한 (초, 넘으면 받은 것만 사용)
+    "ttl_hours": 24,  # 추출 성공 캐시 유지 시간
+    "failure_ttl_hours": 1,  # 추출 실패 캐시 유지 시간 (그동안 같은 URL 다시 요청 안 함)
+}
+
+# 글/캐시 저장 압축 (python main.py compress로 공용 사전 학습 + 기존 파일 변환)
+RECORD_COMPRESSION = {
+    "codec": "auto",  # auto: zstandard 설치 시 zstd, 없으면 zlib / gzip, lzma, none(예전처럼 평문 JSON)
+    "levels": {"zstd": 19, "zlib": 9, "gzip": 9, "lzma": 6},
+    "dictionary": True,  # 학습된 공용 사전 사용 (data/dictionaries/, 작은 레코드일수록 효과 큼)
+    "dict_size": 64 * 1024,  # zstd 사전 크기 (zlib 사전은 deflate 창 크기인 32KB까지)
+    "train_samples": 500,  # 사전 학습에 쓸 최근 레코드 수
+    "min_train_samples": 20,  # 레코드가 이보다 적으면 학습하지 않음 (사전이 몇 개 글을 통째로 외우게 됨)
+}
+
+# 로그 (콘솔 + data/logs/<run_id>.jsonl, 기록은 큐에 넣고 별도 스레드가 출력)
+LOGGING = {
+    "level": "INFO",  # 기본 레벨
+    "modules": {},  # 모듈별 레벨, 예: {"content_generator": "DEBUG", "news_collector": "WARNING"}
+    "console": "text",  # text: 메시지만 (예전 print 출력과 같음) / json: 콘솔에도 JSON Lines / none
+    "json_dir": "data/logs",  # 실행별 JSON Lines 파일 위치 (main.py 실행 시, None이면 안 씀)
+    "queue_size": 10000,  # 출력이 밀려 큐가 가득 차면 기다리지 않고 버림 (버린 건수는 다음 기록에 표시)
+    "max_message": 2000,  # 메시지 최대 글자 수
+    "max_payload": 1000,  # 응답 원문 등 첨부 데이터 최대 글자 수 (앞/뒤 절반씩 남김)
+}
+
+# 우리 글 RSS 피드/사이트맵 (글 저장 시마다 갱신, data/feed/)
+FEED = {
+    "enabled": True,
+    "site_url": os.getenv("FEED_SITE_URL", "http://127.0.0.1:8000"),  # 피드/사이트맵 파일을 제공하는 주소
+    "title": "Auto-Blog",
+    "description": "AI 뉴스 흐름을 정리한 블로그 글",
+    "items": 50,  # 피드에 남길 최근 글 수
+    "max_categories": 5,  # 글마다 피드에 넣을 태그 수
 }
@@ -3,140 +3,673 @@ Auto-Blog 메인 스크립트
 뉴스 수집 → 글 생성 → 이메일 발송 파이프라인
 """
 import argparse
-import json
-import uuid
-from datetime import datetime
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
+from config.settings import CATEGORIES, DEDUP, FEED, RECORD_COMPRESSION
+from src import email_sender, thumbnail_generator
+from src.article_archive import ARCHIVE_PATH, ArchiveReader, pack_article_store
+from src.article_enricher import ExtractionCache
+from src.article_store import ArticleStore
+from src.backfill import JobQueue, run_backfill
+from src.cassette import Cassette, use_cassette
+from src.dedup_index import DedupIndex
+from src.draft_store import DraftStore
+from src.feed_builder import FeedBuilder
+from src.headline_store import HeadlineStore
+from src.health import get_health
+from src.logs import flush_logs, get_logger, log_context, parse_levels, run_id, setup_logging
 from src.news_collector import NewsCollector
+from src.preview_store import PreviewStore
+from src.profiler import RunProfiler, use_profiler
+from src.record_codec import get_codec, list_records, read_record
 from src.content_generator import ContentGenerator
 from src.email_sender import EmailSender
+from src.html_processor import process_article_files
 
+logger = get_logger("main")
 
 # 글 저장소
-ARTICLES_DIR = Path(__file__).parent / "data" / "articles"
-ARTICLES_DIR.mkdir(parents=True, exist_ok=True)
+article_store = ArticleStore()
+ARTICLES_DIR = article_store.articles_dir
 
 
 def save_article(article: dict) -> str:
-    """글 저장 및 ID 반환"""
-    article_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
-    article["id"] = article_id
-    article["created_at"] = datetime.now().isoformat()
-
-    file_path = ARTICLES_DIR / f"{article_id}.json"
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(article, f, ensure_ascii=False, indent=2)
+    """글 저장 및 ID 반환 (승인 화면용 미리보기도 함께 렌더링)"""
+    article_id = article_store.save(article)
+
+    try:
+        PreviewStore().render(article)
+    except Exception as e:
+        logger.warning(f"  미리보기 렌더링 실패 (승인 화면에서 다시 렌더링): {e}")
+
+    index = DedupIndex()
+    index.add(article)
+    index.close()
+
+    # 피드/사이트맵 항목 기록 (공개 파일에는 티스토리 발행 후 반영)
+    if FEED["enabled"]:
+        try:
+            with FeedBuilder() as feed:
+                feed.add(article)
+        except Exception as e:
+            logger.warning(f"  피드/사이트맵 갱신 실패 (python main.py feed로 다시 생성): {e}")
 
     return article_id
 
 
-def generate_info_article(category: str = None, use_cache: bool = True) -> dict:
+def avoid_duplicate(article: dict, generator: ContentGenerator = None, news_data: dict = None) -> dict:
+    """최근 글과 주제가 겹치면 제외 힌트를 넣어 다시 생성 (generator가 없거나 계속 겹치면 duplicate_of 표시)"""
+    index = DedupIndex()
+    try:
+        added = index.sync(article_store)
+        if added:
+            logger.info(f"  - 중복 검사 인덱스에 {added}건 추가")
+
+        avoid_topics = []
+        for attempt in range(DEDUP["max_regenerations"] + 1):
+            matches = index.find_similar(article)
+            if not matches:
+                return article
+
+            top = matches[0]
+            logger.warning(f"  ⚠️ 최근 글과 비슷함 ({top['similarity']:.0%}): {top['title']} [{top['id']}]")
+            if generator is None or attempt == DEDUP["max_regenerations"]:
+                article["duplicate_of"] = top
+                return article
+
+            logger.info("  - 겹치는 주제를 제외하고 다시 생성")
+            for match in matches:
+                avoid_topics.extend(t for t in (match["selected_topic"], match["title"]) if t and t not in avoid_topics)
+            try:
+                article = generator.generate_unified_article(news_data, use_cache=False, avoid_topics=avoid_topics)
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"  - 다시 생성 실패, 기존 글 유지: {e}")
+                article["duplicate_of"] = top
+                return article
+            logger.info(f"  - 새 제목: {article['title']}")
+        return article
+    finally:
+        index.close()
+
+
+def generate_info_article(
+    category: str = None,
+    use_cache: bool = True,
+    only_new: bool = False,
+    use_draft: bool = False,
+    freshness_check: bool = False,
+    enrich: bool = None,
+) -> dict:
     """정보형 글 생성 파이프라인 (통합 방식 - 1회 API 호출)
 
     뉴스 흐름 분석 + 주제 선정 + 글 생성을 1회 API 호출로 처리
+    only_new=True 이면 이전에 본 헤드라인을 제외하고, 새 헤드라인이 없으면 생성을 건너뜀
+    use_draft=True 이면 미리 생성된 초안을 먼저 사용 (freshness_check로 뉴스 변화 확인)
+    enrich=True 이면 상위 헤드라인 기사 본문 발췌를 프롬프트에 추가 (None이면 설정값)
     """
-    print("=" * 50)
-    print("정보형 글 생성 시작 (통합 방식)")
-    print("=" * 50)
+    logger.info("=" * 50)
+    logger.info("정보형 글 생성 시작 (통합 방식)")
+    logger.info("=" * 50)
 
-    # 1. 뉴스 제목 수집
-    print("\n[1/3] 뉴스 제목 수집 중...")
     collector = NewsCollector()
-    news_data = collector.collect_news_titles(category)
+
+    # 0. 미리 생성된 초안 사용 (있으면 수집/생성 단계 생략)
+    if use_draft:
+        logger.info("\n[0/3] 미리 생성된 초안 확인 중...")
+        # 카테고리를 먼저 정하고 그 카테고리의 초안만 사용 (초안이 없으면 같은 카테고리로 평소처럼 생성)
+        category = category or collector.select_category()
+        draft = take_draft(collector, category, freshness_check)
+        if draft is not None:
+            drafts = DraftStore()
+            article = draft["article"]
+            logger.info(f"  - 제목: {article['title']}")
+            # 저장/발송이 끝난 뒤에만 초안 삭제 (실패하면 되돌려 두고 다음 실행에서 다시 사용)
+            try:
+                article = avoid_duplicate(article)
+                logger.info("\n[3/3] 글 저장 및 이메일 발송 중...")
+                delivered = deliver_info_article(article)
+            except Exception:
+                drafts.release(draft)
+                raise
+            if not delivered:
+                drafts.release(draft)
+                logger.info("  - 초안은 다음 실행에서 다시 사용")
+                return article
+            drafts.discard(draft)
+            if only_new:
+                collector.headline_store.mark_seen_fingerprints(draft["category"], draft.get("headline_fingerprints", []))
+            return article
+
+    # 1. 뉴스 제목 수집
+    logger.info("\n[1/3] 뉴스 제목 수집 중...")
+    news_data = collector.collect_news_titles(category, only_new=only_new, enrich=enrich)
 
     if not news_data.get("titles"):
-        print("뉴스 수집 실패: 기사를 찾을 수 없습니다.")
+        if only_new and news_data.get("total_count"):
+            logger.info(f"새 헤드라인 없음 ({news_data['total_count']}개 모두 이전에 수집됨): 생성을 건너뜁니다.")
+        else:
+            logger.warning("뉴스 수집 실패: 기사를 찾을 수 없습니다.")
         return None
 
-    print(f"  - 카테고리: {news_data['category_name']}")
-    print(f"  - 수집된 기사 수: {len(news_data['titles'])}개")
+    logger.info(f"  - 카테고리: {news_data['category_name']}")
+    logger.info(f"  - 수집된 기사 수: {len(news_data['titles'])}개")
+    if only_new:
+        logger.info(f"  - 새 헤드라인: {len(news_data['titles'])}/{news_data['total_count']}개")
 
     # 2. 통합 글 생성 (1회 API 호출)
-    print("\n[2/3] AI 글 생성 중...")
+    logger.info("\n[2/3] AI 글 생성 중...")
     generator = ContentGenerator()
-    article = generator.generate_unified_article(news_data, use_cache=use_cache)
-    print(f"  - 제목: {article['title']}")
-    print(f"  - 태그: {', '.join(article['tags'])}")
+    article = generator.generate_unified_article(news_data, use_cache=use_cache, fallback_to_cache=True)
+    logger.info(f"  - 제목: {article['title']}")
+    logger.info(f"  - 태그: {', '.join(article['tags'])}")
+
+    # 최근 글과 주제가 겹치면 다시 생성 (계속 겹치면 표시만)
+    article = avoid_duplicate(article, generator, news_data)
 
     # 3. 글 저장 + 이메일 발송
-    print("\n[3/3] 글 저장 및 이메일 발송 중...")
+    logger.info("\n[3/3] 글 저장 및 이메일 발송 중...")
+    deliver_info_article(article)
+    if only_new and not article.get("fallback"):
+        collector.mark_seen(news_data)
+    elif only_new:
+        # 장애로 예전 캐시 글을 보냈으므로 이번 헤드라인은 다음 실행에서 다시 사용
+        logger.info("  - 캐시 글로 대체되어 새 헤드라인은 확인하지 않은 것으로 둠")
+
+    return article
+
+
+def deliver_info_article(article: dict) -> bool:
+    """정보형 글 저장 + 이메일 발송 (발송 성공 여부 반환)"""
     article_id = save_article(article)
-    print(f"  - ID: {article_id}")
+    logger.info(f"  - ID: {article_id}")
 
-    sender = EmailSender()
-    success = sender.send_article(article)
+    with log_context(article_id=article_id):
+        sender = EmailSender()
+        success = sender.send_article(article)
 
-    if success:
-        print("\n완료! 이메일을 확인하세요.")
-        print("티스토리에서 복붙 후 발행하면 됩니다.")
-    else:
-        print("\n이메일 발송 실패. 글은 저장되었습니다.")
-        print(f"저장 위치: {ARTICLES_DIR / f'{article_id}.json'}")
+        if success:
+            logger.info("\n완료! 이메일을 확인하세요.")
+            logger.info("티스토리에서 복붙 후 발행하면 됩니다.")
+        else:
+            logger.error("\n이메일 발송 실패. 글은 저장되었습니다.")
+            logger.info(f"저장 위치: {article_store.path_for(article_id)}")
 
-    return article
+    return success
+
+
+def take_draft(collector: NewsCollector, category: str = None, freshness_check: bool = False) -> dict | None:
+    """카테고리의 유효한 최신 초안 선점 (없으면 None, category가 None이면 스케줄러로 선택)
+
+    사용한 뒤에는 DraftStore.discard(), 사용하지 못했으면 DraftStore.release() 호출
+    """
+    category = category or collector.select_category()
+    drafts = DraftStore()
+    # 동시에 실행된 다른 발행이 먼저 가져간 초안은 건너뜀
+    draft = drafts.freshest(category)
+    while draft is not None and not drafts.claim(draft):
+        draft = drafts.freshest(category)
+    if draft is None:
+        logger.info("  - 사용할 수 있는 초안 없음")
+        return None
+
+    logger.info(f"  - 초안: {draft['category']} ({draft['created_at']})")
+    if freshness_check:
+        news_data = collector.collect_news_titles(draft["category"])
+        fresh, new_ratio = drafts.is_fresh(draft, news_data)
+        logger.info(f"  - 초안 이후 새 헤드라인 비율: {new_ratio:.0%}")
+        if not fresh:
+            logger.info("  - 뉴스 흐름이 바뀌어 초안 폐기")
+            drafts.discard(draft)
+            return None
+
+    return draft
+
+
+def pregenerate_articles(category: str = None) -> list[str]:
+    """발행 시간 전에 카테고리별 후보 글을 미리 생성해 초안으로 저장"""
+    categories = [category] if category else list(CATEGORIES.keys())
+    collector = NewsCollector()
+    generator = ContentGenerator()
+    drafts = DraftStore()
+
+    saved = []
+    for cat in categories:
+        logger.info(f"\n[{cat}] 초안 생성 중...")
+        news_data = collector.collect_news_titles(cat)
+        if not news_data.get("titles"):
+            logger.warning("  - 뉴스 수집 실패: 건너뜀")
+            continue
+
+        try:
+            article = generator.generate_unified_article(news_data, use_cache=False)
+        except (ValueError, RuntimeError) as e:
+            logger.warning(f"  - 생성 실패: {e}")
+            continue
+
+        path = drafts.save(article, news_data)
+        logger.info(f"  - 저장: {path}")
+        saved.append(str(path))
+
+    return saved
 
 
 def generate_experience_article(memo: str, category: str = "일상/리뷰") -> dict:
     """체험형 글 생성 파이프라인"""
-    print("=" * 50)
-    print("체험형 글 생성 시작")
-    print("=" * 50)
+    logger.info("=" * 50)
+    logger.info("체험형 글 생성 시작")
+    logger.info("=" * 50)
 
     # 1. 글 생성
-    print("\n[1/3] AI 글 생성 중...")
+    logger.info("\n[1/3] AI 글 생성 중...")
     generator = ContentGenerator()
     article = generator.generate_experience_article(memo, category)
-    print(f"  - 제목: {article['title']}")
-    print(f"  - 필요한 사진 수: {article.get('photo_count', 0)}개")
+    logger.info(f"  - 제목: {article['title']}")
+    logger.info(f"  - 필요한 사진 수: {article.get('photo_count', 0)}개")
 
     # 2. 글 저장
-    print("\n[2/3] 글 저장 중...")
+    logger.info("\n[2/3] 글 저장 중...")
     article_id = save_article(article)
-    print(f"  - ID: {article_id}")
+    logger.info(f"  - ID: {article_id}")
 
     # 3. 이메일 발송
-    print("\n[3/3] 이메일 발송 중...")
-    sender = EmailSender()
-    success = sender.send_article(article)
-
-    if success:
-        print("\n완료! 이메일을 확인하세요.")
-        print(f"사진 {article.get('photo_count', 0)}개를 준비한 후 발행하세요.")
-    else:
-        print("\n이메일 발송 실패.")
-        print(f"저장 위치: {ARTICLES_DIR / f'{article_id}.json'}")
+    logger.info("\n[3/3] 이메일 발송 중...")
+    with log_context(article_id=article_id):
+        sender = EmailSender()
+        success = sender.send_article(article)
+
+        if success:
+            logger.info("\n완료! 이메일을 확인하세요.")
+            logger.info(f"사진 {article.get('photo_count', 0)}개를 준비한 후 발행하세요.")
+        else:
+            logger.error("\n이메일 발송 실패.")
+            logger.info(f"저장 위치: {article_store.path_for(article_id)}")
 
     return article
 
 
 def list_articles():
     """저장된 글 목록"""
-    print("\n저장된 글 목록:")
-    print("-" * 50)
+    logger.info("\n저장된 글 목록:")
+    logger.info("-" * 50)
 
     articles = []
-    for file in sorted(ARTICLES_DIR.glob("*.json"), reverse=True)[:10]:
-        with open(file, "r", encoding="utf-8") as f:
-            article = json.load(f)
-            articles.append(article)
-            print(f"  [{article['id']}]")
-            print(f"  제목: {article['title']}")
-            print(f"  생성: {article['created_at']}")
-            print()
+    for file in article_store.list_files(newest_first=True)[:10]:
+        article = article_store.load_file(file)
+        articles.append(article)
+        logger.info(f"  [{article['id']}]")
+        logger.info(f"  제목: {article['title']}")
+        logger.info(f"  생성: {article['created_at']}")
+        logger.info("")
 
     if not articles:
-        print("  저장된 글이 없습니다.")
+        logger.info("  저장된 글이 없습니다.")
 
     return articles
 
 
+def article_stats(workers: int = None):
+    """저장된 글 전체의 단어 수/글자 수/소제목 통계 (프로세스 풀 병렬 처리)"""
+    files = article_store.list_files(newest_first=True)
+    if not files:
+        logger.info("  저장된 글이 없습니다.")
+        return []
+
+    results = process_article_files(files, workers=workers)
+
+    logger.info(f"\n저장된 글 통계 ({len(results)}개):")
+    logger.info("-" * 50)
+    for item in results:
+        logger.info(f"  [{item['id']}] {item['title']}")
+        logger.info(f"  글자 수: {item['char_count']} / 단어 수: {item['word_count']} / 소제목: {len(item['headings'])}개")
+        logger.info("")
+
+    total_chars = sum(item["char_count"] for item in results)
+    logger.info(f"평균 글자 수: {total_chars // len(results)}")
+
+    return results
+
+
+def pack_archive(output_path: str = None) -> int:
+    """data/articles/ 전체를 아카이브 파일 하나로 묶기"""
+    output_path = output_path or ARCHIVE_PATH
+    count = pack_article_store(article_store, output_path)
+
+    with ArchiveReader(output_path) as reader:
+        logger.info(f"아카이브 생성 완료: {output_path} ({len(reader)}개 글)")
+
+    return count
+
+
+def compress_records(train: bool = False) -> dict:
+    """저장된 글/캐시를 현재 압축 형식으로 다시 저장 (train=True 이면 최근 레코드로 공용 사전을 먼저 학습)"""
+    codec = get_codec()
+    directories = {"글": article_store.articles_dir, "캐시": ContentGenerator.CACHE_DIR}
+
+    if train:
+        paths = [path for directory in directories.values() for path in list_records(directory).values()]
+        paths.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+        if len(paths) < RECORD_COMPRESSION["min_train_samples"]:
+            logger.info(f"학습용 레코드 부족 ({len(paths)}/{RECORD_COMPRESSION['min_train_samples']}건): 사전 없이 압축")
+        else:
+            records = [read_record(path) for path in paths[:RECORD_COMPRESSION["train_samples"]]]
+            trained = codec.train(records)
+            logger.info(f"공용 사전 학습: 레코드 {len(records)}건 → {', '.join(f'{k} {v:08x}' for k, v in trained.items())}")
+
+    results = {}
+    for label, directory in directories.items():
+        count, before, after = codec.migrate(directory)
+        results[label] = (count, before, after)
+        if count:
+            logger.info(f"{label} {count}건: {before / 1024:.1f} KB → {after / 1024:.1f} KB ({after / before:.0%}, {codec.codec})")
+        else:
+            logger.info(f"{label}: 저장된 레코드 없음")
+    return results
+
+
+def serve(host: str = None, port: int = None):
+    """발행 승인 웹 서비스 실행 (개발 서버, 운영은 gunicorn 사용)"""
+    import secrets
+    from config.settings import APPROVAL_SERVER
+    from src.approval_server import create_app
+
+    host = host or APPROVAL_SERVER["host"]
+    port = port or APPROVAL_SERVER["port"]
+    # 토큰을 설정하지 않았으면 이번 실행에서만 쓰는 임시 토큰
+    token = APPROVAL_SERVER["token"] or secrets.token_urlsafe(16)
+    if not APPROVAL_SERVER["token"]:
+        logger.info(f"승인 화면: http://{host}:{port}/queue?token={token} (임시 토큰, 고정하려면 APPROVAL_TOKEN 설정)")
+    app = create_app(article_store=article_store, token=token)
+    app.run(host=host, port=port)
+
+
+def publish_approved(with_thumbnail: bool = True) -> list[dict]:
+    """승인된 글을 티스토리에 동시 발행 (이미 발행된 글은 건너뜀)"""
+    import asyncio
+    from src.approval_store import ApprovalStore
+    from src.tistory_publisher import TistoryPublisher
+
+    articles = [article_store.load(article_id) for article_id in ApprovalStore().approved_ids()]
+    if not articles:
+        logger.info("승인된 글이 없습니다.")
+        return []
+
+    async def run():
+        async with TistoryPublisher() as publisher:
+            return await publisher.publish_many(articles, with_thumbnail=with_thumbnail)
+
+    logger.info(f"승인된 글 {len(articles)}개 발행 중...")
+    results = asyncio.run(run())
+
+    for result in results:
+        if result.get("error"):
+            logger.error(f"  [{result['id']}] 실패: {result['error']}")
+        elif result.get("skipped"):
+            logger.info(f"  [{result['id']}] 이미 발행됨: {result.get('url')}")
+        else:
+            logger.info(f"  [{result['id']}] 발행 완료: {result.get('url')}")
+
+    # 발행된 글을 발행 주소로 피드/사이트맵에 추가 (발행 전 글은 공개하지 않음)
+    published = [(article, result) for article, result in zip(articles, results) if not result.get("error") and result.get("url")]
+    if FEED["enabled"] and published:
+        try:
+            with FeedBuilder() as feed:
+                for article, result in published:
+                    feed.add(article, url=result["url"])
+        except Exception as e:
+            logger.warning(f"  피드/사이트맵 링크 갱신 실패 (python main.py feed로 다시 생성): {e}")
+
+    return results
+
+
+def rebuild_feed() -> int:
+    """저장된 글 전체로 피드/사이트맵 다시 만들기 (처음 도입할 때, 평소에는 글 저장 시 자동 갱신)"""
+    from src.storage import read_json
+    from src.tistory_publisher import TistoryPublisher
+
+    urls = {}
+    for path in TistoryPublisher.PUBLISHED_DIR.glob("*.json"):
+        record = read_json(path) or {}
+        if record.get("id") and record.get("url"):
+            urls[record["id"]] = record["url"]
+
+    with FeedBuilder() as feed:
+        count = feed.rebuild(article_store.iter_articles(), urls)
+        shards = len(list(feed.output_dir.glob("sitemap-*.xml")))
+        logger.info(f"피드/사이트맵 생성 완료: 글 {count}개 (발행 주소 {len(urls)}개), 사이트맵 조각 {shards}개 → {feed.output_dir}")
+    return count
+
+
+def backfill(
+    workers: int = None,
+    categories: list[str] = None,
+    date_from: str = None,
+    date_to: str = None,
+    memo_file: str = None,
+    retry_failed: bool = False,
+    digest: bool = False,
+) -> dict:
+    """과거 날짜/메모 작업을 큐에 등록하고 여러 프로세스로 일괄 생성 (중단 후 재실행 시 이어서 처리)
+
+    digest=True면 이번 실행에서 생성된 글을 모음 메일로 발송
+    """
+    logger.info("=" * 50)
+    logger.info("백필 시작")
+    logger.info("=" * 50)
+
+    queue = JobQueue()
+    added = 0
+    if date_from:
+        added += queue.enqueue_dates(categories or list(CATEGORIES.keys()), date_from, date_to or date_from)
+    if memo_file:
+        with open(memo_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    added += queue.enqueue("experience", {"memo": line.strip()})
+    if retry_failed:
+        logger.info(f"  - 실패 작업 {queue.retry_failed()}건 재시도")
+    queue.close()
+    logger.info(f"  - 새로 등록한 작업: {added}건")
+
+    started = time.time()
+    counts = run_backfill(workers)
+    logger.info(f"\n완료: {counts['done']}건 / 실패: {counts['failed']}건 / 남음: {counts['pending']}건")
+
+    if digest:
+        queue = JobQueue()
+        article_ids = queue.completed_since(started)
+        queue.close()
+        if article_ids:
+            logger.info(f"\n모음 메일 발송 중... ({len(article_ids)}편)")
+            EmailSender().send_digest([article_store.load(article_id) for article_id in article_ids])
+    return counts
+
+
+def show_health(reset: bool = False, flush: bool = False) -> list[dict]:
+    """외부 서비스 서킷 상태와 발송 대기함 확인"""
+    registry = get_health()
+    if reset:
+        registry.reset()
+        logger.info("서킷 상태를 초기화했습니다.")
+
+    rows = registry.summary()
+    logger.info("\n외부 서비스 상태:")
+    logger.info("-" * 50)
+    for row in rows:
+        retry = f" / {row['retry_in']:.0f}초 후 재시도" if row["retry_in"] else ""
+        logger.info(f"  {row['label']:<16} {row['state']:<9} 연속 실패 {row['failures']}회{retry}")
+        if row["state"] != "closed" and row["last_error"]:
+            logger.info(f"    마지막 오류: {row['last_error']}")
+
+    logger.info(f"\n발송 대기함: {EmailSender.outbox_count()}통")
+    if flush and EmailSender.outbox_count():
+        EmailSender().flush_outbox()
+    return rows
+
+
+def run_command(args: argparse.Namespace):
+    """하위 명령 실행"""
+    if args.command == "info":
+        generate_info_article(
+            args.category,
+            use_cache=not (args.no_cache or args.record),  # 녹화는 캐시 없이 (Gemini 응답이 빠지지 않도록)
+            only_new=args.only_new,
+            use_draft=args.use_draft,
+            freshness_check=args.freshness_check,
+            enrich=args.enrich or None,
+        )
+    elif args.command == "pregenerate":
+        pregenerate_articles(args.category)
+    elif args.command == "experience":
+        generate_experience_article(args.memo, args.category)
+    elif args.command == "list":
+        list_articles()
+    elif args.command == "stats":
+        article_stats(args.workers)
+    elif args.command == "pack":
+        pack_archive(args.output)
+    elif args.command == "compress":
+        compress_records(args.train)
+    elif args.command == "feed":
+        rebuild_feed()
+    elif args.command == "serve":
+        serve(args.host, args.port)
+    elif args.command == "publish":
+        publish_approved(with_thumbnail=not args.no_thumbnail)
+    elif args.command == "health":
+        show_health(reset=args.reset, flush=args.flush)
+    elif args.command == "backfill":
+        backfill(
+            args.workers,
+            categories=args.category,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            memo_file=args.memo_file,
+            retry_failed=args.retry_failed,
+            digest=args.digest,
+        )
+
+
+# 재생 모드에서 임시 폴더로 옮길 저장 위치 (클래스/모듈, 속성, 임시 폴더 안 이름)
+# 글 캐시도 비워 두어야 캐시 대신 녹화된 Gemini 응답으로 재생됨
+REPLAY_PATHS = [
+    (ArticleStore, "ARTICLES_DIR", "articles"),
+    (PreviewStore, "PREVIEW_DIR", "previews"),
+    (DedupIndex, "DB_PATH", "dedup_index.db"),
+    (FeedBuilder, "FEED_DIR", "feed"),
+    (FeedBuilder, "DB_PATH", "feed_index.db"),
+    (HeadlineStore, "DB_PATH", "news_history.db"),
+    (ContentGenerator, "CACHE_DIR", "cache"),
+    (DraftStore, "DRAFTS_DIR", "drafts"),
+    (ExtractionCache, "DB_PATH", "enrich_cache.db"),
+    (NewsCollector, "FEED_CACHE_DIR", "feed_cache"),
+    (thumbnail_generator, "THUMBNAIL_DIR", "thumbnails"),
+    (thumbnail_generator, "LOCAL_THUMBNAIL_DIR", "thumbnails/local"),
+    (email_sender, "OUTBOX_DIR", "outbox"),
+    (email_sender, "FAILED_DIR", "outbox/failed"),
+]
+
+
+@contextmanager
+def replay_sandbox():
+    """재생 중 읽고 쓰는 글/캐시/초안/인덱스/피드/썸네일/발송 대기함을 임시 폴더로 옮기고 종료 시 삭제 (data/는 그대로)"""
+    global article_store
+    saved_store = article_store
+    saved_paths = [(cls, attr, getattr(cls, attr)) for cls, attr, _ in REPLAY_PATHS]
+    with tempfile.TemporaryDirectory(prefix="auto_blog_replay_") as tmp:
+        for cls, attr, name in REPLAY_PATHS:
+            setattr(cls, attr, Path(tmp) / name)
+        article_store = ArticleStore()
+        logger.info(f"📼 재생 결과는 임시 폴더에 저장 (종료 시 삭제): {tmp}")
+        try:
+            yield
+        finally:
+            article_store = saved_store
+            for cls, attr, path in saved_paths:
+                setattr(cls, attr, path)
+
+
+def run_with_cassette(args: argparse.Namespace):
+    """--record/--replay 옵션에 따라 카세트를 켜고 명령 실행"""
+    cassette = None
+    if args.replay:
+        cassette = Cassette.load(args.replay)
+        logger.info(f"📼 재생 모드: {args.replay} ({len(cassette.entries)}건)")
+    elif args.record:
+        cassette = Cassette.recorder(args.command)
+    use_cassette(cassette)
+
+    try:
+        if cassette is not None and cassette.replaying:
+            with replay_sandbox():
+                run_command(args)
+        else:
+            run_command(args)
+    finally:
+        use_cassette(None)
+        if cassette is not None and not cassette.replaying:
+            logger.info(f"\n📼 녹화 저장: {cassette.save()} ({len(cassette.entries)}건)")
+
+
+def run_with_profile(args: argparse.Namespace):
+    """--profile 옵션이 있으면 프로파일러를 켜고 실행 (종료 시 요약 출력)"""
+    if not args.profile:
+        run_with_cassette(args)
+        return
+
+    profiler = RunProfiler(args.profile, run_id=run_id()).start()
+    use_profiler(profiler)
+    try:
+        run_with_cassette(args)
+    finally:
+        use_profiler(None)
+        profiler.stop()
+        flush_logs()  # 요약이 진행 로그 뒤에 나오도록
+        profiler.print_summary()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Auto-Blog 자동화 시스템")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
 
+    # 모든 명령에 공통 옵션 (외부 I/O 녹화/재생, 프로파일링)
+    common_parser = argparse.ArgumentParser(add_help=False)
+    io_group = common_parser.add_mutually_exclusive_group()
+    io_group.add_argument(
+        "--record",
+        action="store_true",
+        help="RSS/Gemini 응답을 data/cassettes/에 녹화",
+    )
+    io_group.add_argument(
+        "--replay",
+        metavar="CASSETTE",
+        default=None,
+        help="녹화 파일로 네트워크 없이 재실행",
+    )
+    common_parser.add_argument(
+        "--profile",
+        choices=RunProfiler.MODES,
+        default=None,
+        help="CPU/메모리 프로파일을 data/profiles/<run_id>/에 저장",
+    )
+    common_parser.add_argument(
+        "--log-level",
+        action="append",
+        metavar="[모듈=]레벨",
+        default=None,
+        help="로그 레벨 (예: DEBUG, content_generator=DEBUG, 여러 번 지정 가능)",
+    )
+    common_parser.add_argument(
+        "--log-format",
+        choices=["text", "json", "none"],
+        default=None,
+        help="콘솔 출력 형식 (json: JSON Lines, data/logs/<run_id>.jsonl에는 항상 JSON Lines)",
+    )
+
     # 정보형 글 생성 (통합 방식 - 1회 API 호출)
-    info_parser = subparsers.add_parser("info", help="정보형 글 생성 (1회 API 호출)")
+    info_parser = subparsers.add_parser("info", parents=[common_parser], help="정보형 글 생성 (1회 API 호출)")
     info_parser.add_argument(
         "--category",
         choices=["ai", "health", "economy", "lifestyle"],
@@ -148,9 +681,38 @@ def main():
         action="store_true",
         help="캐시 사용 안 함 (새로 생성)",
     )
+    info_parser.add_argument(
+        "--only-new",
+        action="store_true",
+        help="이전에 본 헤드라인 제외 (새 헤드라인이 없으면 생성 건너뜀)",
+    )
+    info_parser.add_argument(
+        "--use-draft",
+        action="store_true",
+        help="pregenerate로 미리 만든 초안이 있으면 사용",
+    )
+    info_parser.add_argument(
+        "--freshness-check",
+        action="store_true",
+        help="초안 사용 전 RSS 헤드라인 변화 확인",
+    )
+    info_parser.add_argument(
+        "--enrich",
+        action="store_true",
+        help="상위 헤드라인 기사 본문을 받아 프롬프트에 추가 (URL별 캐시)",
+    )
+
+    # 초안 미리 생성
+    pregen_parser = subparsers.add_parser("pregenerate", parents=[common_parser], help="카테고리별 초안 미리 생성 (한가한 시간대용)")
+    pregen_parser.add_argument(
+        "--category",
+        choices=list(CATEGORIES.keys()),
+        default=None,
+        help="카테고리 (미지정 시 전체)",
+    )
 
     # 체험형 글 생성
-    exp_parser = subparsers.add_parser("experience", help="체험형 글 생성")
+    exp_parser = subparsers.add_parser("experience", parents=[common_parser], help="체험형 글 생성")
     exp_parser.add_argument("memo", help="경험 메모 (짧은 설명)")
     exp_parser.add_argument(
         "--category",
@@ -159,23 +721,96 @@ def main():
     )
 
     # 저장된 글 목록
-    subparsers.add_parser("list", help="저장된 글 목록")
+    subparsers.add_parser("list", parents=[common_parser], help="저장된 글 목록")
+
+    # 저장된 글 통계
+    stats_parser = subparsers.add_parser("stats", parents=[common_parser], help="저장된 글 통계 (병렬 처리)")
+    stats_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="프로세스 수 (기본: CPU 수)",
+    )
+
+    # 글 아카이브 묶기
+    pack_parser = subparsers.add_parser("pack", parents=[common_parser], help="저장된 글을 아카이브 파일로 묶기 (분석용)")
+    pack_parser.add_argument(
+        "--output",
+        default=None,
+        help="아카이브 파일 경로 (기본: data/archive/articles.pack)",
+    )
+
+    # 글/캐시 압축 변환
+    compress_parser = subparsers.add_parser(
+        "compress", parents=[common_parser], help="저장된 글/캐시를 압축 형식으로 변환 (예전 평문 JSON 포함)"
+    )
+    compress_parser.add_argument("--train", action="store_true", help="최근 글/캐시로 공용 압축 사전을 먼저 학습")
+
+    # 피드/사이트맵 전체 재생성
+    subparsers.add_parser("feed", parents=[common_parser], help="저장된 글 전체로 RSS 피드/사이트맵 다시 만들기")
+
+    # 발행 승인 웹 서비스
+    serve_parser = subparsers.add_parser("serve", parents=[common_parser], help="발행 승인 웹 서비스 실행")
+    serve_parser.add_argument("--host", default=None, help="바인딩 주소 (기본: 127.0.0.1)")
+    serve_parser.add_argument("--port", type=int, default=None, help="포트 (기본: 8000)")
+
+    # 승인된 글 발행
+    publish_parser = subparsers.add_parser("publish", parents=[common_parser], help="승인된 글을 티스토리에 발행")
+    publish_parser.add_argument(
+        "--no-thumbnail",
+        action="store_true",
+        help="썸네일 업로드 생략",
+    )
+
+    # 외부 서비스 상태 (서킷 브레이커)
+    health_parser = subparsers.add_parser("health", parents=[common_parser], help="외부 서비스 상태/발송 대기함 확인")
+    health_parser.add_argument("--reset", action="store_true", help="서킷 상태 초기화 (모든 서비스 바로 다시 호출)")
+    health_parser.add_argument("--flush", action="store_true", help="발송 대기함의 메일 지금 발송")
+
+    # 대량 재생성/백필 (프로세스 풀 + 디스크 작업 큐)
+    backfill_parser = subparsers.add_parser("backfill", parents=[common_parser], help="과거 날짜/메모 글 일괄 생성")
+    backfill_parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (기본: 2)")
+    backfill_parser.add_argument(
+        "--category",
+        action="append",
+        choices=list(CATEGORIES.keys()),
+        default=None,
+        help="날짜 작업 카테고리 (여러 번 지정 가능, 기본: 전체)",
+    )
+    backfill_parser.add_argument("--from", dest="date_from", default=None, help="시작 날짜 (YYYY-MM-DD)")
+    backfill_parser.add_argument("--to", dest="date_to", default=None, help="끝 날짜 (YYYY-MM-DD, 기본: 시작 날짜)")
+    backfill_parser.add_argument("--memo-file", default=None, help="체험형 글 메모 파일 (한 줄에 하나)")
+    backfill_parser.add_argument("--retry-failed", action="store_true", help="실패한 작업 다시 시도")
+    backfill_parser.add_argument("--digest", action="store_true", help="생성된 글을 모음 메일 한 통(크기 초과 시 여러 통)으로 발송")
 
     args = parser.parse_args()
 
-    if args.command == "info":
-        generate_info_article(args.category, use_cache=not args.no_cache)
-    elif args.command == "experience":
-        generate_experience_article(args.memo, args.category)
-    elif args.command == "list":
-        list_articles()
+    if args.command:
+        try:
+            level, modules = parse_levels(args.log_level)
+        except ValueError as e:
+            parser.error(str(e))
+        setup_logging(level, modules, console=args.log_format, json_path=True)
+        run_with_profile(args)
     else:
         parser.print_help()
         print("\n사용 예시:")
         print("  python main.py info             # 정보형 글 생성 (1회 API 호출)")
         print("  python main.py info --no-cache  # 캐시 무시하고 새로 생성")
+        print("  python main.py info --only-new  # 새 헤드라인만 사용")
+        print("  python main.py pregenerate      # 카테고리별 초안 미리 생성")
+        print("  python main.py info --use-draft # 초안으로 바로 발송")
         print("  python main.py experience '메모'    # 체험형 글 생성")
         print("  python main.py list                 # 저장된 글 목록")
+        print("  python main.py stats --workers 4    # 저장된 글 통계")
+        print("  python main.py pack                 # 글 아카이브 묶기")
+        print("  python main.py serve                # 발행 승인 웹 서비스")
+        print("  python main.py publish              # 승인된 글 티스토리 발행")
+        print("  python main.py feed                 # RSS 피드/사이트맵 다시 만들기")
+        print("  python main.py backfill --from 2025-01-01 --to 2025-01-31 --workers 4  # 과거 글 일괄 생성")
+        print("  python main.py info --record        # 외부 응답 녹화")
+        print("  python main.py info --replay <파일> # 녹화로 오프라인 재실행")
+        print("  python main.py info --profile both  # CPU/메모리 프로파일")
 
 
 if __name__ == "__main__":
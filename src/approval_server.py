@@ -0,0 +1,294 @@
+"""
+발행 승인 웹 서비스 (Flask)
+대기 중인 글 목록을 페이지 단위로 보여주고, 사전 렌더링된 미리보기를 캐시 헤더와 함께 제공
+
+피드/사이트맵(/feed.xml, /sitemap*.xml)을 뺀 나머지는 APPROVAL_TOKEN이 있어야 접근 가능
+
+실행:
+    python main.py serve                                   # 개발 서버
+    APPROVAL_TOKEN=... gunicorn -w 4 -b 127.0.0.1:8000 "src.approval_server:create_app()"
+"""
+import gzip
+import hashlib
+import hmac
+import json
+import sys
+import os
+
+from flask import Flask, Response, abort, jsonify, redirect, render_template_string, request, send_from_directory, url_for
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import APPROVAL_SERVER, FEED
+from src.approval_store import ApprovalStore
+from src.article_store import ArticleStore
+from src.feed_builder import SHARD_PATTERN, FeedBuilder
+from src.logs import get_logger
+from src.preview_store import PreviewStore
+
+logger = get_logger("approval_server")
+
+# 브라우저에서 ?token=으로 한 번 열면 이후 조회는 쿠키로 인증
+TOKEN_COOKIE = "approval_token"
+# 토큰 없이 열 수 있는 경로 (공개 피드/사이트맵)
+PUBLIC_ENDPOINTS = {"feed_file"}
+
+QUEUE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="UTF-8" />
+  <title>발행 승인 대기 ({{ total }})</title>
+  <style>
+    body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+           max-width: 900px; margin: 0 auto; padding: 20px; color: #333; background: #f5f5f5; }
+    .item { background: white; border-radius: 8px; padding: 15px 20px; margin-bottom: 10px; }
+    .item h2 { margin: 0 0 5px 0; font-size: 17px; }
+    .meta { color: #888; font-size: 13px; }
+    form { display: inline; }
+    button { margin-right: 5px; }
+    .pager a { margin-right: 10px; }
+  </style>
+</head>
+<body>
+  <h1>발행 승인 대기 ({{ total }})</h1>
+  {% for item in items %}
+  <div class="item">
+    <h2><a href="{{ url_for('preview', article_id=item.id) }}">{{ item.title }}</a></h2>
+    <div class="meta">{{ item.category }} · {{ item.created_at }} · {{ item.tags | join(', ') }}</div>
+    <form method="post" action="{{ url_for('decide', article_id=item.id, status='approved') }}"><input type="hidden" name="token" value="{{ token }}" /><button>승인</button></form>
+    <form method="post" action="{{ url_for('decide', article_id=item.id, status='rejected') }}"><input type="hidden" name="token" value="{{ token }}" /><button>반려</button></form>
+  </div>
+  {% else %}
+  <p>대기 중인 글이 없습니다.</p>
+  {% endfor %}
+  <div class="pager">
+    {% if page > 1 %}<a href="{{ url_for('queue', page=page - 1) }}">이전</a>{% endif %}
+    <span>{{ page }} / {{ pages }}</span>
+    {% if page < pages %}<a href="{{ url_for('queue', page=page + 1) }}">다음</a>{% endif %}
+  </div>
+</body>
+</html>
+"""
+
+
+def _accepts(encoding: str) -> bool:
+    """클라이언트가 해당 Content-Encoding을 받는지 확인 (q=0은 거부)"""
+    return request.accept_encodings[encoding] > 0
+
+
+def _supplied_token(allow_cookie: bool) -> str:
+    """요청에 담긴 토큰 (Authorization: Bearer, 폼/쿼리 token, 쿠키 순)"""
+    auth = request.headers.get("Authorization", "")
+    if auth.startswith("Bearer "):
+        return auth[len("Bearer "):]
+    supplied = request.form.get("token") or request.args.get("token")
+    if supplied:
+        return supplied
+    return request.cookies.get(TOKEN_COOKIE, "") if allow_cookie else ""
+
+
+def _compressed_response(body: bytes, mimetype: str) -> Response:
+    """gzip 가능하면 압축해서 응답"""
+    response = Response(body, mimetype=mimetype)
+    if _accepts("gzip") and len(body) > 1024:
+        response.set_data(gzip.compress(body, compresslevel=5, mtime=0))
+        response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
+
+
+def create_app(
+    article_store: ArticleStore = None,
+    preview_store: PreviewStore = None,
+    approval_store: ApprovalStore = None,
+    feed_dir: str = None,
+    token: str = None,
+) -> Flask:
+    """승인 웹 앱 생성 (gunicorn 팩토리)"""
+    app = Flask(__name__)
+    articles = article_store or ArticleStore()
+    previews = preview_store or PreviewStore()
+    approvals = approval_store or ApprovalStore()
+    feed_dir = feed_dir or FeedBuilder.FEED_DIR
+    page_size = APPROVAL_SERVER["page_size"]
+    token = token or APPROVAL_SERVER["token"]
+    if not token:
+        logger.warning("APPROVAL_TOKEN이 없어 승인 화면/미리보기/승인 요청을 모두 거부합니다 (피드/사이트맵만 제공)")
+
+    def authorized(allow_cookie: bool = True) -> bool:
+        supplied = _supplied_token(allow_cookie)
+        return bool(token and supplied) and hmac.compare_digest(supplied.encode(), token.encode())
+
+    @app.before_request
+    def require_token():
+        if request.endpoint in PUBLIC_ENDPOINTS:
+            return None
+        # 승인 요청은 쿠키만으로는 받지 않음 (다른 사이트가 보낸 POST 방지, 폼/헤더에 토큰 필요)
+        if not authorized(allow_cookie=request.endpoint != "decide"):
+            abort(403)
+        return None
+
+    @app.after_request
+    def remember_token(response: Response) -> Response:
+        if request.method == "GET" and request.args.get("token") and authorized():
+            response.set_cookie(TOKEN_COOKIE, token, httponly=True, samesite="Strict")
+        return response
+
+    def pending_page(page: int) -> tuple[list[dict], int]:
+        """대기 중인 글 한 페이지 (최신순) + 전체 대기 수"""
+        decided = approvals.decided_ids()
+        pending = [i for i in articles.list_ids(newest_first=True) if i not in decided]
+
+        items = []
+        for article_id in pending[(page - 1) * page_size:page * page_size]:
+            meta = previews.load_meta(article_id)
+            if meta is None:
+                # 사전 렌더링 이전에 저장된 글은 처음 볼 때 렌더링
+                previews.render(articles.load(article_id))
+                meta = previews.load_meta(article_id)
+            items.append(meta)
+        return items, len(pending)
+
+    def conditional(response: Response, cache_control: str) -> Response:
+        """ETag + Cache-Control 적용 후 304 처리"""
+        response.add_etag()
+        response.headers["Cache-Control"] = cache_control
+        return response.make_conditional(request)
+
+    @app.route("/")
+    def index():
+        return redirect(url_for("queue", **request.args))
+
+    @app.route("/queue")
+    def queue():
+        page = max(request.args.get("page", 1, type=int), 1)
+        items, total = pending_page(page)
+        pages = max((total + page_size - 1) // page_size, 1)
+        html = render_template_string(QUEUE_TEMPLATE, items=items, total=total, page=page, pages=pages, token=token)
+        response = _compressed_response(html.encode("utf-8"), "text/html")
+        return conditional(response, "private, no-cache")
+
+    @app.route("/api/queue")
+    def api_queue():
+        page = max(request.args.get("page", 1, type=int), 1)
+        items, total = pending_page(page)
+        return conditional(jsonify({"page": page, "total": total, "items": items}), "private, no-cache")
+
+    @app.route("/articles/<article_id>/preview")
+    def preview(article_id: str):
+        if not articles.exists(article_id):
+            abort(404)
+
+        gz_path = previews.path_for(article_id, "gzip")
+        if not gz_path.exists():
+            previews.render(articles.load(article_id))
+
+        br_path = previews.path_for(article_id, "br")
+        if br_path.exists() and _accepts("br"):
+            path, encoding = br_path, "br"
+        else:
+            path, encoding = gz_path, "gzip"
+
+        # 파일 크기 + 수정 시각 기반 ETag (본문을 읽지 않고 304 응답 가능)
+        stat = path.stat()
+        etag = hashlib.sha1(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            body = path.read_bytes()
+            response = Response(mimetype="text/html")
+            if encoding == "gzip" and not _accepts("gzip"):
+                response.set_data(gzip.decompress(body))
+            else:
+                response.set_data(body)
+                response.headers["Content-Encoding"] = encoding
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = f"private, max-age={APPROVAL_SERVER['preview_max_age']}"
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    @app.route("/articles/<article_id>/<status>", methods=["POST"])
+    def decide(article_id: str, status: str):
+        if status not in ApprovalStore.STATUSES:
+            abort(404)
+        if not articles.exists(article_id):
+            abort(404)
+        record = approvals.set_status(article_id, status)
+        if status == "rejected" and FEED["enabled"]:
+            # 반려된 글은 피드/사이트맵에서 제외
+            try:
+                with FeedBuilder(output_dir=feed_dir) as feed:
+                    feed.remove(article_id)
+            except Exception as e:
+                logger.warning(f"반려된 글 피드/사이트맵 제외 실패 (python main.py feed로 다시 생성): {e}")
+        if request.accept_mimetypes.best == "application/json":
+            return jsonify(record)
+        return redirect(request.referrer or url_for("queue"), code=303)
+
+    @app.route("/<name>.xml")
+    def feed_file(name: str):
+        # 글 저장 시 갱신되는 RSS 피드/사이트맵 (data/feed/)
+        filename = f"{name}.xml"
+        if name not in ("feed", "sitemap") and not SHARD_PATTERN.match(filename):
+            abort(404)
+        mimetype = "application/rss+xml" if name == "feed" else "application/xml"
+        response = send_from_directory(feed_dir, filename, mimetype=mimetype, max_age=300)
+        response.headers["Cache-Control"] = "public, max-age=300"
+        return response
+
+    return app
+
+
+def run_load_test(base_url: str, total: int = 2000, concurrency: int = 32, token: str = None) -> dict:
+    """로컬 인스턴스 대상 간단한 부하 테스트 (목록 + 미리보기 요청)"""
+    import http.client
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(base_url)
+    local = threading.local()
+    auth = {"Authorization": f"Bearer {token}"} if token else {}
+
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+    conn.request("GET", "/api/queue", headers=auth)
+    items = json.loads(conn.getresponse().read()).get("items", [])
+    conn.close()
+    paths = ["/queue", "/api/queue"] + [f"/articles/{item['id']}/preview" for item in items]
+
+    def fetch(i: int) -> tuple[int, float]:
+        # 스레드마다 keep-alive 연결 1개 재사용
+        if not hasattr(local, "conn"):
+            local.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        start = time.perf_counter()
+        local.conn.request("GET", paths[i % len(paths)], headers={"Accept-Encoding": "gzip, br", **auth})
+        response = local.conn.getresponse()
+        response.read()
+        return response.status, time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(fetch, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    return {
+        "requests": total,
+        "errors": sum(1 for status, _ in results if status >= 400),
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+# 테스트: 실행 중인 로컬 인스턴스에 부하 테스트
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else f"http://{APPROVAL_SERVER['host']}:{APPROVAL_SERVER['port']}"
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    stats = run_load_test(url, total=total, token=APPROVAL_SERVER["token"])
+    print(f"=== 부하 테스트: {url} ===")
+    print(f"요청 {stats['requests']}건 / 오류 {stats['errors']}건")
+    print(f"처리량: {stats['rps']:.0f} req/s")
+    print(f"지연 p50 {stats['p50_ms']:.1f} ms / p99 {stats['p99_ms']:.1f} ms")
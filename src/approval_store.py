@@ -0,0 +1,57 @@
+"""
+발행 승인 상태 저장소 (data/approvals/)
+글 ID별 마커 파일로 관리해서 여러 워커 프로세스가 동시에 써도 안전
+"""
+import json
+import sys
+import os
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import write_json
+
+
+class ApprovalStore:
+    """글별 승인/반려 상태 저장소"""
+
+    APPROVALS_DIR = Path(__file__).parent.parent / "data" / "approvals"
+    STATUSES = ("approved", "rejected")
+
+    def __init__(self, approvals_dir: Path = None):
+        self.approvals_dir = Path(approvals_dir or self.APPROVALS_DIR)
+        self.approvals_dir.mkdir(parents=True, exist_ok=True)
+
+    def set_status(self, article_id: str, status: str) -> dict:
+        """승인/반려 기록"""
+        if status not in self.STATUSES:
+            raise ValueError(f"알 수 없는 상태: {status}")
+
+        record = {
+            "id": article_id,
+            "status": status,
+            "decided_at": datetime.now().isoformat(),
+        }
+        write_json(self.approvals_dir / f"{article_id}.json", record, indent=None)
+        return record
+
+    def get(self, article_id: str) -> dict | None:
+        """승인 기록 (없으면 대기 중)"""
+        path = self.approvals_dir / f"{article_id}.json"
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def decided_ids(self) -> set[str]:
+        """승인/반려가 결정된 글 ID 목록"""
+        return {entry.name[:-5] for entry in os.scandir(self.approvals_dir) if entry.name.endswith(".json")}
+
+    def approved_ids(self) -> list[str]:
+        """승인된 글 ID 목록 (오래된 순)"""
+        approved = []
+        for article_id in sorted(self.decided_ids()):
+            record = self.get(article_id)
+            if record and record["status"] == "approved":
+                approved.append(article_id)
+        return approved
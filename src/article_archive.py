@@ -0,0 +1,234 @@
+"""
+글 저장소를 하나의 바이너리 아카이브로 묶는 모듈
+메모리 매핑(mmap)으로 필요한 필드/레코드만 지연 디코딩
+
+파일 구조:
+    [헤더]   MAGIC | 필드 수(u16) | 필드명들 (u16 길이 + UTF-8)
+    [레코드] 필드 오프셋 테이블 (u32 x (필드 수 + 1)) | 필드 값들
+             값 = 타입 바이트(b"s": 문자열, b"j": JSON, b"b": 본문 영역 참조) + 내용
+             빈 값은 None
+    [본문 영역] 큰 필드(content) 값을 모아 둔 영역 (제목/태그만 스캔할 때 읽지 않음)
+    [인덱스] 레코드 시작 오프셋 (u64 x 레코드 수)
+    [트레일러] 본문 영역 오프셋(u64) | 인덱스 오프셋(u64) | 레코드 수(u64) | MAGIC
+"""
+import json
+import mmap
+import shutil
+import struct
+import sys
+import os
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.article_store import ArticleStore
+from src.storage import atomic_open
+
+MAGIC = b"ABPK\x01"
+TRAILER = struct.Struct("<QQQ5s")
+BLOB_REF = struct.Struct("<QQ")
+
+# 아카이브에 별도 컬럼으로 저장할 필드 (나머지는 "extra"에 JSON으로 저장)
+ARCHIVE_FIELDS = (
+    "id", "created_at", "title", "tags", "category", "article_type",
+    "selected_topic", "meta_description", "trend_keywords", "content", "extra",
+)
+# 레코드 밖 본문 영역에 따로 저장할 큰 필드
+BLOB_FIELDS = ("content",)
+DEFAULT_SCAN_FIELDS = ("title", "tags", "created_at")
+
+ARCHIVE_PATH = Path(__file__).parent.parent / "data" / "archive" / "articles.pack"
+
+
+def _encode_value(value) -> bytes:
+    if value is None:
+        return b""
+    if isinstance(value, str):
+        return b"s" + value.encode("utf-8")
+    return b"j" + json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _decode_value(buf, blobs=None) -> object:
+    if not len(buf):
+        return None
+    kind, body = buf[:1], buf[1:]
+    if kind == b"s":
+        return str(body, "utf-8")
+    if kind == b"b":
+        offset, length = BLOB_REF.unpack(body)
+        return _decode_value(blobs[offset:offset + length])
+    return json.loads(bytes(body))
+
+
+def pack_articles(articles: Iterable[dict], output_path: Path = ARCHIVE_PATH) -> int:
+    """글들을 아카이브 파일 하나로 묶기 (글을 하나씩 스트리밍으로 기록)
+
+    Returns:
+        기록한 레코드 수
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    columns = ARCHIVE_FIELDS[:-1]
+    table = struct.Struct(f"<{len(ARCHIVE_FIELDS) + 1}I")
+    offsets = array("Q")
+
+    with atomic_open(output_path, "wb") as f, tempfile.TemporaryFile() as blob_file:
+        f.write(MAGIC)
+        f.write(struct.pack("<H", len(ARCHIVE_FIELDS)))
+        for name in ARCHIVE_FIELDS:
+            encoded = name.encode("utf-8")
+            f.write(struct.pack("<H", len(encoded)))
+            f.write(encoded)
+
+        for article in articles:
+            extra = {k: v for k, v in article.items() if k not in columns}
+            values = []
+            for name in columns:
+                value = _encode_value(article.get(name))
+                if name in BLOB_FIELDS and value:
+                    ref = BLOB_REF.pack(blob_file.tell(), len(value))
+                    blob_file.write(value)
+                    value = b"b" + ref
+                values.append(value)
+            values.append(_encode_value(extra or None))
+
+            positions = [table.size]
+            for value in values:
+                positions.append(positions[-1] + len(value))
+
+            offsets.append(f.tell())
+            f.write(table.pack(*positions))
+            f.write(b"".join(values))
+
+        blob_offset = f.tell()
+        blob_file.seek(0)
+        shutil.copyfileobj(blob_file, f)
+
+        index_offset = f.tell()
+        f.write(offsets.tobytes())
+        f.write(TRAILER.pack(blob_offset, index_offset, len(offsets), MAGIC))
+
+    return len(offsets)
+
+
+class ArchiveReader:
+    """mmap 기반 아카이브 리더 (요청한 필드만 디코딩)"""
+
+    def __init__(self, path: Path = ARCHIVE_PATH):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"아카이브 파일이 아닙니다: {self.path}")
+
+        # 헤더: 필드명
+        (field_count,) = struct.unpack_from("<H", self._mm, len(MAGIC))
+        pos = len(MAGIC) + 2
+        self.fields = []
+        for _ in range(field_count):
+            (length,) = struct.unpack_from("<H", self._mm, pos)
+            self.fields.append(self._mm[pos + 2:pos + 2 + length].decode("utf-8"))
+            pos += 2 + length
+        self._field_pos = {name: i for i, name in enumerate(self.fields)}
+
+        # 트레일러 + 인덱스 (복사 없이 memoryview로 참조)
+        blob_offset, index_offset, count, magic = TRAILER.unpack_from(self._mm, len(self._mm) - TRAILER.size)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"아카이브 트레일러가 손상되었습니다: {self.path}")
+        self._view = memoryview(self._mm)
+        self._blobs = self._view[blob_offset:index_offset]
+        self._index = self._view[index_offset:index_offset + count * 8].cast("Q")
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_field(self, record_offset: int, field_pos: int):
+        start, end = struct.unpack_from("<II", self._mm, record_offset + field_pos * 4)
+        return _decode_value(self._view[record_offset + start:record_offset + end], self._blobs)
+
+    def record(self, i: int, fields: Iterable[str] = DEFAULT_SCAN_FIELDS) -> dict:
+        """i번째 레코드에서 요청한 필드만 디코딩"""
+        record_offset = self._index[i]
+        result = {}
+        for name in fields:
+            if name in self._field_pos:
+                result[name] = self._read_field(record_offset, self._field_pos[name])
+            else:
+                # 별도 컬럼이 아닌 필드는 extra에서 찾는다
+                extra = self._read_field(record_offset, self._field_pos["extra"]) or {}
+                result[name] = extra.get(name)
+        return result
+
+    def scan(self, fields: Iterable[str] = DEFAULT_SCAN_FIELDS) -> Iterator[dict]:
+        """전체 레코드를 하나씩 지연 디코딩"""
+        fields = tuple(fields)
+        for i in range(len(self)):
+            yield self.record(i, fields)
+
+    def close(self):
+        for name in ("_index", "_blobs"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+
+def pack_article_store(store: ArticleStore = None, output_path: Path = ARCHIVE_PATH) -> int:
+    """data/articles/ 전체를 아카이브로 묶기"""
+    store = store or ArticleStore()
+    return pack_articles(store.iter_articles(), output_path)
+
+
+# 테스트
+if __name__ == "__main__":
+    import time
+    import resource
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    body = "<h2>소제목</h2><p>" + "본문 내용 " * 300 + "</p>"
+
+    def synthetic():
+        for i in range(count):
+            yield {
+                "id": f"20250101_000000_{i:06x}",
+                "created_at": "2025-01-01T00:00:00",
+                "title": f"테스트 글 {i}",
+                "tags": ["AI", "테스트", f"태그{i % 50}"],
+                "category": "AI/인공지능",
+                "content": body,
+                "validation": {"valid": True},
+            }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.pack"
+
+        start = time.perf_counter()
+        pack_articles(synthetic(), path)
+        print(f"묶기: {count}건, {path.stat().st_size / 1024 / 1024:.1f} MB, {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        with ArchiveReader(path) as reader:
+            tag_counts = {}
+            for record in reader.scan():
+                for tag in record["tags"]:
+                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+        elapsed = time.perf_counter() - start
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"스캔 (title, tags, created_at): {elapsed:.2f}s, 최대 RSS {max_rss:.1f} MB")
@@ -0,0 +1,466 @@
+"""
+상위 헤드라인 본문 보강 모듈
+상위 K개 기사 링크를 httpx.AsyncClient 연결 풀로 동시에 받아(호스트별 동시 요청 수 제한)
+readability 방식으로 본문을 추출하고, 추출 결과는 URL별로 SQLite(data/enrich_cache.db)에 기간 한정 캐시
+"""
+import asyncio
+import re
+import sqlite3
+import sys
+import os
+import time
+from html import unescape
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import ENRICHMENT
+from src.cassette import Cassette, get_cassette
+from src.logs import get_logger
+
+logger = get_logger("article_enricher")
+
+
+class ContentExtractor(HTMLParser):
+    """readability 방식의 경량 본문 추출기
+
+    script/nav/footer 등은 건너뛰고, 문단(<p>)을 감싸고 있는 블록별로 모은 뒤
+    블록 점수(문단 글자 수 x (1 - 링크 비율) x class/id 가중치)가 가장 높은 블록의 문단을 본문으로 본다.
+    """
+
+    SKIP_TAGS = {
+        "script", "style", "noscript", "template", "svg", "iframe",
+        "nav", "header", "footer", "aside", "form", "button", "select",
+    }
+    CONTAINER_TAGS = {"body", "main", "article", "section", "div", "td"}
+    PARAGRAPH_TAGS = {"p", "pre", "blockquote"}
+    VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+    # class/id에 들어 있으면 본문일 가능성이 높거나 낮은 단어
+    POSITIVE_HINT = re.compile(r"article|content|body|post|entry|story|text|news", re.I)
+    NEGATIVE_HINT = re.compile(r"comment|sidebar|footer|related|promo|share|sns|banner|advert|\bad\b|recommend|popular", re.I)
+
+    def __init__(self, min_paragraph: int = None):
+        super().__init__(convert_charrefs=True)
+        self.min_paragraph = min_paragraph or ENRICHMENT["min_paragraph"]
+        self._stack = []  # 열린 태그 (tag, container_id or None)
+        self._containers = [{"weight": 1.0, "parent": None, "paragraphs": []}]  # 0번은 문서 전체
+        self._skip_depth = 0
+        self._paragraph = None  # 현재 문단 [글자 조각, 링크 글자 수, 블록 id]
+        self._in_link = 0
+        self.title = ""
+        self._in_title = False
+
+    # --- 파싱 ---
+
+    def _current_container(self) -> int:
+        for _, container_id in reversed(self._stack):
+            if container_id is not None:
+                return container_id
+        return 0
+
+    def _hint_weight(self, attrs: list) -> float:
+        hints = " ".join(value or "" for name, value in attrs if name in ("class", "id"))
+        if not hints:
+            return 1.0
+        weight = 1.0
+        if self.POSITIVE_HINT.search(hints):
+            weight *= 1.25
+        if self.NEGATIVE_HINT.search(hints):
+            weight *= 0.3
+        return weight
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title" and not self.title:
+            self._in_title = True
+        if tag in self.VOID_TAGS:
+            return
+        if self._skip_depth or tag in self.SKIP_TAGS:
+            if tag in self.SKIP_TAGS:
+                self._skip_depth += 1
+            self._stack.append((tag, None))
+            return
+
+        # 닫히지 않은 <p> 뒤에 새 블록이 열리면 문단 종료로 봄
+        if tag in self.PARAGRAPH_TAGS or tag in self.CONTAINER_TAGS:
+            self._end_paragraph()
+
+        container_id = None
+        if tag in self.CONTAINER_TAGS:
+            parent = self._current_container()
+            weight = self._containers[parent]["weight"] if tag == "body" else self._hint_weight(attrs)
+            if tag == "article":
+                weight *= 1.25
+            self._containers.append({"weight": weight, "parent": parent, "paragraphs": []})
+            container_id = len(self._containers) - 1
+        elif tag in self.PARAGRAPH_TAGS:
+            self._paragraph = [[], 0, self._current_container()]
+        elif tag == "a":
+            self._in_link += 1
+        self._stack.append((tag, container_id))
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if tag in self.VOID_TAGS or not any(open_tag == tag for open_tag, _ in self._stack):
+            return
+        # 짝이 맞지 않는 태그는 해당 태그까지 한꺼번에 닫음
+        while self._stack:
+            open_tag, _ = self._stack.pop()
+            if open_tag in self.SKIP_TAGS and self._skip_depth:
+                self._skip_depth -= 1
+            elif open_tag in self.PARAGRAPH_TAGS or open_tag in self.CONTAINER_TAGS:
+                self._end_paragraph()
+            elif open_tag == "a" and self._in_link:
+                self._in_link -= 1
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        if self._skip_depth or self._paragraph is None:
+            return
+        self._paragraph[0].append(data)
+        if self._in_link:
+            self._paragraph[1] += len(data.strip())
+
+    def _end_paragraph(self):
+        if self._paragraph is None:
+            return
+        parts, link_chars, container_id = self._paragraph
+        self._paragraph = None
+        text = re.sub(r"\s+", " ", "".join(parts)).strip()
+        if len(text) >= self.min_paragraph:
+            self._containers[container_id]["paragraphs"].append((text, link_chars))
+
+    # --- 결과 ---
+
+    def _score(self, container: dict) -> float:
+        chars = sum(len(text) for text, _ in container["paragraphs"])
+        if not chars:
+            return 0.0
+        link_density = sum(link for _, link in container["paragraphs"]) / chars
+        return chars * (1 - min(link_density, 1.0)) * container["weight"]
+
+    def main_text(self) -> str:
+        """점수가 가장 높은 블록의 문단 (문단 사이는 빈 줄)"""
+        self._end_paragraph()
+        # 문단 점수를 바로 위 블록에 전부, 그 위 블록에 절반 반영
+        totals = [0.0] * len(self._containers)
+        for container_id, container in enumerate(self._containers):
+            score = self._score(container)
+            if not score:
+                continue
+            totals[container_id] += score
+            parent = container["parent"]
+            if parent is not None:
+                totals[parent] += score / 2
+        best = max(range(len(totals)), key=totals.__getitem__)
+        if not totals[best]:
+            return ""
+
+        # 고른 블록과 그 하위 블록의 문단을 문서 순서대로
+        chosen = {best}
+        for container_id in range(best + 1, len(self._containers)):
+            if self._containers[container_id]["parent"] in chosen:
+                chosen.add(container_id)
+        paragraphs = []
+        for container_id in sorted(chosen):
+            container = self._containers[container_id]
+            if container["weight"] >= 1.0 or container_id == best:
+                paragraphs.extend(text for text, link in container["paragraphs"] if link < len(text) / 2)
+        return "\n\n".join(paragraphs)
+
+
+def extract_main_text(html_text: str, min_paragraph: int = None) -> str:
+    """HTML에서 본문 텍스트 추출 (못 찾으면 빈 문자열)"""
+    extractor = ContentExtractor(min_paragraph)
+    extractor.feed(html_text)
+    extractor.close()
+    return extractor.main_text()
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """max_chars 안에서 문장 끝으로 자르기 (문장 끝이 너무 앞이면 그냥 자름)"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    ends = [m.end() for m in re.finditer(r"[.!?。](?=\s)|다\.(?=\s|$)", cut)]
+    if ends and ends[-1] >= max_chars // 2:
+        return cut[:ends[-1]].rstrip()
+    return cut.rstrip() + "…"
+
+
+def decode_html(content: bytes, content_type: str = "") -> str:
+    """응답 본문 디코딩 (Content-Type → <meta charset> → UTF-8 순서)"""
+    match = re.search(r"charset=[\"']?([\w-]+)", content_type or "", re.I)
+    if not match:
+        match = re.search(rb"<meta[^>]+charset=[\"']?([\w-]+)", content[:4096], re.I)
+    encoding = match.group(1) if match else "utf-8"
+    if isinstance(encoding, bytes):
+        encoding = encoding.decode("ascii", "ignore")
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+class ExtractionCache:
+    """URL별 추출 결과 캐시 (성공은 ttl_hours, 실패는 failure_ttl_hours 동안 유지)"""
+
+    DB_PATH = Path(__file__).parent.parent / "data" / "enrich_cache.db"
+
+    def __init__(self, db_path: Path = None, config: dict = None):
+        self.config = {**ENRICHMENT, **(config or {})}
+        self.db_path = Path(db_path or self.DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS extracted (
+                url TEXT PRIMARY KEY,
+                fetched_at REAL NOT NULL,
+                ok INTEGER NOT NULL,
+                final_url TEXT,
+                text TEXT NOT NULL DEFAULT ''
+            );
+            CREATE INDEX IF NOT EXISTS idx_extracted_time ON extracted (fetched_at);
+        """)
+
+    def _cutoffs(self) -> tuple[float, float]:
+        now = time.time()
+        return now - self.config["ttl_hours"] * 3600, now - self.config["failure_ttl_hours"] * 3600
+
+    def get_many(self, urls: list[str]) -> dict[str, str]:
+        """캐시에 있는 URL → 추출 텍스트 (실패 기록은 빈 문자열)"""
+        if not urls:
+            return {}
+        ok_cutoff, failure_cutoff = self._cutoffs()
+        placeholders = ",".join("?" * len(urls))
+        rows = self.conn.execute(
+            f"""
+            SELECT url, text FROM extracted WHERE url IN ({placeholders})
+            AND ((ok = 1 AND fetched_at >= ?) OR (ok = 0 AND fetched_at >= ?))
+            """,
+            [*urls, ok_cutoff, failure_cutoff],
+        ).fetchall()
+        return dict(rows)
+
+    def put(self, url: str, text: str, final_url: str = None):
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO extracted (url, fetched_at, ok, final_url, text) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    fetched_at = excluded.fetched_at, ok = excluded.ok,
+                    final_url = excluded.final_url, text = excluded.text
+                """,
+                (url, time.time(), int(bool(text)), final_url, text),
+            )
+
+    def prune(self):
+        """만료된 항목 삭제"""
+        ok_cutoff, failure_cutoff = self._cutoffs()
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM extracted WHERE (ok = 1 AND fetched_at < ?) OR (ok = 0 AND fetched_at < ?)",
+                (ok_cutoff, failure_cutoff),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+class ArticleEnricher:
+    """상위 헤드라인 링크의 본문을 동시에 받아 프롬프트용 발췌문 생성
+
+    사용법:
+        enriched = ArticleEnricher().enrich(headlines)  # [{"title", "link", "source", "text"}, ...]
+    """
+
+    # Google News 링크는 기사 페이지로 바로 이동하지 않는 중간 페이지일 수 있음
+    GOOGLE_NEWS_HOST = "news.google.com"
+    USER_AGENT = "Mozilla/5.0 (compatible; auto-blog/1.0)"
+
+    def __init__(self, config: dict = None, cache: ExtractionCache = None):
+        self.config = {**ENRICHMENT, **(config or {})}
+        self._cache = cache
+
+    @property
+    def cache(self) -> ExtractionCache:
+        if self._cache is None:
+            self._cache = ExtractionCache(config=self.config)
+        return self._cache
+
+    # --- HTTP ---
+
+    async def _get(self, client: httpx.AsyncClient, url: str, host_limits: dict) -> httpx.Response:
+        """호스트별 동시 요청 수 제한 안에서 GET"""
+        host = urlsplit(url).hostname or ""
+        semaphore = host_limits.setdefault(host, asyncio.Semaphore(self.config["per_host"]))
+        async with semaphore:
+            response = await client.get(url)
+        response.raise_for_status()
+        return response
+
+    def _publisher_link(self, html_text: str, base_url: str) -> str | None:
+        """Google News 중간 페이지에서 원문 링크 찾기"""
+        match = re.search(r'data-n-au="([^"]+)"', html_text)
+        if not match:
+            match = re.search(r'<a[^>]+href="(https?://(?![^"/]*google\.)[^"]+)"', html_text)
+        return urljoin(base_url, unescape(match.group(1))) if match else None
+
+    async def _fetch_text(self, client: httpx.AsyncClient, url: str, host_limits: dict) -> tuple[str, str]:
+        """링크 → (최종 URL, 추출 본문). 실패하면 본문은 빈 문자열"""
+        try:
+            response = await self._get(client, url, host_limits)
+            if urlsplit(str(response.url)).hostname == self.GOOGLE_NEWS_HOST:
+                link = self._publisher_link(decode_html(response.content, response.headers.get("content-type")), str(response.url))
+                if not link:
+                    return str(response.url), ""
+                response = await self._get(client, link, host_limits)
+            if "html" not in response.headers.get("content-type", "text/html"):
+                return str(response.url), ""
+            html_text = decode_html(response.content, response.headers.get("content-type"))
+        except httpx.HTTPError:
+            return url, ""
+
+        # 파싱은 CPU 작업이므로 이벤트 루프를 막지 않게 스레드에서 실행
+        text = await asyncio.to_thread(extract_main_text, html_text, self.config["min_paragraph"])
+        return str(response.url), text
+
+    # --- 보강 ---
+
+    async def enrich_async(self, headlines: list) -> list[dict]:
+        """상위 top_k개 헤드라인의 본문 발췌 (캐시 우선, 나머지는 동시에 받음)"""
+        items = [h if isinstance(h, dict) else h.to_dict() for h in headlines]
+        items = [item for item in items if item.get("link")][:self.config["top_k"]]
+        urls = [item["link"] for item in items]
+
+        texts = self.cache.get_many(urls)
+        missing = [url for url in dict.fromkeys(urls) if url not in texts]
+        if missing:
+            limits = httpx.Limits(
+                max_connections=self.config["concurrency"],
+                max_keepalive_connections=self.config["concurrency"],
+            )
+            host_limits = {}
+            async with httpx.AsyncClient(
+                timeout=self.config["timeout"],
+                limits=limits,
+                follow_redirects=True,
+                headers={"User-Agent": self.USER_AGENT},
+            ) as client:
+                tasks = {asyncio.create_task(self._fetch_text(client, url, host_limits)): url for url in missing}
+                # 전체 대기 시간 상한 (느린 사이트 하나 때문에 글 생성이 늦어지지 않도록)
+                done, pending = await asyncio.wait(tasks, timeout=self.config["deadline"])
+                for task in pending:
+                    task.cancel()
+                for task in done:
+                    url = tasks[task]
+                    try:
+                        final_url, text = task.result()
+                    except Exception as e:
+                        # 잘못된 주소(httpx.InvalidURL) 등 예상 못 한 오류도 이 기사만 실패로 기록
+                        logger.debug(f"본문 추출 실패: {url}: {e!r}")
+                        final_url, text = url, ""
+                    texts[url] = text
+                    self.cache.put(url, text, final_url)
+                for task in pending:
+                    texts[tasks[task]] = ""  # 시간 초과는 캐시하지 않음 (다음 실행에서 다시 시도)
+
+        return [
+            {
+                "title": item["title"],
+                "link": item["link"],
+                "source": item.get("source", ""),
+                "text": truncate_text(texts[item["link"]], self.config["max_chars"]),
+            }
+            for item in items
+            if texts.get(item["link"])
+        ]
+
+    def enrich(self, headlines: list) -> list[dict]:
+        """enrich_async()의 동기 버전 (카세트 녹화/재생 지원)"""
+        cassette = get_cassette()
+        key = Cassette.key_for(*(h.link if not isinstance(h, dict) else h.get("link", "") for h in headlines))
+        if cassette and cassette.replaying:
+            return cassette.play("enrich", key)["items"]
+
+        started = time.perf_counter()
+        enriched = asyncio.run(self.enrich_async(headlines))
+        self.cache.prune()
+        if cassette:
+            cassette.record("enrich", key, {"items": enriched}, time.perf_counter() - started)
+        return enriched
+
+
+# 테스트: 로컬 고정 응답 서버로 동시/순차 시간 비교 + 캐시 적중 확인
+if __name__ == "__main__":
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    DELAY = 0.3
+    PAGE = """<html><head><meta charset="euc-kr"><title>{n}번 기사</title></head><body>
+    <header><nav><a href="/">홈</a> <a href="/news">뉴스</a></nav></header>
+    <div class="layout">
+      <div id="article-body" class="article-content">
+        <p>{n}번 기사 첫 문단입니다. 오픈AI가 새로운 모델을 공개하면서 업계의 관심이 집중되고 있다.</p>
+        <p>두 번째 문단에서는 성능 개선 폭과 가격 정책을 다룬다. 기존 모델 대비 응답 속도가 두 배 빨라졌다.
+        <p>세 번째 문단은 <a href="/x">전문가</a> 의견으로, 국내 기업들도 대응 전략을 서두르고 있다고 전했다.</p>
+      </div>
+      <aside class="sidebar"><p>많이 본 뉴스: 오늘의 인기 기사 모음과 추천 기사 목록이 여기에 표시됩니다.</p></aside>
+      <div class="related-news"><p><a href="/1">관련 기사 하나, 관련 기사 둘, 관련 기사 셋, 관련 기사 넷</a></p></div>
+    </div>
+    <footer><p>Copyright 2026 예시일보. 무단 전재 및 재배포 금지. 대표전화 02-000-0000</p></footer>
+    <script>var tracking = "이 텍스트는 본문이 아닙니다 이 텍스트는 본문이 아닙니다";</script>
+    </body></html>"""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(DELAY)
+            if self.path.startswith("/missing"):
+                self.send_error(404)
+                return
+            body = PAGE.format(n=self.path.strip("/")).encode("euc-kr")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")  # charset은 <meta>에서 찾아야 함
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    # 127.0.0.1과 localhost는 서로 다른 호스트로 취급됨 (호스트별 제한 확인용)
+    headlines = [
+        {"title": f"{i}번 헤드라인", "link": f"http://{host}:{port}/{i}", "source": "예시일보"}
+        for i, host in enumerate(["127.0.0.1", "localhost"] * 3 + ["127.0.0.1"], start=1)
+    ]
+    headlines.append({"title": "없는 기사", "link": f"http://127.0.0.1:{port}/missing", "source": "예시일보"})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"top_k": 8, "per_host": 2, "max_chars": 120}
+        for label, overrides in (("순차 (concurrency=1)", {"concurrency": 1, "per_host": 1}), ("동시", {})):
+            cache = ExtractionCache(Path(tmp) / f"{label}.db")
+            enricher = ArticleEnricher({**config, **overrides}, cache=cache)
+            started = time.perf_counter()
+            enriched = enricher.enrich(headlines)
+            elapsed = time.perf_counter() - started
+            print(f"{label:<20} {len(enriched)}/{len(headlines)}건 {elapsed:.2f}초")
+
+        started = time.perf_counter()
+        enriched = enricher.enrich(headlines)
+        print(f"{'캐시 재실행':<20} {len(enriched)}/{len(headlines)}건 {time.perf_counter() - started:.2f}초")
+        cache.close()
+
+    server.shutdown()
+    print("\n발췌 예시:")
+    print(enriched[0]["text"])
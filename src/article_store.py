@@ -0,0 +1,69 @@
+"""
+생성된 글 저장소 (data/articles/)
+글 저장/조회를 한곳에서 처리 (압축 저장, 예전 평문 JSON도 그대로 읽음)
+"""
+import sys
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.record_codec import RecordCodec, find_record, get_codec, list_records, read_record
+from src.storage import unique_id
+
+
+class ArticleStore:
+    """JSON 레코드 파일 기반 글 저장소"""
+
+    ARTICLES_DIR = Path(__file__).parent.parent / "data" / "articles"
+
+    def __init__(self, articles_dir: Path = None, codec: RecordCodec = None):
+        self.articles_dir = Path(articles_dir or self.ARTICLES_DIR)
+        self.articles_dir.mkdir(parents=True, exist_ok=True)
+        self._codec = codec
+
+    @property
+    def codec(self) -> RecordCodec:
+        return self._codec or get_codec()
+
+    def path_for(self, article_id: str) -> Path:
+        """글 ID에 해당하는 파일 경로 (저장된 형식 그대로, 없으면 새로 저장할 경로)"""
+        return find_record(self.articles_dir, article_id) or self.articles_dir / f"{article_id}{self.codec.suffix}"
+
+    def exists(self, article_id: str) -> bool:
+        return find_record(self.articles_dir, article_id) is not None
+
+    def save(self, article: dict, article_id: str = None, created_at: str = None) -> str:
+        """글 저장 및 ID 반환 (article_id를 주면 그 ID로 저장, 같은 ID가 있으면 덮어씀)"""
+        article_id = article_id or unique_id()
+        article["id"] = article_id
+        article["created_at"] = created_at or datetime.now().isoformat()
+
+        # 임시 파일에 쓰고 교체 (목록/미리보기가 쓰는 도중의 파일을 읽지 않도록)
+        self.codec.write(self.articles_dir, article_id, article)
+
+        return article_id
+
+    def load(self, article_id: str) -> dict:
+        """글 ID로 불러오기"""
+        return self.load_file(self.path_for(article_id))
+
+    @staticmethod
+    def load_file(path: Path) -> dict:
+        """글 파일 불러오기 (평문/압축 모두)"""
+        return read_record(path)
+
+    def list_files(self, newest_first: bool = False) -> list[Path]:
+        """글 파일 목록 (ID가 생성 시각 순서)"""
+        records = list_records(self.articles_dir)
+        return [records[article_id] for article_id in sorted(records, reverse=newest_first)]
+
+    def list_ids(self, newest_first: bool = False) -> list[str]:
+        """글 ID 목록 (파일 내용은 읽지 않음)"""
+        return sorted(list_records(self.articles_dir), reverse=newest_first)
+
+    def iter_articles(self, newest_first: bool = False) -> Iterator[dict]:
+        """글을 하나씩 불러오기"""
+        for path in self.list_files(newest_first=newest_first):
+            yield self.load_file(path)
@@ -0,0 +1,129 @@
+"""
+ARTICLE_CONFIG 기준 글 품질 검사 모듈
+글자 수, 태그별 키워드 밀도, 소제목 구조를 HTML 1회 순회로 계산
+"""
+import hashlib
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import ARTICLE_CONFIG
+from src.html_processor import process_html
+
+
+class ArticleValidator:
+    """생성된 글을 로컬에서 빠르게 검사하는 검증기"""
+
+    def __init__(self, config: dict = None):
+        self.config = config or ARTICLE_CONFIG
+        self._cache = {}
+
+    @staticmethod
+    def content_hash(article: dict) -> str:
+        """본문 + 태그 기반 해시 (같은 글은 다시 검사하지 않음)"""
+        tags = "|".join(article.get("tags", []))
+        content = f"{article.get('content', '')}\x00{tags}"
+        return hashlib.sha1(content.encode()).hexdigest()[:16]
+
+    def validate(self, article: dict) -> dict:
+        """글 검사 결과 반환
+
+        Returns:
+            {"valid", "content_hash", "char_count", "word_count",
+             "keyword_density", "headings", "issues"}
+        """
+        key = self.content_hash(article)
+        if key in self._cache:
+            return self._cache[key]
+
+        # 이전 실행에서 검사해 저장해둔 결과 재사용
+        previous = article.get("validation")
+        if previous and previous.get("content_hash") == key:
+            self._cache[key] = previous
+            return previous
+
+        tags = article.get("tags", [])
+        doc = process_html(article.get("content", ""), keywords=tags)
+
+        issues = []
+        issues.extend(self._check_length(doc.char_count))
+        density = {
+            tag: round(count / doc.word_count, 4) if doc.word_count else 0.0
+            for tag, count in doc.keyword_counts.items()
+        }
+        issues.extend(self._check_density(density, tags))
+        issues.extend(self._check_headings(doc.headings))
+
+        result = {
+            "valid": not issues,
+            "content_hash": key,
+            "char_count": doc.char_count,
+            "word_count": doc.word_count,
+            "keyword_density": density,
+            "headings": [f"h{level} {text}" for level, text in doc.headings],
+            "issues": issues,
+        }
+        self._cache[key] = result
+        return result
+
+    def _check_length(self, char_count: int) -> list[dict]:
+        """본문 글자 수 검사"""
+        min_length = self.config["min_length"]
+        max_length = self.config["max_length"]
+        if char_count < min_length:
+            return [{"type": "too_short", "message": f"본문이 {char_count}자로 최소 {min_length}자보다 짧다"}]
+        if char_count > max_length:
+            return [{"type": "too_long", "message": f"본문이 {char_count}자로 최대 {max_length}자보다 길다"}]
+        return []
+
+    def _check_density(self, density: dict, tags: list[str]) -> list[dict]:
+        """대표 키워드(첫 번째 태그) 부족 + 태그 남용 검사"""
+        issues = []
+        target = self.config["keyword_density"]
+        limit = self.config.get("max_keyword_density", target * 2)
+
+        if tags and density.get(tags[0], 0.0) < target:
+            issues.append({
+                "type": "low_density",
+                "keyword": tags[0],
+                "message": f"대표 키워드 '{tags[0]}' 밀도가 {density.get(tags[0], 0.0):.1%}로 목표 {target:.1%}보다 낮다",
+            })
+        for tag, value in density.items():
+            if value > limit:
+                issues.append({
+                    "type": "keyword_stuffing",
+                    "keyword": tag,
+                    "message": f"키워드 '{tag}' 밀도가 {value:.1%}로 {limit:.1%}를 넘는다",
+                })
+        return issues
+
+    def _check_headings(self, headings: list[tuple[int, str]]) -> list[dict]:
+        """소제목 구조 검사 (h2 개수, h2 이전 h3, 빈 소제목)"""
+        issues = []
+        min_headings = self.config.get("min_headings", 3)
+        h2_count = sum(1 for level, _ in headings if level == 2)
+
+        if h2_count < min_headings:
+            issues.append({"type": "few_headings", "message": f"h2 소제목이 {h2_count}개로 최소 {min_headings}개보다 적다"})
+        if headings and headings[0][0] != 2:
+            issues.append({"type": "heading_order", "message": f"첫 소제목이 h2가 아니라 h{headings[0][0]}이다"})
+        if any(not text for _, text in headings):
+            issues.append({"type": "empty_heading", "message": "내용이 비어 있는 소제목이 있다"})
+        return issues
+
+
+# 테스트
+if __name__ == "__main__":
+    validator = ArticleValidator()
+
+    test_article = {
+        "title": "ChatGPT 5.0 출시 임박, 달라지는 3가지",
+        "content": "<h2>들어가며</h2><p>ChatGPT 새 모델이 나온다.</p><h3>핵심</h3><p>ChatGPT는 빨라진다.</p>",
+        "tags": ["ChatGPT", "AI", "OpenAI"],
+    }
+
+    result = validator.validate(test_article)
+    print(f"통과: {result['valid']} / 글자 수: {result['char_count']}")
+    print(f"키워드 밀도: {result['keyword_density']}")
+    for issue in result["issues"]:
+        print(f"  - [{issue['type']}] {issue['message']}")
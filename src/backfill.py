@@ -0,0 +1,398 @@
+"""
+대량 재생성/백필 모듈 (python main.py backfill --workers N)
+SQLite 작업 큐(data/backfill.db)를 여러 프로세스가 나눠 처리하고,
+프로세스마다 ContentGenerator를 한 번만 만들어 재사용한다.
+중간에 종료돼도 같은 명령을 다시 실행하면 남은 작업부터 이어서 처리한다.
+"""
+import json
+import sqlite3
+import sys
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import BACKFILL, FEED
+from src.article_store import ArticleStore
+from src.content_generator import ContentGenerator
+from src.dedup_index import DedupIndex
+from src.feed_builder import FeedBuilder
+from src.health import CircuitOpenError
+from src.logs import current_config, get_logger, log_context, setup_logging
+from src.news_collector import NewsCollector
+from src.preview_store import PreviewStore
+from src.storage import unique_id
+
+logger = get_logger("backfill")
+
+DB_PATH = Path(__file__).parent.parent / "data" / "backfill.db"
+
+
+class JobQueue:
+    """여러 프로세스가 공유하는 디스크 작업 큐
+
+    작업 종류:
+        info: {"category": "ai", "date": "2025-01-31"}
+        experience: {"memo": "...", "category": "일상/리뷰"}
+    """
+
+    def __init__(self, db_path: Path = None, config: dict = None):
+        self.db_path = Path(db_path or DB_PATH)
+        self.config = {**BACKFILL, **(config or {})}
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 트랜잭션은 BEGIN IMMEDIATE로 직접 관리 (프로세스 간 동시 claim 방지)
+        self.conn = sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_key TEXT NOT NULL UNIQUE,
+                kind TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL NOT NULL DEFAULT 0,
+                worker TEXT,
+                article_id TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+            CREATE TABLE IF NOT EXISTS rate_limit (
+                name TEXT PRIMARY KEY,
+                next_at REAL NOT NULL
+            );
+        """)
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # --- 등록 ---
+
+    def enqueue(self, kind: str, payload: dict) -> bool:
+        """작업 등록 (같은 작업이 이미 있으면 무시)"""
+        payload_json = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (job_key, kind, payload, updated_at) VALUES (?, ?, ?, ?)",
+                (f"{kind}:{payload_json}", kind, payload_json, time.time()),
+            )
+        return cursor.rowcount > 0
+
+    def enqueue_dates(self, categories: list[str], start: str, end: str) -> int:
+        """카테고리 x 날짜 범위의 정보형 글 작업 등록"""
+        day = datetime.strptime(start, "%Y-%m-%d")
+        last = datetime.strptime(end, "%Y-%m-%d")
+        added = 0
+        while day <= last:
+            for category in categories:
+                added += self.enqueue("info", {"category": category, "date": day.strftime("%Y-%m-%d")})
+            day += timedelta(days=1)
+        return added
+
+    # --- 처리 ---
+
+    def recover(self) -> int:
+        """이전 실행이 비정상 종료되어 처리 중으로 남은 작업을 대기로 되돌림
+
+        임대 기간이 남은 작업은 다른 실행이 처리 중일 수 있으므로 건드리지 않는다.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'pending', worker = NULL, updated_at = ?"
+                " WHERE status = 'running' AND lease_until < ?",
+                (now, now),
+            )
+        return cursor.rowcount
+
+    def retry_failed(self) -> int:
+        """실패한 작업을 시도 횟수를 초기화해서 다시 대기로"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0, updated_at = ? WHERE status = 'failed'",
+                (time.time(),),
+            )
+        return cursor.rowcount
+
+    def claim(self, worker: str) -> dict | None:
+        """다음 작업 가져오기 (대기 중이거나 임대 기간이 지난 작업)
+
+        처음 가져갈 때 저장할 글 ID를 정해 두어, 중단 후 다시 처리해도 같은 ID로 저장된다.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                """
+                SELECT id, kind, payload, attempts, article_id FROM jobs
+                WHERE status = 'pending' OR (status = 'running' AND lease_until < ?)
+                ORDER BY id LIMIT 1
+                """,
+                (now,),
+            ).fetchone()
+            if row is None:
+                return None
+            article_id = row[4] or unique_id(at=self._article_time(json.loads(row[2])))
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                    lease_until = ?, worker = ?, article_id = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (now + self.config["lease_seconds"], worker, article_id, now, row[0]),
+            )
+        return {
+            "id": row[0],
+            "kind": row[1],
+            "payload": json.loads(row[2]),
+            "attempts": row[3] + 1,
+            "article_id": article_id,
+        }
+
+    @staticmethod
+    def _article_time(payload: dict) -> datetime:
+        """글 ID/생성 시각 기준 (날짜 작업은 그 날짜, 스케줄러/사이트맵이 오늘 글로 보지 않도록)"""
+        now = datetime.now()
+        if payload.get("date"):
+            return datetime.combine(datetime.strptime(payload["date"], "%Y-%m-%d").date(), now.time())
+        return now
+
+    def release(self, job_id: int):
+        """시도 횟수를 되돌리고 다시 대기로 (외부 서비스 차단 중이라 시도하지 못한 작업)"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), worker = NULL, updated_at = ?"
+                " WHERE id = ?",
+                (time.time(), job_id),
+            )
+
+    def complete(self, job_id: int, article_id: str):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', article_id = ?, error = NULL, updated_at = ? WHERE id = ?",
+                (article_id, time.time(), job_id),
+            )
+
+    def fail(self, job_id: int, error: str, attempts: int):
+        """실패 기록 (최대 시도 횟수 전이면 다시 대기로)"""
+        status = "failed" if attempts >= self.config["max_attempts"] else "pending"
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, error[:500], time.time(), job_id),
+            )
+
+    def counts(self) -> dict:
+        """상태별 작업 수"""
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {"pending": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def completed_since(self, since: float) -> list[str]:
+        """해당 시각 이후 완료된 작업의 글 ID (완료 순)"""
+        rows = self.conn.execute(
+            "SELECT article_id FROM jobs WHERE status = 'done' AND updated_at >= ? ORDER BY updated_at",
+            (since,),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    # --- 속도 제한 ---
+
+    def throttle(self, name: str = "gemini"):
+        """모든 프로세스 합산 분당 호출 수 제한 (다음 호출 가능 시각을 DB에 공유)"""
+        interval = 60.0 / self.config["requests_per_minute"] if self.config["requests_per_minute"] > 0 else 0.0
+        if not interval:
+            return
+        with self._transaction() as conn:
+            row = conn.execute("SELECT next_at FROM rate_limit WHERE name = ?", (name,)).fetchone()
+            now = time.time()
+            start_at = max(now, row[0] if row else 0.0)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit (name, next_at) VALUES (?, ?)",
+                (name, start_at + interval),
+            )
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def close(self):
+        self.conn.close()
+
+
+# --- 작업 프로세스 ---
+
+# 프로세스마다 한 번만 만드는 객체 (모델/설정 재사용)
+_worker = {}
+
+
+def _init_worker(db_path: str, config: dict, log_config: dict):
+    setup_logging(**log_config)  # 부모와 같은 실행 ID/레벨/JSON 파일
+    queue = JobQueue(db_path, config)
+    generator = ContentGenerator()
+    generator.router.throttle = queue.throttle
+    _worker.update(
+        queue=queue,
+        generator=generator,
+        collector=NewsCollector(),
+        articles=ArticleStore(),
+        previews=PreviewStore(),
+        dedup=DedupIndex(),
+        feed=FeedBuilder() if FEED["enabled"] else None,
+    )
+
+
+def _run_job(job: dict) -> dict:
+    """작업 하나 처리 후 생성된 글 반환"""
+    payload = job["payload"]
+    generator = _worker["generator"]
+
+    if job["kind"] == "info":
+        news_data = _worker["collector"].collect_news_titles(payload["category"], date=payload.get("date"))
+        if not news_data.get("titles"):
+            raise RuntimeError("뉴스 수집 결과 없음")
+        article = generator.generate_unified_article(news_data, use_cache=False)
+    elif job["kind"] == "experience":
+        article = generator.generate_experience_article(payload["memo"], payload.get("category", "일상/리뷰"))
+    else:
+        raise ValueError(f"알 수 없는 작업 종류: {job['kind']}")
+
+    article["backfill"] = {"job_id": job["id"], **payload}
+    return article
+
+
+def _worker_loop(worker: str) -> int:
+    """큐가 빌 때까지 작업 처리 (처리한 작업 수 반환)"""
+    queue = _worker["queue"]
+    processed = 0
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            return processed
+        articles = _worker["articles"]
+        article_id = job["article_id"]
+        try:
+            if articles.exists(article_id):
+                # 저장 후 완료 기록 전에 중단된 작업: 다시 생성하지 않고 저장된 글로 마무리
+                article = articles.load(article_id)
+            else:
+                with log_context(job_id=job["id"]):
+                    article = _run_job(job)
+                # 생성 시각은 글 ID의 시각 (날짜 작업이면 그 날짜)
+                articles.save(article, article_id, datetime.strptime(article_id[:15], "%Y%m%d_%H%M%S").isoformat())
+        except CircuitOpenError as e:
+            # 차단이 풀릴 때까지 시도 횟수를 쓰지 않고 기다림
+            queue.release(job["id"])
+            time.sleep(min(max(e.retry_in, 1.0), 60.0))
+            continue
+        except Exception as e:
+            logger.warning(f"  작업 {job['id']} 실패: {type(e).__name__}: {e}")
+            queue.fail(job["id"], f"{type(e).__name__}: {e}", job["attempts"])
+            continue
+
+        try:
+            _worker["previews"].render(article)
+        except Exception:
+            pass  # 미리보기는 승인 화면에서 다시 렌더링
+        # 지난 날짜 글은 중복 검사 인덱스의 동기화 기준(마지막 글 ID)보다 앞서므로 직접 추가
+        try:
+            _worker["dedup"].add(article)
+        except Exception as e:
+            logger.warning(f"  중복 검사 인덱스 추가 실패: {e}")
+        if _worker["feed"] is not None:
+            try:
+                _worker["feed"].add(article)
+            except Exception as e:
+                logger.warning(f"  피드/사이트맵 갱신 실패 (python main.py feed로 다시 생성): {e}")
+        queue.complete(job["id"], article_id)
+        processed += 1
+
+
+def run_backfill(workers: int = None, db_path: Path = None, config: dict = None) -> dict:
+    """작업 큐가 빌 때까지 여러 프로세스로 처리하며 진행 상황 출력"""
+    config = {**BACKFILL, **(config or {})}
+    workers = workers or config["workers"]
+    queue = JobQueue(db_path, config)
+
+    recovered = queue.recover()
+    if recovered:
+        logger.info(f"  - 이전 실행에서 중단된 작업 {recovered}건 재개")
+
+    start_counts = queue.counts()
+    if start_counts["running"]:
+        logger.info(f"  - 다른 실행이 처리 중인 작업 {start_counts['running']}건은 건너뜀 (임대가 끝나면 다시 처리)")
+    total = sum(start_counts.values())
+    todo = start_counts["pending"]
+    logger.info(f"  - 작업 {total}건 (대기 {todo}, 완료 {start_counts['done']}, 실패 {start_counts['failed']})")
+    if not todo:
+        queue.close()
+        return start_counts
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(str(queue.db_path), config, current_config()),
+    ) as executor:
+        futures = [executor.submit(_worker_loop, f"worker-{i}") for i in range(workers)]
+        while not all(f.done() for f in futures):
+            time.sleep(config["progress_interval"])
+            counts = queue.counts()
+            finished = counts["done"] - start_counts["done"] + counts["failed"] - start_counts["failed"]
+            elapsed = time.perf_counter() - started
+            rate = finished / elapsed * 60
+            eta = f"{(todo - finished) / rate:.0f}분" if rate else "-"
+            logger.info(
+                f"  진행: {finished}/{todo} (처리 중 {counts['running']}, 실패 {counts['failed']})"
+                f" / {rate:.1f}건/분 / 남은 시간 약 {eta}"
+            )
+        for future in futures:
+            future.result()
+
+    counts = queue.counts()
+    queue.close()
+    return counts
+
+
+# 테스트: 가짜 생성기로 큐/재개/속도 제한 확인
+if __name__ == "__main__":
+    import tempfile
+    from multiprocessing import Process
+
+    def fake_worker(db_path: str, name: str):
+        queue = JobQueue(db_path, {"requests_per_minute": 1200})
+        while (job := queue.claim(name)) is not None:
+            queue.throttle()
+            queue.complete(job["id"], f"article-{job['id']}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Path(tmp) / "backfill.db"
+        queue = JobQueue(db)
+        added = queue.enqueue_dates(["ai", "health", "economy", "lifestyle"], "2025-01-01", "2025-01-25")
+        print(f"등록: {added}건 (재등록 시 {queue.enqueue_dates(['ai'], '2025-01-01', '2025-01-25')}건)")
+
+        # 처리 중인 작업은 그대로 두고, 처리 중에 죽은 작업(임대 만료)만 recover()로 재개
+        queue.claim("running")
+        print(f"임대 중인 작업 복구: {queue.recover()}건")
+        queue.conn.execute("UPDATE jobs SET lease_until = 0 WHERE worker = 'running'")
+        print(f"중단 작업 복구: {queue.recover()}건")
+
+        start = time.perf_counter()
+        procs = [Process(target=fake_worker, args=(str(db), f"w{i}")) for i in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+        print(f"처리: {queue.counts()} / {elapsed:.2f}s (분당 1200회 제한 → 최소 {added / 20:.1f}s)")
+        queue.close()
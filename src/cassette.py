@@ -0,0 +1,145 @@
+"""
+외부 I/O 녹화/재생 모듈 (RSS 응답, Gemini 응답)
+녹화 모드에서는 실행 중 받은 원본 응답을 시간 정보와 함께 압축 파일(data/cassettes/)에 저장하고,
+재생 모드에서는 네트워크 대신 녹화된 응답을 돌려준다.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import sys
+import os
+from collections import defaultdict, deque
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.storage import atomic_open, unique_id
+
+CASSETTE_DIR = Path(__file__).parent.parent / "data" / "cassettes"
+
+# 현재 실행에서 사용 중인 카세트 (없으면 None)
+_active = None
+
+
+class CassetteMiss(Exception):
+    """재생할 녹화 응답이 없음"""
+
+
+class Cassette:
+    """실행 1회 분량의 외부 응답 녹화본"""
+
+    def __init__(self, mode: str, path: Path, meta: dict = None, entries: list[dict] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"알 수 없는 카세트 모드: {mode}")
+        self.mode = mode
+        self.path = Path(path)
+        self.meta = meta or {}
+        self.entries = entries or []
+
+        # 재생용: (종류, 키)별 / 종류별 대기열
+        self._by_key = defaultdict(deque)
+        self._by_kind = defaultdict(deque)
+        for i, entry in enumerate(self.entries):
+            self._by_key[(entry["kind"], entry["key"])].append(i)
+            self._by_kind[entry["kind"]].append(i)
+        self._played = set()
+
+    @classmethod
+    def recorder(cls, command: str = "") -> "Cassette":
+        """새 녹화 카세트 (data/cassettes/<run_id>.jsonl.gz)"""
+        run_id = unique_id()
+        meta = {"run_id": run_id, "command": command, "started_at": datetime.now().isoformat()}
+        return cls("record", CASSETTE_DIR / f"{run_id}.jsonl.gz", meta=meta)
+
+    @classmethod
+    def load(cls, path) -> "Cassette":
+        """녹화 파일 불러와서 재생 모드로 열기"""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        meta = lines[0] if lines and "kind" not in lines[0] else {}
+        entries = lines[1:] if meta else lines
+        return cls("replay", path, meta=meta, entries=entries)
+
+    @staticmethod
+    def key_for(*parts: str) -> str:
+        """긴 요청(프롬프트 등)을 짧은 키로 변환"""
+        return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(self, kind: str, key: str, payload: dict, elapsed: float):
+        """응답 한 건 녹화"""
+        self.entries.append({
+            "kind": kind,
+            "key": key,
+            "elapsed": round(elapsed, 4),
+            "payload": payload,
+        })
+
+    def play(self, kind: str, key: str) -> dict:
+        """녹화된 응답 재생 (키가 맞는 응답 우선, 없으면 같은 종류의 다음 응답)"""
+        for queue in (self._by_key[(kind, key)], self._by_kind[kind]):
+            while queue:
+                i = queue.popleft()
+                if i not in self._played:
+                    self._played.add(i)
+                    return self.entries[i]["payload"]
+        raise CassetteMiss(f"녹화된 응답 없음: {kind} {key}")
+
+    def save(self) -> Path:
+        """녹화 내용을 gzip JSON Lines로 저장"""
+        with atomic_open(self.path, "wb", fsync=False) as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(self.meta, ensure_ascii=False) + "\n")
+            for entry in self.entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return self.path
+
+    # --- 종류별 직렬화 도우미 ---
+
+    @staticmethod
+    def encode_bytes(data: bytes) -> dict:
+        return {"body_b64": base64.b64encode(data).decode("ascii")}
+
+    @staticmethod
+    def decode_bytes(payload: dict) -> bytes:
+        return base64.b64decode(payload["body_b64"])
+
+    @staticmethod
+    def encode_gemini(response) -> dict:
+        usage = getattr(response, "usage_metadata", None)
+        return {
+            "text": response.text,
+            "prompt_token_count": getattr(usage, "prompt_token_count", 0) or 0,
+            "candidates_token_count": getattr(usage, "candidates_token_count", 0) or 0,
+        }
+
+    @staticmethod
+    def decode_gemini(payload: dict):
+        """Gemini 응답처럼 쓸 수 있는 객체 (text, usage_metadata)"""
+        return SimpleNamespace(
+            text=payload["text"],
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=payload.get("prompt_token_count", 0),
+                candidates_token_count=payload.get("candidates_token_count", 0),
+            ),
+        )
+
+
+def get_cassette() -> Cassette | None:
+    """현재 사용 중인 카세트"""
+    return _active
+
+
+def use_cassette(cassette: Cassette | None):
+    """카세트 활성화 (None이면 해제)"""
+    global _active
+    _active = cassette
+
+
+def is_replaying() -> bool:
+    """재생 모드 여부 (네트워크/외부 발송 생략 판단용)"""
+    return _active is not None and _active.replaying
@@ -0,0 +1,116 @@
+"""
+카테고리 스케줄러 (가중치 기반 stride 스케줄링)
+최근 생성 이력(글 저장소)과 카테고리별 새 뉴스량을 보고,
+설정된 가중치 비율에 가장 못 미친 카테고리를 고른다.
+"""
+import sys
+import os
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import CATEGORIES, CATEGORY_SCHEDULER
+from src.article_store import ArticleStore
+
+
+class CategoryScheduler:
+    """최근 이력 기반 stride 스케줄러
+
+    카테고리마다 stride = 1 / 가중치 로 두고, 최근 기간에 생성된 글 수 x stride(= pass)가
+    가장 작은 카테고리를 고른다. 같은 카테고리가 연속으로 뽑히지 않으면서
+    장기적으로는 가중치 비율대로 나뉜다.
+    """
+
+    def __init__(
+        self,
+        categories: dict = None,
+        article_store: ArticleStore = None,
+        headline_store=None,
+        config: dict = None,
+    ):
+        self.categories = categories or CATEGORIES
+        self.article_store = article_store or ArticleStore()
+        self.headline_store = headline_store
+        self.config = {**CATEGORY_SCHEDULER, **(config or {})}
+        # 예전 글은 category_key가 없어서 카테고리 이름으로 매칭
+        self._name_to_key = {info["name"]: key for key, info in self.categories.items()}
+
+    def _category_of(self, article: dict) -> str | None:
+        key = article.get("category_key")
+        if key in self.categories:
+            return key
+        return self._name_to_key.get(article.get("category", ""))
+
+    def recent_history(self) -> dict[str, dict]:
+        """최근 기간 카테고리별 생성 글 수와 마지막 생성 ID"""
+        cutoff = (datetime.now() - timedelta(days=self.config["window_days"])).strftime("%Y%m%d_%H%M%S")
+        history = {key: {"count": 0, "last_id": ""} for key in self.categories}
+
+        # 글 ID가 생성 시각으로 시작하므로 기간 밖의 글은 열지 않는다
+        for article_id in self.article_store.list_ids():
+            if article_id < cutoff:
+                continue
+            article = self.article_store.load(article_id)
+            if article.get("article_type") == "experience":
+                continue
+            key = self._category_of(article)
+            if key is not None:
+                history[key]["count"] += 1
+                history[key]["last_id"] = max(history[key]["last_id"], article_id)
+        return history
+
+    def volume_factor(self, category: str) -> float:
+        """최근 새 헤드라인 비율 기반 보정값 (새 뉴스가 적으면 중복 글이 나오기 쉬워 후순위)"""
+        if self.headline_store is None:
+            return 1.0
+        days = self.headline_store.trend_history(category, days=self.config["volume_days"])
+        total = sum(d["total"] for d in days)
+        if not total:
+            return 1.0
+        new_ratio = sum(d["new"] for d in days) / total
+        return max(self.config["volume_floor"], min(1.0, new_ratio / self.config["volume_target"]))
+
+    def plan(self) -> list[dict]:
+        """카테고리별 pass 값 (작을수록 먼저 뽑힘)"""
+        history = self.recent_history()
+        rows = []
+        for key, info in self.categories.items():
+            weight = info["weight"] * self.volume_factor(key)
+            stride = 1.0 / weight if weight > 0 else float("inf")
+            rows.append({
+                "category": key,
+                "count": history[key]["count"],
+                "weight": weight,
+                # 다음 글을 생성했을 때의 pass (count + 1) * stride
+                "pass": (history[key]["count"] + 1) * stride,
+                "last_id": history[key]["last_id"],
+            })
+        # 동률이면 가장 오래 전에 생성한 카테고리 먼저
+        return sorted(rows, key=lambda r: (r["pass"], r["last_id"]))
+
+    def next_category(self) -> str:
+        return self.plan()[0]["category"]
+
+
+# 테스트: 가짜 이력으로 30일 스케줄 시뮬레이션
+if __name__ == "__main__":
+    import tempfile
+    from collections import Counter
+    from pathlib import Path
+
+    weights = {"ai": 0.4, "health": 0.2, "economy": 0.3, "lifestyle": 0.1}
+    categories = {key: {**CATEGORIES[key], "weight": w} for key, w in weights.items()}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ArticleStore(Path(tmp))
+        scheduler = CategoryScheduler(categories=categories, article_store=store, config={"window_days": 365})
+        picks = []
+        for _ in range(30):
+            category = scheduler.next_category()
+            store.save({"category_key": category, "article_type": "unified"})
+            picks.append(category)
+
+        print(f"순서: {' '.join(picks)}")
+        print(f"연속 같은 카테고리: {sum(1 for a, b in zip(picks, picks[1:]) if a == b)}회")
+        counts = Counter(picks)
+        for key, w in weights.items():
+            print(f"  {key:<10} 목표 {w:.0%} / 실제 {counts[key] / len(picks):.0%}")
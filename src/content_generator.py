@@ -12,13 +12,26 @@ from pathlib import Path
 import google.generativeai as genai
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.settings import GEMINI_API_KEY
+from config.settings import GEMINI_API_KEY, ARTICLE_CONFIG
+from src.article_validator import ArticleValidator
+from src.cassette import is_replaying
+from src.html_processor import process_html, replace_headings
+from src.logs import get_logger
+from src.model_router import ModelRouter
+from src.profiler import profile_stage
+from src.record_codec import find_record, get_codec, list_records, read_record
 from src.templates.prompts import (
     EXPERIENCE_ARTICLE_PROMPT,
     UNIFIED_ARTICLE_PROMPT,
     CHANGE_SUB_TITLE_PROMPT,
+    CHANGE_SUB_TITLE_JSON_PROMPT,
+    REPAIR_ARTICLE_PROMPT,
+    AVOID_TOPICS_HINT,
+    ENRICHED_CONTEXT_HINT,
 )
 
+logger = get_logger("content_generator")
+
 
 class ContentGenerator:
     """Gemini 기반 콘텐츠 생성기"""
@@ -27,50 +40,57 @@ class ContentGenerator:
     CACHE_DIR = Path(__file__).parent.parent / "data" / "cache"
 
     def __init__(self):
-        if not GEMINI_API_KEY:
+        # 재생 모드에서는 녹화된 응답을 쓰므로 API 키가 필요 없다
+        if not GEMINI_API_KEY and not is_replaying():
             raise ValueError("GEMINI_API_KEY가 설정되지 않았습니다.")
 
         genai.configure(api_key=GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(
-            "gemini-2.5-flash",
-            generation_config={
-                "response_mime_type": "application/json",
-                "max_output_tokens": 16384,
-            }
-        )
+        # 작업별 모델/출력 한도는 config/settings.py의 MODEL_ROUTES 참고
+        self.router = ModelRouter()
+        self.validator = ArticleValidator()
         # 캐시 디렉토리 생성
         self.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
     def _get_cache_key(self, news_titles: list, category: str) -> str:
         """뉴스 제목 기반 캐시 키 생성 (당일 기준)"""
         today = datetime.now().strftime("%Y%m%d")
-        titles_str = "|".join(sorted([t["title"] for t in news_titles[:10]]))
+        titles_str = "|".join(sorted([t.title for t in news_titles[:10]]))
         content = f"{today}:{category}:{titles_str}"
         return hashlib.md5(content.encode()).hexdigest()[:12]
 
     def _get_cached_article(self, cache_key: str) -> dict | None:
         """캐시된 글 가져오기"""
-        cache_file = self.CACHE_DIR / f"{cache_key}.json"
-        if cache_file.exists():
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached = json.load(f)
-                # 당일 캐시만 유효
-                if cached.get("cached_date") == datetime.now().strftime("%Y%m%d"):
-                    print("📦 캐시된 글 사용")
-                    return cached.get("article")
+        cache_file = find_record(self.CACHE_DIR, cache_key)
+        if cache_file is not None:
+            cached = read_record(cache_file)
+            # 당일 캐시만 유효
+            if cached.get("cached_date") == datetime.now().strftime("%Y%m%d"):
+                logger.info("📦 캐시된 글 사용")
+                return cached.get("article")
         return None
 
     def _save_to_cache(self, cache_key: str, article: dict):
         """글 캐시에 저장"""
-        cache_file = self.CACHE_DIR / f"{cache_key}.json"
         cache_data = {
             "cached_date": datetime.now().strftime("%Y%m%d"),
             "cached_at": datetime.now().isoformat(),
             "article": article,
         }
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        get_codec().write(self.CACHE_DIR, cache_key, cache_data)
+
+    def _latest_cached_article(self, category: str, category_name: str) -> dict | None:
+        """카테고리의 가장 최근 캐시 글 (날짜 무관, Gemini를 쓸 수 없을 때 대체용)"""
+        cache_files = sorted(list_records(self.CACHE_DIR).values(), key=lambda p: p.stat().st_mtime, reverse=True)
+        for cache_file in cache_files:
+            article = read_record(cache_file).get("article") or {}
+            # 예전 캐시는 category_key가 없어서 카테고리 이름으로 비교
+            if article.get("category_key", category) == category and (
+                "category_key" in article or article.get("category") == category_name
+            ):
+                return article
+        return None
 
+    @profile_stage("parse")
     def _parse_json_response(self, text: str) -> dict:
         """응답에서 JSON 추출"""
         original_text = text  # 디버깅용 원본 저장
@@ -153,11 +173,11 @@ class ContentGenerator:
 
             # 필수 필드 확인
             if result.get("title") and result.get("content"):
-                print("  (필드별 추출 방식으로 파싱 성공)")
+                logger.info("  (필드별 추출 방식으로 파싱 성공)")
                 return self._clean_content(result)
 
         except Exception as e:
-            print(f"필드별 추출 실패: {e}")
+            logger.debug(f"필드별 추출 실패: {e}")
 
         # 네 번째 시도: content 필드 내 따옴표 이스케이프 문제 해결
         try:
@@ -166,7 +186,7 @@ class ContentGenerator:
             result = json.loads(fixed_text)
             return self._clean_content(result)
         except json.JSONDecodeError as e:
-            print(f"네 번째 시도 실패: {e}")
+            logger.debug(f"네 번째 시도 실패: {e}")
 
         # 다섯 번째 시도: 더 공격적인 정리
         try:
@@ -175,33 +195,103 @@ class ContentGenerator:
             # 연속 공백 제거
             cleaned = re.sub(r'\s+', ' ', cleaned)
             result = json.loads(cleaned)
-            print("  (공격적 정리 방식으로 파싱 성공)")
+            logger.info("  (공격적 정리 방식으로 파싱 성공)")
             return self._clean_content(result)
         except json.JSONDecodeError as e:
-            print(f"다섯 번째 시도 실패: {e}")
+            logger.debug(f"다섯 번째 시도 실패: {e}")
 
-        # 디버깅: 원본 텍스트 일부 출력
-        print(f"\n=== JSON 파싱 실패 디버깅 ===")
-        print(f"원본 길이: {len(original_text)}")
-        print(f"처리된 텍스트 길이: {len(text)}")
-        print(f"처리된 텍스트 앞부분:\n{text[:500]}")
-        print(f"\n처리된 텍스트 뒷부분:\n{text[-500:]}")
+        # 디버깅: 처리된 텍스트 앞/뒷부분만 기록 (LOGGING["max_payload"])
+        logger.error(
+            f"JSON 파싱 실패 (원본 {len(original_text)}자, 처리된 텍스트 {len(text)}자)",
+            extra={"payload": text},
+        )
 
         raise ValueError(f"JSON 파싱 실패 - 모든 시도 실패")
 
     def _clean_content(self, result: dict) -> dict:
         """content 필드에서 불필요한 이스케이프 문자 제거"""
         if "content" in result:
-            content = result["content"]
-            # 리터럴 \n 문자열 제거 (HTML에서는 불필요)
-            content = content.replace("\\n", "")
-            # 리터럴 \t 문자열 제거
-            content = content.replace("\\t", "")
-            # 연속 공백 정리
-            content = re.sub(r"\s{2,}", " ", content)
-            result["content"] = content
+            # 리터럴 \n, \t 문자열 제거 + 연속 공백 정리 (<pre> 내부는 보존)
+            result["content"] = process_html(result["content"]).html
         return result
 
+    def _repair_article(self, article: dict, issues: list[dict]) -> dict:
+        """검증 기준을 벗어난 부분만 고치도록 보정 요청"""
+        tags = article.get("tags", [])
+        prompt = REPAIR_ARTICLE_PROMPT.format(
+            min_length=ARTICLE_CONFIG["min_length"],
+            max_length=ARTICLE_CONFIG["max_length"],
+            main_keyword=tags[0] if tags else article.get("title", ""),
+            keyword_density=ARTICLE_CONFIG["keyword_density"],
+            min_headings=ARTICLE_CONFIG.get("min_headings", 3),
+            issues="\n".join(f"- {issue['message']}" for issue in issues),
+            article_content=article.get("content", ""),
+        )
+
+        response = self.router.generate("repair", prompt)
+        repaired = self._parse_json_response(response.text)
+        if not repaired.get("content"):
+            return article
+        return {**article, "content": repaired["content"]}
+
+    def _validate_and_repair(self, article: dict) -> dict:
+        """ARTICLE_CONFIG 기준 검사 후, 기준 미달일 때만 보정 요청"""
+        validation = self.validator.validate(article)
+
+        for _ in range(ARTICLE_CONFIG.get("max_repairs", 1)):
+            if validation["valid"]:
+                break
+
+            logger.warning(f"🩹 품질 기준 미달 ({len(validation['issues'])}건) - 보정 요청 중...")
+            for issue in validation["issues"]:
+                logger.warning(f"  - {issue['message']}")
+
+            try:
+                repaired = self._repair_article(article, validation["issues"])
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"  보정 실패: {e}")
+                break
+
+            repaired_validation = self.validator.validate(repaired)
+            # 문제가 줄어든 경우에만 보정본 사용
+            if len(repaired_validation["issues"]) >= len(validation["issues"]):
+                logger.info("  보정본이 더 낫지 않아 원본 유지")
+                break
+            article, validation = repaired, repaired_validation
+
+        if validation["valid"]:
+            logger.info(f"✅ 품질 검사 통과 ({validation['char_count']}자)")
+        article["validation"] = validation
+        return article
+
+    def _rewrite_sub_titles(self, article: dict) -> str:
+        """소제목만 변경 (본문 전체를 다시 생성하지 않음)
+
+        소제목을 로컬에서 추출해 {기존: 새 소제목} JSON만 받아오고 원문 HTML에 교체한다.
+        """
+        content = article.get("content", "")
+        headings = [text for level, text in process_html(content).headings if level in (2, 3) and text]
+        if not headings:
+            return content
+
+        prompt = CHANGE_SUB_TITLE_JSON_PROMPT.format(
+            title=article.get("title", ""),
+            headings="\n".join(f"- {text}" for text in headings),
+        )
+        response = self.router.generate("sub_title_diff", prompt)
+
+        try:
+            mapping = json.loads(response.text)
+        except json.JSONDecodeError:
+            logger.warning("  소제목 응답 파싱 실패 - 기존 소제목 유지")
+            return content
+        if not isinstance(mapping, dict):
+            return content
+
+        new_content, replaced = replace_headings(content, {str(k).strip(): str(v).strip() for k, v in mapping.items()})
+        logger.info(f"  - 소제목 {replaced}/{len(headings)}개 변경")
+        return new_content
+
     def generate_experience_article(self, user_memo: str, category: str = "일상/리뷰") -> dict:
         """체험형 글 생성"""
         prompt = EXPERIENCE_ARTICLE_PROMPT.format(
@@ -209,20 +299,29 @@ class ContentGenerator:
             category=category,
         )
 
-        response = self.model.generate_content(prompt)
+        response = self.router.generate("experience", prompt)
         article = self._parse_json_response(response.text)
+        article = self._validate_and_repair(article)
 
         article["article_type"] = "experience"
         article["user_memo"] = user_memo
 
         return article
 
-    def generate_unified_article(self, news_data: dict, use_cache: bool = True) -> dict:
+    def generate_unified_article(
+        self,
+        news_data: dict,
+        use_cache: bool = True,
+        avoid_topics: list[str] = None,
+        fallback_to_cache: bool = False,
+    ) -> dict:
         """뉴스 흐름 분석 + 글 작성을 1회 API 호출로 처리
 
         Args:
             news_data: collect_news_titles()의 반환값
-            use_cache: 캐시 사용 여부 (기본: True)
+            use_cache: 캐시 사용 여부 (기본: True, avoid_topics가 있으면 사용 안 함)
+            avoid_topics: 최근에 다뤄서 피해야 할 주제/제목 목록 (중복 글 재생성용)
+            fallback_to_cache: Gemini 장애(서킷 차단/모든 모델 실패) 시 날짜와 관계없이 최근 캐시 글 사용
 
         Returns:
             생성된 블로그 글 데이터
@@ -231,49 +330,71 @@ class ContentGenerator:
         category_name = news_data.get("category_name", "AI/테크")
         titles = news_data.get("titles", [])
 
-        # 캐시 확인
+        # 캐시 확인 (제외 힌트가 있으면 같은 결과가 나오면 안 되므로 캐시 사용 안 함)
+        use_cache = use_cache and not avoid_topics
         if use_cache:
             cache_key = self._get_cache_key(titles, category)
             cached = self._get_cached_article(cache_key)
             if cached:
+                cached.setdefault("category_key", category)
                 return cached
 
         # 뉴스 제목을 문자열로 변환
-        titles_str = "\n".join([f"- {item['title']}" for item in titles])
+        titles_str = "\n".join([f"- {item.title}" for item in titles])
 
         # 글 생성 프롬프트 호출
-        print("📰 뉴스 분석 및 글 생성 중...")
+        logger.info("📰 뉴스 분석 및 글 생성 중...")
         prompt = UNIFIED_ARTICLE_PROMPT.format(
             news_titles=titles_str,
             category_name=category_name,
         )
+        if news_data.get("enriched"):
+            prompt += ENRICHED_CONTEXT_HINT.format(articles="\n\n".join(
+                f"### {item['title']} ({item['source']})\n{item['text']}" for item in news_data["enriched"]
+            ))
+        if avoid_topics:
+            prompt += AVOID_TOPICS_HINT.format(topics="\n".join(f"- {topic}" for topic in avoid_topics))
 
-        response = self.model.generate_content(prompt)
+        try:
+            response = self.router.generate("unified", prompt)
+        except RuntimeError as e:
+            cached = self._latest_cached_article(category, category_name) if fallback_to_cache else None
+            if cached is None:
+                raise
+            logger.warning(f"⚠️ 글 생성 불가 ({e}), 최근 캐시 글 사용")
+            return {**cached, "category_key": category, "fallback": "cache"}
         origin_article = self._parse_json_response(response.text)
 
         # 생성된 글 소제목 변경 프롬프트 호출
-        print("📰 소제목 변경 중...")
-        prompt = CHANGE_SUB_TITLE_PROMPT.format(
-            article_content=origin_article.get('content', ''),
-        )
+        logger.info("📰 소제목 변경 중...")
+        if ARTICLE_CONFIG.get("sub_title_mode", "diff") == "diff":
+            article = {**origin_article, 'content': self._rewrite_sub_titles(origin_article)}
+        else:
+            prompt = CHANGE_SUB_TITLE_PROMPT.format(
+                article_content=origin_article.get('content', ''),
+            )
 
-        response = self.model.generate_content(prompt)
-        article = {**origin_article, 'content': response.text}
+            response = self.router.generate("sub_title", prompt)
+            article = {**origin_article, 'content': response.text}
 
         # 결과 출력
         trend_keywords = article.get('trend_keywords', [])
-        print(f"🔑 트렌드 키워드: {', '.join(trend_keywords) if trend_keywords else 'N/A'}")
-        print(f"💡 선정된 주제: {article.get('selected_topic', '')}")
-        print(f"✍️ 제목: {article.get('title', '')}")
+        logger.info(f"🔑 트렌드 키워드: {', '.join(trend_keywords) if trend_keywords else 'N/A'}")
+        logger.info(f"💡 선정된 주제: {article.get('selected_topic', '')}")
+        logger.info(f"✍️ 제목: {article.get('title', '')}")
+
+        # 품질 검사 (기준 미달 시에만 보정)
+        article = self._validate_and_repair(article)
 
         # 메타데이터 추가
         article["article_type"] = "unified"
         article["source_topic"] = article.get("selected_topic", "")
+        article["category_key"] = category  # 카테고리 스케줄러용 (category는 모델이 쓴 표시 이름)
 
         # 캐시 저장
         if use_cache:
             self._save_to_cache(cache_key, article)
-            print("💾 캐시에 저장됨")
+            logger.info("💾 캐시에 저장됨")
 
         return article
 
@@ -0,0 +1,253 @@
+"""
+생성된 글 중복 검사 인덱스 (MinHash + LSH, data/dedup_index.db)
+제목/선정 주제/태그의 MinHash 서명을 밴드별 버킷으로 저장해 두고,
+새 글과 같은 버킷에 들어간 글만 비교해서 아카이브가 커져도 조회 비용이 거의 늘지 않는다.
+"""
+import hashlib
+import operator
+import re
+import sqlite3
+import struct
+import sys
+import os
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import DEDUP
+from src.article_archive import ARCHIVE_PATH, ArchiveReader
+from src.article_store import ArticleStore
+
+INDEX_FIELDS = ("id", "created_at", "title", "selected_topic", "tags")
+
+
+class DedupIndex:
+    """MinHash/LSH 기반 유사 글 인덱스"""
+
+    DB_PATH = Path(__file__).parent.parent / "data" / "dedup_index.db"
+
+    def __init__(self, db_path: Path = None, config: dict = None):
+        self.db_path = Path(db_path or self.DB_PATH)
+        self.config = {**DEDUP, **(config or {})}
+        self.num_perm = self.config["bands"] * self.config["rows"]
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                title TEXT NOT NULL,
+                topic TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets (band, bucket);
+            CREATE INDEX IF NOT EXISTS idx_lsh_id ON lsh_buckets (id);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                source TEXT PRIMARY KEY,
+                mark TEXT NOT NULL
+            );
+        """)
+
+    # --- 서명 ---
+
+    def shingles(self, article: dict) -> set[str]:
+        """제목 + 선정 주제의 글자 n-gram과 태그"""
+        size = self.config["shingle_size"]
+        text = f"{article.get('title', '')} {article.get('selected_topic', '')}".lower()
+        # 한국어는 조사/띄어쓰기가 달라도 겹치도록 공백/기호를 없앤 글자 n-gram 사용
+        text = re.sub(r"[\W_]+", "", text)
+        shingles = {text[i:i + size] for i in range(max(len(text) - size + 1, 1))}
+        shingles.update(f"#{tag.strip().lower()}" for tag in article.get("tags") or [])
+        shingles.discard("")
+        return shingles
+
+    def signature(self, article: dict) -> array:
+        """MinHash 서명 (u32 x num_perm)
+
+        shingle마다 SHAKE-128 출력을 num_perm개의 독립 해시값으로 나눠 쓰고,
+        위치별 최솟값을 취한다 (해시 함수를 num_perm번 돌리는 것보다 훨씬 빠름).
+        """
+        size = self.num_perm * 4
+        rows = [array("I", hashlib.shake_128(s.encode("utf-8")).digest(size)) for s in self.shingles(article)]
+        if not rows:
+            return array("I", hashlib.shake_128(b"").digest(size))
+        if len(rows) == 1:
+            return rows[0]
+        return array("I", map(min, *rows))
+
+    def _buckets(self, signature: array) -> list[tuple[int, int]]:
+        """밴드별 버킷 번호 (밴드 안의 값이 모두 같아야 같은 버킷)"""
+        rows = self.config["rows"]
+        buckets = []
+        for band in range(self.config["bands"]):
+            digest = hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8).digest()
+            buckets.append((band, struct.unpack("<q", digest)[0]))
+        return buckets
+
+    @staticmethod
+    def similarity(sig_a: array, sig_b: array) -> float:
+        """서명이 같은 비율 (자카드 유사도 추정값)"""
+        return sum(map(operator.eq, sig_a, sig_b)) / len(sig_a)
+
+    # --- 추가/조회 ---
+
+    def add(self, article: dict, commit: bool = True):
+        """글 서명 추가 (같은 ID가 있으면 교체)"""
+        article_id = article["id"]
+        signature = self.signature(article)
+        self.conn.execute("DELETE FROM lsh_buckets WHERE id = ?", (article_id,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO signatures (id, created_at, title, topic, signature) VALUES (?, ?, ?, ?, ?)",
+            (
+                article_id,
+                article.get("created_at") or "",
+                article.get("title") or "",
+                article.get("selected_topic") or "",
+                signature.tobytes(),
+            ),
+        )
+        self.conn.executemany(
+            "INSERT INTO lsh_buckets (band, bucket, id) VALUES (?, ?, ?)",
+            [(band, bucket, article_id) for band, bucket in self._buckets(signature)],
+        )
+        if commit:
+            self.conn.commit()
+
+    def find_similar(self, article: dict, limit: int = 3) -> list[dict]:
+        """기준 이상으로 비슷한 최근 글 (유사도 높은 순)"""
+        signature = self.signature(article)
+        hits = Counter()
+        for band, bucket in self._buckets(signature):
+            # 흔한 표현으로 커진 버킷은 최근 글만 본다
+            rows = self.conn.execute(
+                "SELECT id FROM lsh_buckets WHERE band = ? AND bucket = ? ORDER BY rowid DESC LIMIT ?",
+                (band, bucket, self.config["bucket_limit"]),
+            ).fetchall()
+            hits.update(map(operator.itemgetter(0), rows))
+        hits.pop(article.get("id"), None)
+        if not hits:
+            return []
+
+        # 겹친 밴드 수가 많을수록 유사도가 높으므로 상위 후보만 정밀 비교
+        candidates = [article_id for article_id, _ in hits.most_common(self.config["max_candidates"])]
+
+        since = (datetime.now() - timedelta(days=self.config["window_days"])).isoformat()
+        placeholders = ",".join("?" * len(candidates))
+        rows = self.conn.execute(
+            f"SELECT id, created_at, title, topic, signature FROM signatures"
+            f" WHERE id IN ({placeholders}) AND created_at >= ?",
+            [*candidates, since],
+        ).fetchall()
+
+        matches = []
+        for article_id, created_at, title, topic, blob in rows:
+            score = self.similarity(signature, array("I", blob))
+            if score >= self.config["threshold"]:
+                matches.append({
+                    "id": article_id,
+                    "created_at": created_at,
+                    "title": title,
+                    "selected_topic": topic,
+                    "similarity": round(score, 3),
+                })
+        return sorted(matches, key=lambda m: m["similarity"], reverse=True)[:limit]
+
+    def _mark(self, source: str) -> str:
+        row = self.conn.execute("SELECT mark FROM sync_state WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else ""
+
+    def _set_mark(self, source: str, mark: str):
+        self.conn.execute("INSERT OR REPLACE INTO sync_state (source, mark) VALUES (?, ?)", (source, mark))
+
+    def _known(self, article_id: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM signatures WHERE id = ?", (article_id,)).fetchone() is not None
+
+    def sync(self, article_store: ArticleStore = None, archive_path: Path = ARCHIVE_PATH) -> int:
+        """아카이브/글 저장소에서 지난 동기화 이후 생긴 글만 추가 (추가한 수 반환)
+
+        글 저장소는 마지막으로 본 글 ID(생성 시각 순) 이후의 글만 읽고,
+        아카이브는 파일이 바뀌었을 때(pack 명령 후)만 다시 훑는다.
+        """
+        added = 0
+
+        archive_path = Path(archive_path)
+        if archive_path.exists():
+            stat = archive_path.stat()
+            archive_mark = f"{stat.st_size}:{stat.st_mtime_ns}"
+            if archive_mark != self._mark("archive"):
+                with ArchiveReader(archive_path) as reader:
+                    for record in reader.scan(INDEX_FIELDS):
+                        if record["id"] and not self._known(record["id"]):
+                            self.add(record, commit=False)
+                            added += 1
+                self._set_mark("archive", archive_mark)
+
+        store = article_store or ArticleStore()
+        store_mark = self._mark("store")
+        for article_id in store.list_ids():
+            if article_id > store_mark:
+                if not self._known(article_id):
+                    self.add(store.load(article_id), commit=False)
+                    added += 1
+                store_mark = article_id
+        self._set_mark("store", store_mark)
+
+        self.conn.commit()
+        return added
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+# 테스트: 합성 아카이브 2만 건에서 조회 시간 측정
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    products = ["아이폰", "갤럭시", "ChatGPT", "클로드", "제미나이", "노션", "쿠팡", "테슬라", "넷플릭스", "다이슨"]
+    angles = ["실제로 써보니", "지금 사도 될까", "요금제 비교", "숨은 기능 정리", "1년 사용 후기", "대안 추천"]
+    endings = ["알아두면 좋은 점", "총정리", "솔직 후기", "이것만 알면 끝", "장단점은?", "초보 가이드", "현실 꿀팁"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = DedupIndex(Path(tmp) / "dedup.db")
+        now = datetime.now().isoformat()
+        start = time.perf_counter()
+        for i in range(count):
+            product = f"{products[i % len(products)]}{i // 60}"
+            angle = angles[(i // len(products)) % len(angles)]
+            index.add({
+                "id": f"a{i:06d}",
+                "created_at": now,
+                "title": f"{product} {angle}, {endings[i % len(endings)]}",
+                "selected_topic": f"{product} {angle}",
+                "tags": [product, angle, "IT"],
+            }, commit=False)
+        index.conn.commit()
+        print(f"인덱싱: {count}건 {time.perf_counter() - start:.2f}s")
+
+        queries = [
+            {"title": "ChatGPT5 요금제 비교, 알아두면 좋은 점은?", "selected_topic": "ChatGPT5 요금제 비교", "tags": ["ChatGPT5", "요금제 비교"]},
+            {"title": "전혀 다른 주제: 겨울철 보일러 난방비 아끼기", "selected_topic": "난방비 절약", "tags": ["난방비"]},
+        ]
+        for query in queries:
+            runs = 200
+            start = time.perf_counter()
+            for _ in range(runs):
+                matches = index.find_similar(query)
+            elapsed = (time.perf_counter() - start) / runs * 1000
+            top = f"{matches[0]['title']} ({matches[0]['similarity']:.0%})" if matches else "없음"
+            print(f"조회 {elapsed:.3f} ms / 가장 비슷한 글: {top}")
+
+        index.close()
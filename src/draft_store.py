@@ -0,0 +1,97 @@
+"""
+미리 생성해 둔 글(초안) 저장소 (data/drafts/<카테고리>/)
+한가한 시간대에 카테고리별 후보 글을 만들어 두고, 발행 시점에 가장 최신 후보를 사용
+"""
+import json
+import sys
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import PREGENERATION
+from src.headline_store import HeadlineStore
+from src.storage import claim_file, unique_id, write_json
+
+
+class DraftStore:
+    """카테고리별 사전 생성 초안 저장소"""
+
+    DRAFTS_DIR = Path(__file__).parent.parent / "data" / "drafts"
+
+    def __init__(self, drafts_dir: Path = None, config: dict = None):
+        self.drafts_dir = Path(drafts_dir or self.DRAFTS_DIR)
+        self.config = config or PREGENERATION
+
+    def save(self, article: dict, news_data: dict) -> Path:
+        """초안 저장 (카테고리별 최신 N개만 유지)"""
+        category = news_data["category"]
+        category_dir = self.drafts_dir / category
+        category_dir.mkdir(parents=True, exist_ok=True)
+
+        draft = {
+            "category": category,
+            "created_at": datetime.now().isoformat(),
+            # 발행 시점 신선도 확인용 헤드라인 지문
+            "headline_fingerprints": [HeadlineStore.fingerprint(h.title) for h in news_data.get("titles", [])],
+            "article": article,
+        }
+        path = category_dir / f"{unique_id()}.json"
+        write_json(path, draft)
+
+        for old in sorted(category_dir.glob("*.json"), reverse=True)[self.config["keep_per_category"]:]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def _load(self, path: Path) -> dict:
+        with open(path, "r", encoding="utf-8") as f:
+            draft = json.load(f)
+        draft["path"] = str(path)
+        return draft
+
+    def freshest(self, category: str = None) -> dict | None:
+        """유효 기간 안의 가장 최신 초안 (category가 None이면 전체 카테고리)"""
+        pattern = f"{category}/*.json" if category else "*/*.json"
+        cutoff = datetime.now() - timedelta(hours=self.config["max_age_hours"])
+
+        # 파일명이 생성 시각이므로 이름순 역정렬 = 최신순
+        for path in sorted(self.drafts_dir.glob(pattern), key=lambda p: p.name, reverse=True):
+            try:
+                draft = self._load(path)
+            except FileNotFoundError:
+                continue  # 그사이 다른 프로세스가 가져감
+            if datetime.fromisoformat(draft["created_at"]) >= cutoff:
+                return draft
+        return None
+
+    def is_fresh(self, draft: dict, news_data: dict) -> tuple[bool, float]:
+        """현재 헤드라인 대비 초안 생성 이후 새로 나온 헤드라인 비율 확인
+
+        Returns:
+            (신선 여부, 새 헤드라인 비율)
+        """
+        current = [HeadlineStore.fingerprint(h.title) for h in news_data.get("titles", [])]
+        if not current:
+            return True, 0.0
+        known = set(draft.get("headline_fingerprints", []))
+        new_ratio = sum(1 for fp in current if fp not in known) / len(current)
+        return new_ratio <= self.config["max_new_ratio"], new_ratio
+
+    def claim(self, draft: dict) -> bool:
+        """초안 선점 (동시에 실행된 다른 발행이 같은 초안을 쓰지 않도록, 이미 가져갔으면 False)"""
+        claimed = claim_file(draft["path"])
+        if claimed is None:
+            return False
+        draft["source_path"] = draft["path"]
+        draft["path"] = str(claimed)
+        return True
+
+    def release(self, draft: dict):
+        """선점한 초안을 되돌려 놓기 (발송에 실패해서 다음 실행에서 다시 사용)"""
+        if draft.get("source_path"):
+            os.rename(draft["path"], draft["source_path"])
+            draft["path"] = draft.pop("source_path")
+
+    def discard(self, draft: dict):
+        """사용했거나 오래된 초안 삭제"""
+        Path(draft["path"]).unlink(missing_ok=True)
@@ -2,10 +2,16 @@
 Gmail SMTP를 통한 이메일 발송 모듈
 복붙 친화적인 블로그 글 전송
 """
+import email
+import email.policy
+import html as html_lib
+import re
 import smtplib
+from email.mime.image import MIMEImage
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from pathlib import Path
 import sys
 import os
 
@@ -13,14 +19,39 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import (
     GMAIL_ADDRESS,
     GMAIL_APP_PASSWORD,
+    EMAIL_DIGEST,
     NOTIFY_EMAIL,
+    THUMBNAIL,
     TISTORY_BLOG_NAME,
 )
+from src.cassette import is_replaying
+from src.health import get_health
+from src.html_processor import process_html
+from src.logs import get_logger
+from src.profiler import profile_stage
+from src.storage import LockTimeout, atomic_write, file_lock, unique_id
 from src.thumbnail_generator import ThumbnailGenerator
 
+logger = get_logger("email_sender")
+
 # 템플릿 파일 경로
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "templates")
 EMAIL_TEMPLATE_PATH = os.path.join(TEMPLATE_DIR, "email_template.html")
+DIGEST_TEMPLATE_PATH = os.path.join(TEMPLATE_DIR, "digest_template.html")
+DIGEST_ARTICLE_TEMPLATE_PATH = os.path.join(TEMPLATE_DIR, "digest_article.html")
+# SMTP 장애로 보내지 못한 메일 (다음 발송 때 함께 보냄)
+OUTBOX_DIR = Path(__file__).parent.parent / "data" / "outbox"
+# 수신 거부 등으로 다시 보내도 실패할 메일 (사람이 확인 후 처리)
+FAILED_DIR = OUTBOX_DIR / "failed"
+# 메일 한 통만 거부된 오류 (연결/인증 장애가 아니므로 차단기에 반영하지 않음)
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+def _is_permanent(error: smtplib.SMTPException) -> bool:
+    """5xx 응답이면 다시 보내도 실패 (4xx는 일시적)"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return error.smtp_code >= 500
 
 
 class EmailSender:
@@ -29,21 +60,30 @@ class EmailSender:
     def __init__(self):
         self.smtp_server = "smtp.gmail.com"
         self.smtp_port = 587
+        self.smtp_timeout = 30
         self.sender_email = GMAIL_ADDRESS
         self.sender_password = GMAIL_APP_PASSWORD
         self.recipient_email = NOTIFY_EMAIL
         self.blog_name = TISTORY_BLOG_NAME
         self.thumbnail_generator = ThumbnailGenerator()
-
-    def _load_template(self) -> str:
-        """HTML 템플릿 파일 로드"""
-        with open(EMAIL_TEMPLATE_PATH, "r", encoding="utf-8") as f:
-            return f.read()
-
-    def _create_email_html(self, article: dict) -> str:
-        """복붙 친화적인 HTML 이메일 생성"""
-        template = self._load_template()
-
+        self._templates = {}
+
+    def _load_template(self, path: str = EMAIL_TEMPLATE_PATH) -> str:
+        """HTML 템플릿 파일 로드 (한 번 읽은 템플릿은 재사용)"""
+        if path not in self._templates:
+            with open(path, "r", encoding="utf-8") as f:
+                self._templates[path] = f.read()
+        return self._templates[path]
+
+    def _thumbnail_args(self, article: dict) -> dict:
+        return {
+            "title": article.get("title", ""),
+            "tags": article.get("tags", []),
+            "category": article.get("category_key") or article.get("category", ""),
+        }
+
+    def _fill_template(self, template: str, article: dict, thumbnail_src: str = None) -> str:
+        """글 필드로 템플릿 변수 치환"""
         # 티스토리 글쓰기 페이지 URL
         write_url = f"https://{self.blog_name}.tistory.com/manage/newpost"
 
@@ -54,11 +94,7 @@ class EmailSender:
         article_type = "정보형 글" if article.get("article_type") == "info" else "체험형 글"
 
         # 썸네일 URL 생성
-        thumbnail_url = self.thumbnail_generator.generate_thumbnail_url(
-            title=article.get("title", ""),
-            tags=article.get("tags", []),
-            category=article.get("category", ""),
-        )
+        thumbnail_url = self.thumbnail_generator.generate_thumbnail_url(**self._thumbnail_args(article))
 
         # 템플릿 변수 치환 (replace 사용 - CSS의 {}와 충돌 방지)
         html = template
@@ -71,19 +107,38 @@ class EmailSender:
         html = html.replace("{write_url}", write_url)
         html = html.replace("{category}", article.get("category", "N/A"))
         html = html.replace("{article_id}", article.get("id", "N/A"))
+        html = html.replace("{thumbnail_src}", thumbnail_src or thumbnail_url)
         html = html.replace("{thumbnail_url}", thumbnail_url)
 
         return html
 
+    @profile_stage("render")
+    def _create_email_html(self, article: dict, thumbnail_src: str = None) -> str:
+        """복붙 친화적인 HTML 이메일 생성 (thumbnail_src: 본문 이미지 주소, 없으면 원격 URL)"""
+        return self._fill_template(self._load_template(), article, thumbnail_src)
+
+    def _email_thumbnail(self, article: dict) -> str | None:
+        """이메일에 첨부할 로컬 썸네일 경로 (첨부하지 않으면 None)"""
+        if not THUMBNAIL["email_embed"]:
+            return None
+        generator = self.thumbnail_generator
+        return generator.variant(generator.render_local(**self._thumbnail_args(article)), "email")
+
+    @staticmethod
+    def _thumbnail_image(path: str, content_id: str) -> MIMEImage:
+        extension = os.path.splitext(path)[1].lstrip(".")
+        with open(path, "rb") as f:
+            image = MIMEImage(f.read(), "jpeg" if extension == "jpg" else extension)
+        image.add_header("Content-ID", f"<{content_id}>")
+        image.add_header("Content-Disposition", "inline", filename=f"{content_id}.{extension}")
+        return image
+
     def _create_plain_text(self, article: dict) -> str:
         """플레인 텍스트 버전 (이메일 클라이언트 호환용)"""
         tags_str = ", ".join(article.get("tags", []))
 
-        # HTML 태그 간단히 제거
-        content = article.get('content', '')
-        import re
-        content_plain = re.sub(r'<[^>]+>', '\n', content)
-        content_plain = re.sub(r'\n{3,}', '\n\n', content_plain)
+        # HTML 태그 제거 (블록 단위 줄바꿈, <pre> 공백 보존)
+        content_plain = process_html(article.get('content', '')).text
 
         return f"""
 새 블로그 글이 준비되었습니다
@@ -112,29 +167,240 @@ class EmailSender:
     def send_article(self, article: dict) -> bool:
         """블로그 글 이메일 발송"""
         try:
+            # 로컬 썸네일은 첨부 이미지로 넣어 원격 생성을 기다리지 않고 바로 표시
+            thumbnail_path = self._email_thumbnail(article)
+
             msg = MIMEMultipart("alternative")
-            msg["Subject"] = f"[Auto-Blog] {article.get('title', '새 글')}"
+            # 최근 글과 주제가 겹치는 글은 제목에 표시
+            flag = "[중복 의심] " if article.get("duplicate_of") else ""
+            msg["Subject"] = f"[Auto-Blog] {flag}{article.get('title', '새 글')}"
             msg["From"] = self.sender_email
             msg["To"] = self.recipient_email
 
             # 플레인 텍스트와 HTML 모두 첨부
             plain_content = self._create_plain_text(article)
-            html_content = self._create_email_html(article)
+            html_content = self._create_email_html(
+                article, thumbnail_src="cid:thumbnail" if thumbnail_path else None
+            )
 
             msg.attach(MIMEText(plain_content, "plain", "utf-8"))
-            msg.attach(MIMEText(html_content, "html", "utf-8"))
+            if thumbnail_path:
+                related = MIMEMultipart("related")
+                related.attach(MIMEText(html_content, "html", "utf-8"))
+                related.attach(self._thumbnail_image(thumbnail_path, "thumbnail"))
+                msg.attach(related)
+            else:
+                msg.attach(MIMEText(html_content, "html", "utf-8"))
+
+            # 재생 모드에서는 메시지만 만들고 실제 발송은 생략
+            if is_replaying():
+                logger.info(f"재생 모드: 이메일 발송 생략 ({len(msg.as_bytes())} bytes)")
+                return True
+
+            if not self._deliver([msg]):
+                return False
+
+            logger.info(f"이메일 발송 완료: {self.recipient_email}")
+            return True
+
+        except Exception as e:
+            logger.error(f"이메일 발송 실패: {e}")
+            return False
 
-            # SMTP 연결 및 발송
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+    # --- 발송 ---
+
+    def _deliver(self, messages: list) -> bool:
+        """SMTP 연결 한 번으로 발송 + 발송 대기함 비우기
+
+        Gmail이 차단 중이거나 발송에 실패하면 보내지 못한 메일을 발송 대기함(data/outbox/)에 저장하고 False 반환
+        """
+        health = get_health()
+        if not health.allow("smtp"):
+            self._queue(messages)
+            logger.warning(f"Gmail SMTP 일시 차단 중 ({health.retry_in('smtp'):.0f}초 후 재시도): 발송 대기함에 {len(messages)}통 저장")
+            return False
+
+        done = rejected = 0
+        try:
+            with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.smtp_timeout) as server:
                 server.starttls()
                 server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
+                for msg in messages:
+                    try:
+                        server.send_message(msg)
+                    except MESSAGE_ERRORS as e:
+                        # 이 메일만 거부됨: 일시적이면 대기함, 영구적이면 실패함으로
+                        if _is_permanent(e):
+                            self._queue([msg], FAILED_DIR)
+                            logger.error(f"메일 거부됨, {FAILED_DIR}에 보관: {e}")
+                        else:
+                            self._queue([msg])
+                            logger.warning(f"메일 일시 거부, 발송 대기함에 저장: {e}")
+                        rejected += 1
+                    done += 1
+                flushed = self._flush_outbox(server)
+        except (smtplib.SMTPException, OSError) as e:
+            health.record_failure("smtp", e)
+            self._queue(messages[done:])
+            if done < len(messages):
+                logger.error(f"이메일 발송 실패, 발송 대기함에 {len(messages) - done}통 저장: {e}")
+            return done == len(messages) and not rejected
+
+        health.record_success("smtp")
+        if flushed:
+            logger.info(f"발송 대기함의 메일 {flushed}통 발송")
+        return not rejected
+
+    def _queue(self, messages: list, directory: Path = None):
+        directory = directory or OUTBOX_DIR
+        for msg in messages:
+            atomic_write(directory / f"{unique_id(8)}.eml", msg.as_bytes())
+
+    def _flush_outbox(self, server: smtplib.SMTP) -> int:
+        """발송 대기함의 메일을 오래된 순으로 발송 (보낸 파일은 삭제)
+
+        다른 프로세스가 이미 비우는 중이면 같은 메일을 두 번 보내지 않도록 건너뜀
+        영구 거부된 메일은 실패함(outbox/failed/)으로 옮기고, 일시 거부된 메일은 다음에 다시 보냄
+        """
+        if not OUTBOX_DIR.exists():
+            return 0
+        flushed = 0
+        try:
+            with file_lock(OUTBOX_DIR / "flush", timeout=0):
+                for path in sorted(OUTBOX_DIR.glob("*.eml")):
+                    try:
+                        server.send_message(email.message_from_bytes(path.read_bytes(), policy=email.policy.default))
+                    except MESSAGE_ERRORS as e:
+                        if _is_permanent(e):
+                            FAILED_DIR.mkdir(parents=True, exist_ok=True)
+                            path.replace(FAILED_DIR / path.name)
+                            logger.error(f"발송 대기함 메일 거부됨, {FAILED_DIR / path.name}로 이동: {e}")
+                        else:
+                            logger.warning(f"발송 대기함 메일 일시 거부, 다음에 재시도: {path.name}: {e}")
+                        continue
+                    path.unlink()
+                    flushed += 1
+        except LockTimeout:
+            pass
+        return flushed
+
+    @staticmethod
+    def outbox_count() -> int:
+        return len(list(OUTBOX_DIR.glob("*.eml"))) if OUTBOX_DIR.exists() else 0
+
+    def flush_outbox(self) -> bool:
+        """발송 대기함만 발송"""
+        return self._deliver([])
+
+    # --- 모음 메일 ---
+
+    def _digest_items(self, articles: list[dict]) -> list[dict]:
+        """글마다 본문 블록/첨부 썸네일을 만들고 예상 메일 크기 계산"""
+        block_template = self._load_template(DIGEST_ARTICLE_TEMPLATE_PATH)
+        items = []
+        for index, article in enumerate(articles, 1):
+            thumbnail_path = self._email_thumbnail(article)
+            content_id = f"thumbnail-{index}"
+            block = self._fill_template(
+                block_template.replace("{index}", str(index)),
+                article,
+                thumbnail_src=f"cid:{content_id}" if thumbnail_path else None,
+            )
+            plain = self._create_plain_text(article)
+            size = len(block.encode("utf-8")) + len(plain.encode("utf-8"))
+            if thumbnail_path:
+                size += os.path.getsize(thumbnail_path)
+            items.append({
+                "index": index,
+                "article": article,
+                "block": block,
+                "plain": plain,
+                "thumbnail_path": thumbnail_path,
+                "content_id": content_id,
+                # base64 인코딩으로 약 4/3배
+                "size": size * 4 // 3,
+            })
+        return items
+
+    def _split_digest(self, items: list[dict]) -> list[list[dict]]:
+        """메일 한 통이 크기/글 수 제한을 넘지 않도록 순서대로 나누기"""
+        parts, current, current_size = [], [], 0
+        for item in items:
+            if current and (
+                current_size + item["size"] > EMAIL_DIGEST["max_bytes"]
+                or len(current) >= EMAIL_DIGEST["max_articles"]
+            ):
+                parts.append(current)
+                current, current_size = [], 0
+            # 글 하나가 제한보다 커도 단독으로 보냄
+            current.append(item)
+            current_size += item["size"]
+        if current:
+            parts.append(current)
+        return parts
+
+    @profile_stage("render")
+    def _create_digest_message(self, items: list[dict], part: int, parts: int, total: int) -> MIMEMultipart:
+        template = self._load_template(DIGEST_TEMPLATE_PATH)
+        # 공통 CSS는 단일 글 템플릿에서 한 번만 가져옴
+        style = re.search(r"<style>(.*?)</style>", self._load_template(), re.S).group(1)
+
+        toc = []
+        for item in items:
+            article = item["article"]
+            flag = " [중복 의심]" if article.get("duplicate_of") else ""
+            toc.append(
+                f'<li><a href="#article-{item["index"]}">{html_lib.escape(article.get("title", "제목 없음"))}</a>'
+                f'<span class="toc-meta">{html_lib.escape(article.get("category", ""))}{flag}</span></li>'
+            )
+
+        html = template
+        html = html.replace("{style}", style.strip())
+        html = html.replace("{count}", str(len(items)))
+        html = html.replace("{date}", datetime.now().strftime("%Y년 %m월 %d일 %H:%M"))
+        html = html.replace("{part}", f" | {part}/{parts}통 (전체 {total}편)" if parts > 1 else "")
+        html = html.replace("{toc}", "\n          ".join(toc))
+        html = html.replace("{articles}", "\n".join(item["block"] for item in items))
+
+        msg = MIMEMultipart("alternative")
+        suffix = f" ({part}/{parts})" if parts > 1 else ""
+        msg["Subject"] = f"[Auto-Blog] 새 글 {len(items)}편 모음{suffix}"
+        msg["From"] = self.sender_email
+        msg["To"] = self.recipient_email
+
+        msg.attach(MIMEText("\n".join(item["plain"] for item in items), "plain", "utf-8"))
+        related = MIMEMultipart("related")
+        related.attach(MIMEText(html, "html", "utf-8"))
+        for item in items:
+            if item["thumbnail_path"]:
+                related.attach(self._thumbnail_image(item["thumbnail_path"], item["content_id"]))
+        msg.attach(related)
+        return msg
+
+    def send_digest(self, articles: list[dict]) -> bool:
+        """여러 글을 목차가 있는 모음 메일로 발송 (크기 제한을 넘으면 여러 통, SMTP 연결은 한 번)"""
+        if not articles:
+            return True
+        try:
+            parts = self._split_digest(self._digest_items(articles))
+            messages = [
+                self._create_digest_message(items, part, len(parts), len(articles))
+                for part, items in enumerate(parts, 1)
+            ]
+
+            if is_replaying():
+                sizes = ", ".join(str(len(msg.as_bytes())) for msg in messages)
+                logger.info(f"재생 모드: 모음 메일 {len(messages)}통 발송 생략 ({sizes} bytes)")
+                return True
 
-            print(f"이메일 발송 완료: {self.recipient_email}")
+            if not self._deliver(messages):
+                return False
+
+            logger.info(f"모음 메일 발송 완료: 글 {len(articles)}편 / {len(messages)}통 → {self.recipient_email}")
             return True
 
         except Exception as e:
-            print(f"이메일 발송 실패: {e}")
+            logger.error(f"모음 메일 발송 실패: {e}")
             return False
 
     def send_simple_notification(self, subject: str, message: str) -> bool:
@@ -145,15 +411,10 @@ class EmailSender:
             msg["From"] = self.sender_email
             msg["To"] = self.recipient_email
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(msg)
-
-            return True
+            return self._deliver([msg])
 
         except Exception as e:
-            print(f"알림 발송 실패: {e}")
+            logger.error(f"알림 발송 실패: {e}")
             return False
 
 
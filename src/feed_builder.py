@@ -0,0 +1,306 @@
+"""
+우리 글 RSS 피드 + 사이트맵 (data/feed/)
+글을 저장할 때마다 그 글 항목만 추가/수정하고, 바뀐 파일만 다시 쓴다 (아카이브 전체를 읽지 않음).
+피드/사이트맵에는 티스토리 발행 주소가 있는 글만 넣는다 (승인 전 초안/반려된 글은 공개하지 않음).
+- feed.xml: 최근 N개 글 (RSS 2.0)
+- sitemap-YYYY-MM.xml: 글 ID(생성 시각)의 월별 사이트맵 조각, 해당 월 조각만 다시 씀
+- sitemap.xml: 조각 목록 (sitemap index)
+항목 정보는 data/feed_index.db에 두고, 파일은 임시 파일에 쓴 뒤 교체한다.
+"""
+import re
+import sqlite3
+import sys
+import os
+from datetime import datetime
+from email.utils import format_datetime
+from pathlib import Path
+from typing import Iterable
+from xml.sax.saxutils import escape, quoteattr
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import FEED
+from src.storage import atomic_write, file_lock
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# 사이트맵 조각 파일 이름 (sitemap-2025-01.xml)
+SHARD_PATTERN = re.compile(r"^sitemap-(\d{4}-\d{2})\.xml$")
+
+
+def shard_for(article_id: str, created_at: str = None) -> str:
+    """글이 들어갈 월별 조각 (ID 앞 8자리가 생성 날짜)"""
+    if re.match(r"^\d{8}_", article_id):
+        return f"{article_id[:4]}-{article_id[4:6]}"
+    return (created_at or datetime.now().isoformat())[:7]
+
+
+def _w3c_datetime(value: str = None) -> str:
+    """사이트맵 lastmod 형식 (시간대 포함)"""
+    moment = datetime.fromisoformat(value) if value else datetime.now()
+    return moment.astimezone().isoformat(timespec="seconds")
+
+
+class FeedBuilder:
+    """글 저장 시 피드/사이트맵을 부분 갱신"""
+
+    FEED_DIR = Path(__file__).parent.parent / "data" / "feed"
+    DB_PATH = Path(__file__).parent.parent / "data" / "feed_index.db"
+
+    def __init__(self, output_dir: Path = None, db_path: Path = None, config: dict = None):
+        self.output_dir = Path(output_dir or self.FEED_DIR)
+        self.db_path = Path(db_path or self.DB_PATH)
+        self.config = {**FEED, **(config or {})}
+        self.site_url = self.config["site_url"].rstrip("/")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id TEXT PRIMARY KEY,
+                shard TEXT NOT NULL,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                categories TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_shard ON entries (shard);
+            CREATE TABLE IF NOT EXISTS shards (
+                shard TEXT PRIMARY KEY,
+                updated_at TEXT NOT NULL
+            );
+        """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def path_for(self, shard: str) -> Path:
+        return self.output_dir / f"sitemap-{shard}.xml"
+
+    # --- 갱신 ---
+
+    def _upsert(self, article: dict, url: str = None) -> str:
+        """항목 추가/수정 후 조각 이름 반환 (발행 주소가 이미 있으면 유지, 발행 전이면 빈 주소)"""
+        article_id = article["id"]
+        created_at = article.get("created_at") or datetime.now().isoformat()
+        shard = shard_for(article_id, created_at)
+        now = datetime.now().isoformat()
+        tags = [t for t in article.get("tags") or [] if t][:self.config["max_categories"]]
+
+        self.conn.execute(
+            """
+            INSERT INTO entries (id, shard, url, title, description, categories, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                url = COALESCE(?, entries.url),
+                title = excluded.title,
+                description = excluded.description,
+                categories = excluded.categories,
+                updated_at = excluded.updated_at
+            """,
+            (
+                article_id, shard, url or "",
+                article.get("title", ""), article.get("meta_description", ""), "\n".join(tags),
+                created_at, now, url,
+            ),
+        )
+        self._touch(shard, now)
+        return shard
+
+    def _touch(self, shard: str, now: str):
+        self.conn.execute(
+            "INSERT INTO shards (shard, updated_at) VALUES (?, ?)"
+            " ON CONFLICT(shard) DO UPDATE SET updated_at = excluded.updated_at",
+            (shard, now),
+        )
+
+    def add(self, article: dict, url: str = None) -> str:
+        """저장된 글 하나 반영 (같은 ID면 수정) 후 조각 이름 반환
+
+        다시 쓰는 파일: 그 글의 월별 조각 + 조각 목록 + 최근 N개 피드 (아카이브 크기와 무관)
+        발행 전 글은 항목만 기록하고 파일은 그대로 둔다.
+        """
+        with file_lock(self.db_path):
+            with self.conn:
+                shard = self._upsert(article, url)
+                published = self.conn.execute(
+                    "SELECT url != '' FROM entries WHERE id = ?", (article["id"],)
+                ).fetchone()[0]
+            if not published:
+                return shard
+            self._write_shard(shard)
+            self._write_index()
+            self._write_feed()
+        return shard
+
+    def set_url(self, article_id: str, url: str) -> bool:
+        """발행 후 글 링크를 발행 주소로 변경 (피드/사이트맵에 없는 글이면 False)"""
+        with file_lock(self.db_path):
+            with self.conn:
+                row = self.conn.execute("SELECT shard FROM entries WHERE id = ?", (article_id,)).fetchone()
+                if row is None:
+                    return False
+                self.conn.execute(
+                    "UPDATE entries SET url = ?, updated_at = ? WHERE id = ?",
+                    (url, datetime.now().isoformat(), article_id),
+                )
+                self._touch(row[0], datetime.now().isoformat())
+            self._write_shard(row[0])
+            self._write_index()
+            self._write_feed()
+        return True
+
+    def remove(self, article_id: str) -> bool:
+        """항목 삭제 (반려된 글, 피드/사이트맵에 있던 글이면 파일도 다시 씀)"""
+        with file_lock(self.db_path):
+            with self.conn:
+                row = self.conn.execute("SELECT shard, url FROM entries WHERE id = ?", (article_id,)).fetchone()
+                if row is None:
+                    return False
+                self.conn.execute("DELETE FROM entries WHERE id = ?", (article_id,))
+                self._touch(row[0], datetime.now().isoformat())
+            if row[1]:
+                self._write_shard(row[0])
+                self._write_index()
+                self._write_feed()
+        return True
+
+    def rebuild(self, articles: Iterable[dict], urls: dict = None) -> int:
+        """기존 글 전체로 다시 만들기 (처음 도입할 때/파일을 지웠을 때, 아카이브 크기에 비례)
+
+        urls(글 ID → 발행 주소)에 없는 글은 발행 전으로 보고 파일에서 뺀다.
+        """
+        urls = urls or {}
+        count = 0
+        with file_lock(self.db_path):
+            with self.conn:
+                for article in articles:
+                    if article.get("id"):
+                        self._upsert(article)
+                        self.conn.execute(
+                            "UPDATE entries SET url = ? WHERE id = ?", (urls.get(article["id"], ""), article["id"])
+                        )
+                        count += 1
+            shards = [row[0] for row in self.conn.execute("SELECT shard FROM shards")]
+            for shard in shards:
+                self._write_shard(shard)
+            # 더 이상 쓰지 않는 조각 파일 정리
+            for path in self.output_dir.glob("sitemap-*.xml"):
+                match = SHARD_PATTERN.match(path.name)
+                if match and match.group(1) not in shards:
+                    path.unlink()
+            self._write_index()
+            self._write_feed()
+        return count
+
+    # --- 파일 쓰기 ---
+
+    def _write_shard(self, shard: str):
+        rows = self.conn.execute(
+            "SELECT url, updated_at FROM entries WHERE shard = ? AND url != '' ORDER BY id", (shard,)
+        ).fetchall()
+        if not rows:
+            # 발행된 글이 없는 달은 조각 파일을 두지 않음
+            self.path_for(shard).unlink(missing_ok=True)
+            return
+        urls = "".join(
+            f"<url><loc>{escape(url)}</loc><lastmod>{_w3c_datetime(updated_at)}</lastmod></url>\n"
+            for url, updated_at in rows
+        )
+        xml = f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n{urls}</urlset>\n'
+        atomic_write(self.path_for(shard), xml.encode("utf-8"), fsync=False)
+
+    def _write_index(self):
+        rows = self.conn.execute(
+            "SELECT shard, updated_at FROM shards WHERE EXISTS"
+            " (SELECT 1 FROM entries WHERE entries.shard = shards.shard AND url != '') ORDER BY shard"
+        ).fetchall()
+        sitemaps = "".join(
+            f"<sitemap><loc>{escape(f'{self.site_url}/{self.path_for(shard).name}')}</loc>"
+            f"<lastmod>{_w3c_datetime(updated_at)}</lastmod></sitemap>\n"
+            for shard, updated_at in rows
+        )
+        xml = f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n{sitemaps}</sitemapindex>\n'
+        atomic_write(self.output_dir / "sitemap.xml", xml.encode("utf-8"), fsync=False)
+
+    def _write_feed(self):
+        rows = self.conn.execute(
+            "SELECT id, url, title, description, categories, created_at FROM entries"
+            " WHERE url != '' ORDER BY id DESC LIMIT ?",
+            (self.config["items"],),
+        ).fetchall()
+        items = []
+        for article_id, url, title, description, categories, created_at in rows:
+            tags = "".join(f"<category>{escape(tag)}</category>" for tag in categories.split("\n") if tag)
+            items.append(
+                f"<item><title>{escape(title)}</title><link>{escape(url)}</link>"
+                f"<guid isPermaLink=\"false\">{escape(article_id)}</guid>"
+                f"<description>{escape(description)}</description>"
+                f"<pubDate>{format_datetime(datetime.fromisoformat(created_at).astimezone())}</pubDate>{tags}</item>\n"
+            )
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>\n'
+            f"<title>{escape(self.config['title'])}</title>"
+            f"<link>{escape(self.site_url)}</link>"
+            f"<description>{escape(self.config['description'])}</description>"
+            f"<atom:link href={quoteattr(self.site_url + '/feed.xml')} rel=\"self\" type=\"application/rss+xml\"/>"
+            f"<lastBuildDate>{format_datetime(datetime.now().astimezone())}</lastBuildDate>\n"
+            f"{''.join(items)}</channel></rss>\n"
+        )
+        atomic_write(self.output_dir / "feed.xml", xml.encode("utf-8"), fsync=False)
+
+
+# 테스트: 글이 쌓여도 저장 1건당 갱신 시간이 일정한지 확인 (전체 재생성과 비교)
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from datetime import timedelta
+    from xml.etree import ElementTree
+
+    TOTAL = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    CHECKPOINTS = {100, 1000, TOTAL}
+
+    def fake_article(i: int) -> dict:
+        created = datetime(2023, 1, 1) + timedelta(hours=6 * i)
+        return {
+            "id": f"{created.strftime('%Y%m%d_%H%M%S')}_{i:06x}",
+            "created_at": created.isoformat(),
+            "title": f"테스트 글 {i} <AI & 일상>",
+            "meta_description": "요약 " * 20,
+            "tags": ["AI", "테스트", f"태그{i % 7}"],
+        }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        builder = FeedBuilder(Path(tmp) / "feed", Path(tmp) / "feed_index.db", {"site_url": "https://example.com"})
+        print(f"=== 글 {TOTAL}건 저장하며 갱신 (조각 {{월}}, 피드 {builder.config['items']}건) ===")
+        for i in range(TOTAL):
+            started = time.perf_counter()
+            builder.add(fake_article(i), url=f"https://example.tistory.com/{i + 1}")
+            if i + 1 in CHECKPOINTS:
+                add_ms = (time.perf_counter() - started) * 1000
+                started = time.perf_counter()
+                builder.rebuild([])  # 비교: 모든 조각을 다시 쓰는 전체 재생성 (글 읽기 시간 제외)
+                rebuild_ms = (time.perf_counter() - started) * 1000
+                print(f"글 {i + 1:>5}건: 부분 갱신 {add_ms:6.2f} ms / 전체 재생성 {rebuild_ms:7.2f} ms")
+
+        first = fake_article(0)
+        builder.set_url(first["id"], "https://example.tistory.com/first")
+        draft = fake_article(TOTAL)
+        builder.add(draft)  # 발행 전 글: 피드/사이트맵에 안 나옴
+        builder.remove(fake_article(TOTAL - 1)["id"])  # 반려된 글: 빠짐
+        files = sorted(p.name for p in builder.output_dir.iterdir())
+        print(f"파일 {len(files)}개: {files[:3]} ... {files[-3:]}")
+        feed = ElementTree.parse(builder.output_dir / "feed.xml").getroot()
+        shard = ElementTree.parse(builder.path_for(shard_for(first["id"]))).getroot()
+        guids = [item.findtext("guid") for item in feed.findall("channel/item")]
+        print(f"피드 항목 {len(guids)}개, 첫 조각 첫 주소: {shard[0][0].text}")
+        print(f"발행 전 글 포함: {draft['id'] in guids}, 반려된 글 포함: {fake_article(TOTAL - 1)['id'] in guids}")
+        builder.close()
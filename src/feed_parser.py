@@ -0,0 +1,165 @@
+"""
+Google News RSS 전용 경량 파서
+XMLPullParser로 조금씩 읽으면서 필요한 필드(title/link/pubDate/source)만 꺼내고,
+max_results개를 채우면 나머지는 읽지 않는다. 형식이 예상과 다르면 feedparser로 처리.
+"""
+import xml.etree.ElementTree as ET
+
+import feedparser
+
+
+class FeedFormatError(ValueError):
+    """Google News RSS 형식이 아님 (feedparser로 다시 처리)"""
+
+
+# RSS 태그 → 결과 필드
+_ITEM_FIELDS = {"title": "title", "link": "link", "pubDate": "published", "source": "source"}
+
+
+def parse_google_news(
+    data: bytes,
+    max_results: int = None,
+    with_summary: bool = True,
+    chunk_size: int = 16 * 1024,
+) -> list[dict]:
+    """Google News RSS 빠른 파싱
+
+    Returns:
+        [{"title", "link", "published", "source", "summary"}, ...]
+
+    Raises:
+        FeedFormatError: RSS 2.0 형식이 아니거나 XML이 깨진 경우
+    """
+    fields = dict(_ITEM_FIELDS, description="summary") if with_summary else _ITEM_FIELDS
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entries = []
+    root = channel = current = None
+
+    try:
+        for offset in range(0, len(data), chunk_size):
+            parser.feed(data[offset:offset + chunk_size])
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        if elem.tag != "rss":
+                            raise FeedFormatError(f"RSS가 아님: <{elem.tag}>")
+                        root = elem
+                    elif elem.tag == "channel":
+                        channel = elem
+                    elif elem.tag == "item":
+                        current = {}
+                    continue
+
+                if current is None:
+                    continue
+                if elem.tag == "item":
+                    if not current.get("title"):
+                        raise FeedFormatError("제목 없는 item")
+                    entries.append({
+                        "title": current["title"],
+                        "link": current.get("link", ""),
+                        "published": current.get("published", ""),
+                        "source": current.get("source") or "Unknown",
+                        "summary": current.get("summary", "") if with_summary else None,
+                    })
+                    current = None
+                    # 처리한 item은 트리에서 떼어내 메모리 유지
+                    if channel is not None:
+                        channel.remove(elem)
+                    if max_results and len(entries) >= max_results:
+                        return entries
+                elif elem.tag in fields:
+                    current[fields[elem.tag]] = (elem.text or "").strip()
+        parser.close()
+    except ET.ParseError as e:
+        raise FeedFormatError(f"XML 파싱 실패: {e}") from e
+
+    if root is None:
+        raise FeedFormatError("빈 응답")
+    return entries
+
+
+def parse_with_feedparser(data: bytes, max_results: int = None, with_summary: bool = True) -> list[dict]:
+    """feedparser로 파싱 (형식이 다른 피드용)"""
+    feed = feedparser.parse(data)
+    return [
+        {
+            "title": entry.title,
+            "link": entry.get("link", ""),
+            "published": entry.get("published", ""),
+            "source": entry.get("source", {}).get("title", "Unknown"),
+            "summary": entry.get("summary", "") if with_summary else None,
+        }
+        for entry in feed.entries[:max_results]
+        if entry.get("title")
+    ]
+
+
+def parse_feed(data: bytes, max_results: int = None, with_summary: bool = True) -> list[dict]:
+    """빠른 파서로 먼저 시도하고, 형식이 다르면 feedparser 사용"""
+    if not data:
+        return []
+    try:
+        return parse_google_news(data, max_results, with_summary)
+    except FeedFormatError:
+        return parse_with_feedparser(data, max_results, with_summary)
+
+
+# 테스트: 녹화된 RSS 응답(data/cassettes/) 또는 합성 피드로 feedparser와 비교
+if __name__ == "__main__":
+    import sys
+    import os
+    import time
+    import tracemalloc
+    from pathlib import Path
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.cassette import CASSETTE_DIR, Cassette
+
+    feeds = []
+    for path in sorted(Path(CASSETTE_DIR).glob("*.jsonl.gz")):
+        cassette = Cassette.load(path)
+        feeds.extend(Cassette.decode_bytes(e["payload"]) for e in cassette.entries if e["kind"] == "rss")
+    feeds = [f for f in feeds if f]
+    source = f"녹화 {len(feeds)}건"
+
+    if not feeds:
+        item = (
+            "<item><title>{i}번째 기사 제목, 오픈AI 신모델 공개 - 연합뉴스</title>"
+            "<link>https://news.google.com/rss/articles/CBMi{i:06d}?oc=5</link>"
+            "<guid isPermaLink=\"false\">CBMi{i:06d}</guid><pubDate>Mon, 19 Oct 2026 01:00:00 GMT</pubDate>"
+            "<description>&lt;a href=\"https://news.google.com/rss/articles/CBMi{i:06d}\"&gt;{i}번째 기사&lt;/a&gt;"
+            "&amp;nbsp;&amp;nbsp;&lt;font color=\"#6f6f6f\"&gt;연합뉴스&lt;/font&gt;</description>"
+            "<source url=\"https://www.yna.co.kr\">연합뉴스</source></item>"
+        )
+        body = "".join(item.format(i=i) for i in range(100))
+        feeds = [(
+            "<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\" xmlns:media=\"http://search.yahoo.com/mrss/\">"
+            f"<channel><title>\"AI\" - Google 뉴스</title><link>https://news.google.com</link>{body}</channel></rss>"
+        ).encode("utf-8")]
+        source = "합성 피드 1건 (항목 100개)"
+
+    max_results = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    print(f"=== RSS 파싱 비교: {source}, max_results={max_results} ===")
+
+    # 결과 일치 확인
+    for data in feeds:
+        fast = parse_google_news(data, max_results, with_summary=False)
+        slow = parse_with_feedparser(data, max_results, with_summary=False)
+        assert [(e["title"], e["link"], e["source"]) for e in fast] == \
+               [(e["title"], e["link"], e["source"]) for e in slow], "결과 불일치"
+
+    for name, parse in (("feedparser", parse_with_feedparser), ("fast path", parse_google_news)):
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            for data in feeds:
+                parse(data, max_results, False)
+        elapsed = (time.perf_counter() - start) / runs / len(feeds) * 1000
+
+        tracemalloc.start()
+        for data in feeds:
+            parse(data, max_results, False)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name:<11} 피드당 {elapsed:7.2f} ms / 최대 할당 {peak / 1024:8.1f} KB")
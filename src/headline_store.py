@@ -0,0 +1,147 @@
+"""
+이미 본 뉴스 헤드라인을 기억하는 SQLite 기반 저장소
+카테고리별 지문(fingerprint)을 보관하고 오래된 항목은 자동 만료
+"""
+import hashlib
+import re
+import sqlite3
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import HEADLINE_HISTORY
+
+
+class HeadlineStore:
+    """카테고리별 헤드라인 지문 저장소 (기간 만료 + 개수 제한)"""
+
+    DB_PATH = Path(__file__).parent.parent / "data" / "news_history.db"
+
+    def __init__(self, db_path: Path = None, ttl_days: int = None, max_per_category: int = None):
+        self.db_path = Path(db_path or self.DB_PATH)
+        self.ttl_days = ttl_days or HEADLINE_HISTORY["ttl_days"]
+        self.max_per_category = max_per_category or HEADLINE_HISTORY["max_per_category"]
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS seen_headlines (
+                category TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (category, fingerprint)
+            );
+            CREATE INDEX IF NOT EXISTS idx_seen_last ON seen_headlines (category, last_seen);
+            CREATE TABLE IF NOT EXISTS trend_counts (
+                category TEXT NOT NULL,
+                day TEXT NOT NULL,
+                runs INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                new INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, day)
+            );
+        """)
+
+    @staticmethod
+    def fingerprint(title: str) -> str:
+        """제목 정규화 후 지문 생성 (Google News의 ' - 출처' 꼬리 제거)"""
+        normalized = re.sub(r"\s+-\s+[^-]+$", "", title)
+        normalized = re.sub(r"[^\w]+", " ", normalized.lower()).strip()
+        return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+    def split_new(self, category: str, headlines: list) -> tuple[list, list]:
+        """새 헤드라인과 이미 본 헤드라인 분리
+
+        이미 본 헤드라인은 last_seen/hits만 갱신하고,
+        새 헤드라인은 mark_seen()을 호출할 때까지 기록하지 않는다.
+        """
+        self.prune(category)
+        if not headlines:
+            return [], []
+
+        fingerprints = [self.fingerprint(h.title) for h in headlines]
+        placeholders = ",".join("?" * len(fingerprints))
+        rows = self.conn.execute(
+            f"SELECT fingerprint FROM seen_headlines WHERE category = ? AND fingerprint IN ({placeholders})",
+            [category, *fingerprints],
+        ).fetchall()
+        known = {row[0] for row in rows}
+
+        new_items, seen_items = [], []
+        for headline, fp in zip(headlines, fingerprints):
+            (seen_items if fp in known else new_items).append(headline)
+
+        if known:
+            now = time.time()
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE seen_headlines SET last_seen = ?, hits = hits + 1 WHERE category = ? AND fingerprint = ?",
+                    [(now, category, fp) for fp in known],
+                )
+        return new_items, seen_items
+
+    def mark_seen(self, category: str, headlines: list):
+        """헤드라인을 본 것으로 기록"""
+        self.mark_seen_fingerprints(category, [self.fingerprint(h.title) for h in headlines])
+
+    def mark_seen_fingerprints(self, category: str, fingerprints: list[str]):
+        """지문으로 본 것으로 기록 (초안에 저장해 둔 헤드라인)"""
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO seen_headlines (category, fingerprint, first_seen, last_seen)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (category, fingerprint) DO UPDATE SET last_seen = excluded.last_seen
+                """,
+                [(category, fp, now, now) for fp in fingerprints],
+            )
+        self.prune(category)
+
+    def prune(self, category: str):
+        """만료된 지문 삭제 + 카테고리별 최대 개수 유지"""
+        cutoff = time.time() - self.ttl_days * 86400
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM seen_headlines WHERE category = ? AND last_seen < ?",
+                (category, cutoff),
+            )
+            self.conn.execute(
+                """
+                DELETE FROM seen_headlines WHERE category = ? AND fingerprint IN (
+                    SELECT fingerprint FROM seen_headlines WHERE category = ?
+                    ORDER BY last_seen DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (category, category, self.max_per_category),
+            )
+
+    def record_trend(self, category: str, total: int, new: int):
+        """일자별 수집/신규 헤드라인 수 누적"""
+        day = datetime.now().strftime("%Y-%m-%d")
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO trend_counts (category, day, runs, total, new) VALUES (?, ?, 1, ?, ?)
+                ON CONFLICT (category, day) DO UPDATE SET
+                    runs = runs + 1, total = total + excluded.total, new = new + excluded.new
+                """,
+                (category, day, total, new),
+            )
+
+    def trend_history(self, category: str, days: int = 7) -> list[dict]:
+        """최근 N일간 일자별 헤드라인 수"""
+        since = (datetime.now() - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+        rows = self.conn.execute(
+            "SELECT day, runs, total, new FROM trend_counts WHERE category = ? AND day >= ? ORDER BY day",
+            (category, since),
+        ).fetchall()
+        return [{"day": d, "runs": r, "total": t, "new": n} for d, r, t, n in rows]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,214 @@
+"""
+외부 서비스 상태 기록 + 서킷 브레이커 (data/health.json)
+연속으로 실패한 서비스는 일정 시간 호출하지 않고 바로 대체 경로(캐시된 피드/글, 로컬 썸네일, 발송 대기함)로 넘기고,
+대기 시간이 지나면 시험 호출(half-open) 한 번으로 회복 여부를 확인한다. 상태는 실행 간에 유지된다.
+"""
+import json
+import sys
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import CIRCUIT_BREAKER
+from src.logs import get_logger
+from src.storage import file_lock, write_json
+
+logger = get_logger("health")
+
+HEALTH_PATH = Path(__file__).parent.parent / "data" / "health.json"
+
+# 서비스 이름 → 표시 이름
+SERVICES = {
+    "google_news": "Google News RSS",
+    "gemini": "Gemini API",
+    "pollinations": "Pollinations.ai",
+    "smtp": "Gmail SMTP",
+}
+
+# 현재 프로세스에서 공유하는 상태 기록 (필요할 때 생성)
+_registry = None
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출하지 않음 (대체 경로 사용)"""
+
+    def __init__(self, service: str, retry_in: float):
+        self.service = service
+        self.retry_in = retry_in
+        super().__init__(f"{SERVICES.get(service, service)} 일시 차단 중 ({retry_in:.0f}초 후 재시도)")
+
+
+class HealthRegistry:
+    """서비스별 서킷 브레이커 상태 (closed → open → half_open → closed/open)"""
+
+    def __init__(self, path: Path = None, config: dict = None):
+        self.path = Path(path or HEALTH_PATH)
+        self.config = {**CIRCUIT_BREAKER, **(config or {})}
+        self._mtime = None
+        self.services = {}
+        self._refresh()
+
+    # --- 저장 ---
+
+    def _refresh(self):
+        """다른 프로세스가 파일을 바꿨으면 다시 읽기"""
+        try:
+            mtime = self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.services = json.load(f).get("services", {})
+        except (OSError, ValueError):
+            return  # 깨진 파일은 무시하고 새로 기록
+        self._mtime = mtime
+
+    @contextmanager
+    def _update(self):
+        """잠금 안에서 최신 상태를 읽고 고친 뒤 저장 (다른 프로세스의 기록을 덮어쓰지 않음)"""
+        with file_lock(self.path):
+            self._refresh()
+            yield
+            write_json(self.path, {"services": self.services}, fsync=False)
+            self._mtime = self.path.stat().st_mtime_ns
+
+    def state(self, service: str) -> dict:
+        return self.services.setdefault(service, {
+            "state": "closed",
+            "failures": 0,
+            "open_count": 0,
+            "retry_at": 0.0,
+            "last_error": None,
+            "last_success": None,
+            "last_failure": None,
+        })
+
+    # --- 서킷 ---
+
+    def allow(self, service: str) -> bool:
+        """호출해도 되는지 (열린 서킷은 대기 시간이 지나면 시험 호출 1회 허용)"""
+        self._refresh()
+        state = self.state(service)
+        if state["state"] == "closed":
+            return True
+        if time.time() < state["retry_at"]:
+            return False
+        with self._update():
+            # 잠금을 기다리는 사이 다른 프로세스가 먼저 시험 호출을 시작했을 수 있음
+            state = self.state(service)
+            now = time.time()
+            if state["state"] != "closed" and now < state["retry_at"]:
+                return False
+            if state["state"] != "closed":
+                # 시험 호출 중에는 다른 프로세스가 같이 호출하지 않도록 probe_seconds 동안 다시 막아 둠
+                state["state"] = "half_open"
+                state["retry_at"] = now + self.config["probe_seconds"]
+        return True
+
+    def retry_in(self, service: str) -> float:
+        """다시 호출해 볼 수 있을 때까지 남은 시간 (초)"""
+        return max(0.0, self.state(service)["retry_at"] - time.time())
+
+    def record_success(self, service: str):
+        with self._update():
+            state = self.state(service)
+            recovered = state["state"] != "closed"
+            state.update(state="closed", failures=0, open_count=0, retry_at=0.0, last_success=time.time())
+        if recovered:
+            logger.info(f"  ✅ {SERVICES.get(service, service)} 회복")
+
+    def record_failure(self, service: str, error: BaseException | str):
+        opened = None
+        with self._update():
+            state = self.state(service)
+            now = time.time()
+            state["failures"] += 1
+            state["last_failure"] = now
+            state["last_error"] = f"{type(error).__name__}: {error}" if isinstance(error, BaseException) else str(error)
+            state["last_error"] = state["last_error"][:300]
+
+            if state["state"] == "half_open" or state["failures"] >= self.config["failure_threshold"]:
+                # 시험 호출이 실패할 때마다 차단 시간을 두 배로 (최대 max_open_seconds)
+                opened = min(
+                    self.config["open_seconds"] * 2 ** state["open_count"],
+                    self.config["max_open_seconds"],
+                )
+                state.update(state="open", open_count=state["open_count"] + 1, retry_at=now + opened)
+        if opened is not None:
+            logger.warning(f"  ⛔ {SERVICES.get(service, service)} 연속 실패, {opened:g}초 동안 대체 경로 사용")
+
+    @contextmanager
+    def guard(self, service: str, errors: tuple = (Exception,)):
+        """호출 구간 (서킷이 열려 있으면 CircuitOpenError, errors 예외는 실패로 기록)"""
+        if not self.allow(service):
+            raise CircuitOpenError(service, self.retry_in(service))
+        try:
+            yield
+        except errors as e:
+            self.record_failure(service, e)
+            raise
+        self.record_success(service)
+
+    def reset(self, service: str = None):
+        """서킷 초기화 (service가 없으면 전체)"""
+        with self._update():
+            for name in [service] if service else list(self.services):
+                self.services.pop(name, None)
+
+    def summary(self) -> list[dict]:
+        """서비스별 상태 요약"""
+        self._refresh()
+        rows = []
+        for service, label in SERVICES.items():
+            state = self.services.get(service) or {"state": "closed", "failures": 0, "last_error": None}
+            rows.append({
+                "service": service,
+                "label": label,
+                "state": state["state"],
+                "failures": state["failures"],
+                "retry_in": self.retry_in(service) if state["state"] != "closed" else 0.0,
+                "last_error": state.get("last_error"),
+            })
+        return rows
+
+
+def get_health() -> HealthRegistry:
+    """현재 프로세스의 서비스 상태 기록"""
+    global _registry
+    if _registry is None:
+        _registry = HealthRegistry()
+    return _registry
+
+
+# 테스트: 실패 → 차단 → 시험 호출 → 회복 흐름 확인
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = HealthRegistry(Path(tmp) / "health.json", {"failure_threshold": 2, "open_seconds": 0.2})
+
+        def flaky(ok: bool):
+            with registry.guard("pollinations"):
+                if not ok:
+                    raise TimeoutError("응답 없음")
+
+        for ok in (False, False, True, None, True):
+            if ok is None:
+                time.sleep(0.25)  # 차단 시간이 지나면 시험 호출 허용
+                continue
+            started = time.perf_counter()
+            try:
+                flaky(ok)
+                result = "성공"
+            except CircuitOpenError as e:
+                result = f"차단: {e}"
+            except TimeoutError as e:
+                result = f"실패: {e}"
+            print(f"{result} ({(time.perf_counter() - started) * 1000:.2f} ms) → {registry.state('pollinations')['state']}")
+
+        # 다른 프로세스에서 읽어도 같은 상태
+        print(HealthRegistry(Path(tmp) / "health.json").summary()[2])
@@ -0,0 +1,254 @@
+"""
+html.parser 기반 단일 패스 HTML 후처리 모듈
+공백 정리, 플레인 텍스트 추출, 소제목 추출, 단어 수 계산을 한 번의 순회로 처리
+"""
+import re
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape, unescape
+from html.parser import HTMLParser
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.record_codec import read_record, record_id
+
+
+# 플레인 텍스트에서 줄을 나누는 블록 태그
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "pre", "blockquote", "table", "tr",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "section", "article",
+}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# 공백을 그대로 보존해야 하는 태그
+PRESERVE_TAGS = {"pre", "textarea"}
+
+_MULTI_SPACE = re.compile(r"\s{2,}")
+_WORD = re.compile(r"\S+")
+_HEADING = re.compile(r"<(h[1-6])(\s[^>]*)?>(.*?)</\1\s*>", re.DOTALL | re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+
+
+class HtmlDocument:
+    """HTML 후처리 결과"""
+
+    __slots__ = ("html", "text", "headings", "word_count", "char_count", "keyword_counts")
+
+    def __init__(
+        self,
+        html: str,
+        text: str,
+        headings: list[tuple[int, str]],
+        word_count: int,
+        keyword_counts: dict = None,
+    ):
+        self.html = html
+        self.text = text
+        self.headings = headings
+        self.word_count = word_count
+        self.char_count = len(text)
+        self.keyword_counts = keyword_counts or {}
+
+
+class HtmlProcessor(HTMLParser):
+    """HTML을 한 번 순회하며 정리된 HTML과 텍스트 정보를 함께 만든다
+
+    - <pre>, <textarea> 밖의 연속 공백은 공백 하나로 합친다
+    - strip_literal_escapes=True 이면 문자열 그대로의 '\\n', '\\t'를 제거한다
+    - 태그와 속성은 원문 그대로 다시 출력한다
+    - keywords가 주어지면 텍스트 등장 횟수를 함께 센다 (대소문자 무시)
+    """
+
+    def __init__(self, strip_literal_escapes: bool = True, keywords: list[str] = None):
+        super().__init__(convert_charrefs=False)
+        self.strip_literal_escapes = strip_literal_escapes
+        self._keywords = {k: k.lower() for k in (keywords or []) if k}
+        self._keyword_counts = dict.fromkeys(self._keywords, 0)
+        self._html = []
+        self._text = []
+        self._headings = []
+        self._heading = None
+        self._preserve_depth = 0
+        self._word_count = 0
+        self._in_word = False
+
+    # --- 텍스트 누적 ---
+
+    def _break_line(self):
+        if self._text and not self._text[-1].endswith("\n"):
+            self._text.append("\n")
+        self._in_word = False
+
+    def _add_text(self, text: str):
+        if not text:
+            return
+        self._text.append(text)
+        if self._heading is not None:
+            self._heading[1].append(text)
+
+        # 태그로 쪼개진 단어(예: Chat<b>GPT</b>)는 한 단어로 센다
+        words = len(_WORD.findall(text))
+        if words and self._in_word and not text[0].isspace():
+            words -= 1
+        self._word_count += words
+        self._in_word = not text[-1].isspace()
+
+        if self._keywords:
+            lowered = text.lower()
+            for keyword, needle in self._keywords.items():
+                self._keyword_counts[keyword] += lowered.count(needle)
+
+    # --- 파서 콜백 ---
+
+    def handle_starttag(self, tag, attrs):
+        self._html.append(self.get_starttag_text())
+        if tag in BLOCK_TAGS:
+            self._break_line()
+        if tag in PRESERVE_TAGS:
+            self._preserve_depth += 1
+        if tag in HEADING_TAGS:
+            self._heading = (int(tag[1]), [])
+
+    def handle_startendtag(self, tag, attrs):
+        self._html.append(self.get_starttag_text())
+        if tag in BLOCK_TAGS:
+            self._break_line()
+
+    def handle_endtag(self, tag):
+        self._html.append(f"</{tag}>")
+        if tag in PRESERVE_TAGS and self._preserve_depth:
+            self._preserve_depth -= 1
+        if tag in HEADING_TAGS and self._heading is not None:
+            level, parts = self._heading
+            self._headings.append((level, " ".join("".join(parts).split())))
+            self._heading = None
+        if tag in BLOCK_TAGS:
+            self._break_line()
+
+    def handle_data(self, data):
+        if self._preserve_depth:
+            self._html.append(data)
+            self._add_text(data)
+            return
+
+        if self.strip_literal_escapes:
+            data = data.replace("\\n", "").replace("\\t", "")
+        data = _MULTI_SPACE.sub(" ", data)
+        self._html.append(data)
+
+        # 블록 경계의 공백/줄바꿈은 텍스트에 넣지 않는다
+        text = data.replace("\n", " ")
+        if not self._text or self._text[-1].endswith("\n"):
+            text = text.lstrip()
+        self._add_text(text)
+
+    def handle_entityref(self, name):
+        self._html.append(f"&{name};")
+        self._add_text(unescape(f"&{name};"))
+
+    def handle_charref(self, name):
+        self._html.append(f"&#{name};")
+        self._add_text(unescape(f"&#{name};"))
+
+    def handle_comment(self, data):
+        self._html.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        self._html.append(f"<!{decl}>")
+
+    def handle_pi(self, data):
+        self._html.append(f"<?{data}>")
+
+    def unknown_decl(self, data):
+        self._html.append(f"<![{data}]>")
+
+    # --- 결과 ---
+
+    def result(self) -> HtmlDocument:
+        self.close()
+        lines = [line.rstrip() for line in "".join(self._text).split("\n")]
+        text = "\n".join(line for line in lines if line.strip()).strip()
+        return HtmlDocument(
+            html="".join(self._html),
+            text=text,
+            headings=self._headings,
+            word_count=self._word_count,
+            keyword_counts=self._keyword_counts,
+        )
+
+
+def process_html(content: str, strip_literal_escapes: bool = True, keywords: list[str] = None) -> HtmlDocument:
+    """HTML 한 건을 단일 패스로 후처리"""
+    processor = HtmlProcessor(strip_literal_escapes=strip_literal_escapes, keywords=keywords)
+    processor.feed(content or "")
+    return processor.result()
+
+
+def replace_headings(content: str, mapping: dict, levels: tuple = (2, 3)) -> tuple[str, int]:
+    """소제목 텍스트만 교체 (본문은 그대로 유지)
+
+    Args:
+        content: 원본 HTML
+        mapping: {기존 소제목 텍스트: 새 소제목 텍스트}
+        levels: 교체할 소제목 레벨
+
+    Returns:
+        (교체된 HTML, 교체한 소제목 수)
+    """
+    replaced = 0
+
+    def splice(match: re.Match) -> str:
+        nonlocal replaced
+        tag, attrs, inner = match.group(1), match.group(2) or "", match.group(3)
+        if int(tag[1]) not in levels:
+            return match.group(0)
+        old_text = " ".join(unescape(_TAG.sub("", inner)).split())
+        new_text = mapping.get(old_text)
+        if not new_text or new_text == old_text:
+            return match.group(0)
+        replaced += 1
+        return f"<{tag}{attrs}>{escape(new_text, quote=False)}</{tag}>"
+
+    return _HEADING.sub(splice, content), replaced
+
+
+def _process_article_file(path: str) -> dict:
+    """저장된 글 파일 하나 처리 (프로세스 풀 작업 단위)"""
+    article = read_record(path)
+    doc = process_html(article.get("content", ""))
+    return {
+        "id": article.get("id", record_id(path)),
+        "title": article.get("title", ""),
+        "word_count": doc.word_count,
+        "char_count": doc.char_count,
+        "headings": doc.headings,
+    }
+
+
+def process_article_files(paths: list, workers: int = None, chunksize: int = 16) -> list[dict]:
+    """저장된 글 여러 건을 프로세스 풀에서 병렬 처리
+
+    Args:
+        paths: 글 JSON 파일 경로 리스트
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+        chunksize: 프로세스에 한 번에 넘길 파일 수
+    """
+    paths = [str(p) for p in paths]
+    if workers == 1 or len(paths) <= 1:
+        return [_process_article_file(p) for p in paths]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_process_article_file, paths, chunksize=chunksize))
+
+
+# 테스트
+if __name__ == "__main__":
+    sample = (
+        "<h2>들어가며</h2>\\n<p>OpenAI가   새로운 <b>GPT</b> 모델을 준비하고 있다.</p>"
+        "<pre>def hello():\n    print('hi')</pre>"
+        "<h3>핵심만 정리하면</h3><ul><li>빠르다</li><li>저렴하다</li></ul>"
+    )
+    doc = process_html(sample)
+    print(f"HTML: {doc.html}")
+    print(f"텍스트:\n{doc.text}")
+    print(f"소제목: {doc.headings}")
+    print(f"단어 수: {doc.word_count}, 글자 수: {doc.char_count}")
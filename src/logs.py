@@ -0,0 +1,342 @@
+"""
+로그 모듈 (print 대신 사용)
+기록하는 쪽은 큐에 넣기만 하고, 콘솔/JSON Lines 파일 출력은 별도 스레드(QueueListener)가 처리
+큐가 가득 차면 기다리지 않고 버리므로 출력이 느려도 글 생성 작업이 멈추지 않는다.
+모든 기록에 실행 ID(run_id)와 log_context()로 지정한 글 ID 등이 붙는다.
+
+사용법:
+    logger = get_logger("content_generator")
+    logger.info("📰 뉴스 분석 및 글 생성 중...")
+    logger.warning("JSON 파싱 실패", extra={"payload": response_text})  # 첨부 데이터는 앞/뒤만 남기고 자름
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import multiprocessing.util
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import LOGGING
+from src.storage import unique_id
+
+ROOT = "auto_blog"
+BASE_DIR = Path(__file__).parent.parent
+# 모듈별 레벨 환경변수 (예: AUTO_BLOG_LOG="DEBUG" / "content_generator=DEBUG,news_collector=WARNING")
+ENV_VAR = "AUTO_BLOG_LOG"
+
+# 글 ID, 카테고리, 작업 ID 등 기록에 붙일 값 (스레드/asyncio 작업별로 따로 유지)
+_context = contextvars.ContextVar("log_context", default={})
+
+
+class _State:
+    """현재 프로세스의 로그 설정 (큐, 출력 스레드, 버린 기록 수)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.config = {**LOGGING, "json_path": None}
+        self.run_id = unique_id()
+        self.queue = queue.Queue(self.config["queue_size"])
+        self.listener = None
+        self.dropped = 0
+
+
+_state = _State()
+
+
+def truncate(text: str, limit: int) -> str:
+    """limit자보다 길면 앞/뒤 절반씩만 남김"""
+    if limit is None or len(text) <= limit:
+        return text
+    half = limit // 2
+    return f"{text[:half]} …({len(text) - half * 2}자 생략)… {text[-half:]}"
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """기록하는 스레드에서는 메시지 정리 후 큐에 넣기만 함 (가득 차면 버림)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        config = _state.config
+        message = record.getMessage()
+        exc_text = None
+        if record.exc_info:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+
+        record = copy.copy(record)
+        record.msg = truncate(message, config["max_message"])
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        record.run_id = _state.run_id
+        record.context = _context.get()
+        payload = getattr(record, "payload", None)
+        if payload is not None:
+            payload = payload if isinstance(payload, str) else str(payload)
+            record.payload_len = len(payload)
+            record.payload = truncate(payload, config["max_payload"])
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if _state.listener is None:
+            _start_listener()
+        if _state.dropped:
+            record.dropped, _state.dropped = _state.dropped, 0
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _state.dropped += 1 + getattr(record, "dropped", 0)
+
+
+class TextFormatter(logging.Formatter):
+    """콘솔용: 메시지 그대로 (첨부 데이터는 아래 줄에)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        if getattr(record, "payload", None) is not None:
+            text += f"\n{record.payload}"
+        if getattr(record, "dropped", 0):
+            text += f"\n(출력이 밀려 로그 {record.dropped}건 생략)"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """JSON Lines: 시각, 레벨, 모듈, 실행 ID, 문맥 값, 메시지"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "module": record.name.removeprefix(f"{ROOT}."),
+            "run_id": getattr(record, "run_id", None),
+            "pid": record.process,
+            **getattr(record, "context", {}),
+            "msg": record.getMessage().strip(),
+        }
+        if getattr(record, "payload", None) is not None:
+            entry["payload"] = record.payload
+            entry["payload_len"] = record.payload_len
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if getattr(record, "dropped", 0):
+            entry["dropped"] = record.dropped
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """콘솔 출력 (head 등으로 파이프가 닫히면 조용히 중단)"""
+
+    def handleError(self, record: logging.LogRecord):
+        if isinstance(sys.exc_info()[1], BrokenPipeError):
+            self.setLevel(logging.CRITICAL + 1)
+            return
+        super().handleError(record)
+
+
+def _build_handlers(config: dict) -> list[logging.Handler]:
+    handlers = []
+    if config["console"] != "none":
+        console = ConsoleHandler(sys.stdout)
+        console.setFormatter(JsonFormatter() if config["console"] == "json" else TextFormatter())
+        handlers.append(console)
+    if config["json_path"]:
+        path = Path(config["json_path"])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 백필 작업 프로세스도 같은 파일에 이어 씀 (O_APPEND, 한 줄씩 쓰기)
+        file_handler = logging.FileHandler(path, mode="a", encoding="utf-8", delay=True)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    return handlers
+
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)  # 큐가 가득 차 있어도 출력 스레드가 비우므로 대기
+
+
+def _start_listener():
+    with _state.lock:
+        if _state.listener is None:
+            _state.listener = _Listener(_state.queue, *_build_handlers(_state.config))
+            _state.listener.start()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈 로거 (이름이 모듈별 레벨 설정의 키)"""
+    if not logging.getLogger(ROOT).handlers:
+        setup_logging()
+    return logging.getLogger(f"{ROOT}.{name}")
+
+
+def parse_levels(specs: list[str] | str | None) -> tuple[str | None, dict]:
+    """"DEBUG", "content_generator=DEBUG,news_collector=WARNING" 형식 → (기본 레벨, 모듈별 레벨)"""
+    if isinstance(specs, str):
+        specs = [specs]
+    level, modules = None, {}
+    for spec in specs or []:
+        for item in filter(None, (s.strip() for s in spec.split(","))):
+            name, _, value = item.rpartition("=")
+            value = value.upper()
+            if not isinstance(logging.getLevelName(value), int):
+                raise ValueError(f"알 수 없는 로그 레벨: {item}")
+            if name:
+                modules[name] = value
+            else:
+                level = value
+    return level, modules
+
+
+def setup_logging(
+    level: str = None,
+    modules: dict = None,
+    console: str = None,
+    json_path=None,
+    run_id: str = None,
+) -> str:
+    """로그 설정 (환경변수 AUTO_BLOG_LOG < 인자 순으로 적용) 후 실행 ID 반환
+
+    json_path=True이면 LOGGING["json_dir"]/<run_id>.jsonl
+    설정하지 않고 get_logger()만 써도 콘솔 출력은 된다.
+    """
+    env_level, env_modules = parse_levels(os.environ.get(ENV_VAR))
+    shutdown_logging()
+
+    config = {**LOGGING}
+    config["level"] = level or env_level or LOGGING["level"]
+    config["modules"] = {**LOGGING["modules"], **env_modules, **(modules or {})}
+    config["console"] = console or LOGGING["console"]
+    _state.run_id = run_id or _state.run_id
+    if json_path is True:
+        json_path = BASE_DIR / LOGGING["json_dir"] / f"{_state.run_id}.jsonl" if LOGGING["json_dir"] else None
+    config["json_path"] = str(json_path) if json_path else None
+    _state.config = config
+
+    root = logging.getLogger(ROOT)
+    if not root.handlers:
+        root.addHandler(NonBlockingQueueHandler(_state.queue))
+        root.propagate = False  # httpx 등 외부 라이브러리 로그와 섞지 않음
+    root.setLevel(config["level"])
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith(f"{ROOT}."):
+            logging.getLogger(name).setLevel(logging.NOTSET)
+    for name, module_level in config["modules"].items():
+        logging.getLogger(f"{ROOT}.{name}").setLevel(module_level)
+    return _state.run_id
+
+
+def current_config() -> dict:
+    """다른 프로세스에서 같은 설정으로 setup_logging(**current_config()) 하기 위한 값"""
+    config = _state.config
+    return {
+        "level": config["level"],
+        "modules": dict(config["modules"]),
+        "console": config["console"],
+        "json_path": config["json_path"],
+        "run_id": _state.run_id,
+    }
+
+
+def run_id() -> str:
+    return _state.run_id
+
+
+@contextmanager
+def log_context(**fields):
+    """블록 안의 기록에 값 추가 (예: log_context(article_id=...))"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def flush_logs():
+    """큐에 쌓인 기록이 모두 출력될 때까지 대기 (print 출력과 순서를 맞출 때)"""
+    if _state.listener is not None:
+        _state.queue.join()
+
+
+def shutdown_logging():
+    """출력 스레드 종료 (남은 기록은 모두 출력)"""
+    with _state.lock:
+        listener, _state.listener = _state.listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    if _state.dropped:
+        sys.stderr.write(f"(출력이 밀려 로그 {_state.dropped}건 생략)\n")
+        _state.dropped = 0
+
+
+def _after_fork_in_child():
+    # 부모의 출력 스레드는 복사되지 않고 큐 잠금이 잡힌 채 복사됐을 수 있으므로 새로 만듦
+    _state.lock = threading.Lock()
+    _state.queue = queue.Queue(_state.config["queue_size"])
+    _state.listener = None
+    _state.dropped = 0
+    for handler in logging.getLogger(ROOT).handlers:
+        if isinstance(handler, NonBlockingQueueHandler):
+            handler.queue = _state.queue
+
+
+atexit.register(shutdown_logging)
+# 작업 프로세스는 atexit 없이 종료되므로 multiprocessing 종료 처리에도 등록
+multiprocessing.util.Finalize(None, shutdown_logging, exitpriority=100)
+os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+# 테스트: 출력이 느린 상황에서도 기록하는 쪽이 멈추지 않는지 확인
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    class SlowHandler(logging.Handler):
+        """한 줄 출력에 1ms 걸리는 콘솔/파일"""
+
+        def emit(self, record):
+            time.sleep(0.001)
+
+    def measure(handler: logging.Handler, count: int = 5000) -> float:
+        bench = logging.getLogger("bench")
+        bench.handlers = [handler]
+        bench.propagate = False
+        bench.setLevel(logging.INFO)
+        started = time.perf_counter()
+        for i in range(count):
+            bench.info("글 %d 생성 중", i, extra={"payload": "가" * 20_000})
+        return (time.perf_counter() - started) * 1000 / count
+
+    print("=== 기록 1건당 호출 시간 (출력 1ms 지연) ===")
+    print(f"직접 출력:  {measure(SlowHandler(), 500):.4f} ms")
+    _state.listener = _Listener(_state.queue, SlowHandler())
+    _state.listener.start()
+    print(f"큐 + 스레드: {measure(NonBlockingQueueHandler(_state.queue), 1000):.4f} ms (버린 기록 {_state.dropped}건)")
+    shutdown_logging()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "run.jsonl"
+        setup_logging("INFO", {"demo": "DEBUG"}, json_path=path)
+        demo = get_logger("demo")
+        quiet = get_logger("quiet")
+        with log_context(article_id="20250101_000000_abc123", category="ai"):
+            demo.debug("파싱 실패 응답", extra={"payload": "{" + "x" * 5000 + "}"})
+            quiet.debug("출력 안 됨 (INFO 미만)")
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                demo.exception("예외 기록")
+        demo.info("문맥 밖")
+        shutdown_logging()
+        print("\n=== JSON Lines ===")
+        for line in path.read_text(encoding="utf-8").splitlines():
+            entry = json.loads(line)
+            print({k: (v[:60] + "…" if isinstance(v, str) and len(v) > 60 else v) for k, v in entry.items()})
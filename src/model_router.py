@@ -0,0 +1,190 @@
+"""
+작업별 Gemini 모델 라우팅 모듈
+MODEL_ROUTES 설정에 따라 작업마다 모델/출력 한도를 고르고, 할당량 오류나 지연 시 다음 모델로 폴백
+"""
+import sys
+import os
+import time
+from pathlib import Path
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import MODEL_ROUTES, MODEL_ROUTING, MODEL_PRICING
+from src.cassette import Cassette, get_cassette
+from src.health import get_health
+from src.logs import get_logger
+from src.storage import locked_json, read_json
+
+logger = get_logger("model_router")
+
+# 다음 모델로 넘어가야 하는 오류 (할당량, 일시적 서버 오류, 타임아웃)
+FALLBACK_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+
+class ModelRouter:
+    """작업(route)별 모델 선택 + 폴백 + 지연/비용 통계"""
+
+    STATS_PATH = Path(__file__).parent.parent / "data" / "model_stats.json"
+
+    def __init__(self, routes: dict = None, stats_path: Path = None):
+        self.routes = routes or MODEL_ROUTES
+        self.stats_path = Path(stats_path or self.STATS_PATH)
+        self._models = {}
+        self.stats = self._load_stats()
+        # 모델 호출 전에 부르는 함수 (여러 프로세스가 공유하는 속도 제한 등)
+        self.throttle = None
+
+    def _load_stats(self) -> dict:
+        """이전 실행의 통계/쿨다운 불러오기"""
+        return read_json(self.stats_path) or {"routes": {}, "cooldowns": {}}
+
+    def _update_stats(self, update):
+        """잠금 안에서 파일의 최신 통계에 update(stats)를 반영 후 저장 (동시에 실행 중인 다른 프로세스 기록 유지)"""
+        with locked_json(self.stats_path, default=lambda: {"routes": {}, "cooldowns": {}}) as stats:
+            stats.setdefault("routes", {})
+            stats.setdefault("cooldowns", {})
+            update(stats)
+        self.stats = stats
+
+    def _get_model(self, route: str, model_name: str):
+        """(작업, 모델)별 GenerativeModel 재사용"""
+        key = (route, model_name)
+        if key not in self._models:
+            config = self.routes[route]
+            generation_config = {"max_output_tokens": config["max_output_tokens"]}
+            if config.get("response_mime_type"):
+                generation_config["response_mime_type"] = config["response_mime_type"]
+            self._models[key] = genai.GenerativeModel(model_name, generation_config=generation_config)
+        return self._models[key]
+
+    def _candidates(self, route: str) -> list[str]:
+        """쿨다운 중인 모델은 뒤로 보낸 모델 순서"""
+        now = time.time()
+        cooldowns = self.stats["cooldowns"]
+        models = self.routes[route]["models"]
+        ready = [m for m in models if cooldowns.get(m, 0) <= now]
+        cooling = sorted((m for m in models if m not in ready), key=lambda m: cooldowns[m])
+        return ready + cooling
+
+    def _record(
+        self,
+        route: str,
+        model_name: str,
+        latency: float,
+        response=None,
+        error: Exception = None,
+        cooldown: float = None,
+    ):
+        """작업/모델별 호출 수, 실패 수, 지연, 토큰, 비용 누적 (cooldown초 동안 해당 모델 후순위)"""
+        usage = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(usage, "prompt_token_count", 0) or 0
+        output_tokens = getattr(usage, "candidates_token_count", 0) or 0
+        input_price, output_price = MODEL_PRICING.get(model_name, (0.0, 0.0))
+
+        def update(stats: dict):
+            entry = stats["routes"].setdefault(route, {}).setdefault(model_name, {
+                "calls": 0, "failures": 0, "total_latency": 0.0, "max_latency": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+            })
+            entry["calls"] += 1
+            entry["total_latency"] = round(entry["total_latency"] + latency, 3)
+            entry["max_latency"] = round(max(entry["max_latency"], latency), 3)
+
+            if error is not None:
+                entry["failures"] += 1
+                entry["last_error"] = str(error)[:200]
+            elif response is not None:
+                entry["input_tokens"] += input_tokens
+                entry["output_tokens"] += output_tokens
+                entry["cost_usd"] = round(
+                    entry["cost_usd"] + (input_tokens * input_price + output_tokens * output_price) / 1_000_000, 6
+                )
+            if cooldown:
+                stats["cooldowns"][model_name] = time.time() + cooldown
+
+        self._update_stats(update)
+
+    def generate(self, route: str, prompt: str):
+        """작업에 맞는 모델로 생성 (실패 시 다음 모델로 폴백)
+
+        Returns:
+            Gemini 응답 객체 (response.text 사용)
+
+        Raises:
+            CircuitOpenError: 최근 연속 실패로 Gemini 호출이 일시 차단된 경우
+            RuntimeError: 모든 모델 호출 실패
+        """
+        cassette = get_cassette()
+        cassette_key = Cassette.key_for(route, prompt)
+        if cassette and cassette.replaying:
+            return cassette.decode_gemini(cassette.play("gemini", cassette_key))
+
+        # 모델 간 폴백까지 모두 실패한 경우만 서비스 장애로 기록
+        with get_health().guard("gemini"):
+            return self._generate(route, prompt, cassette, cassette_key)
+
+    def _generate(self, route: str, prompt: str, cassette: Cassette | None, cassette_key: str):
+        config = self.routes[route]
+        last_error = None
+
+        for model_name in self._candidates(route):
+            model = self._get_model(route, model_name)
+            if self.throttle is not None:
+                self.throttle()
+            started = time.perf_counter()
+            try:
+                response = model.generate_content(prompt, request_options={"timeout": config.get("timeout", 120)})
+            except FALLBACK_ERRORS as e:
+                latency = time.perf_counter() - started
+                self._record(route, model_name, latency, error=e, cooldown=MODEL_ROUTING["error_cooldown"])
+                logger.warning(f"  ⚠️ {model_name} 실패 ({type(e).__name__}), 다음 모델로 전환")
+                last_error = e
+                continue
+
+            latency = time.perf_counter() - started
+            # 느린 응답은 사용하되, 다음 호출부터는 다른 모델을 먼저 시도
+            slow = latency > config.get("slow_seconds", float("inf"))
+            self._record(route, model_name, latency, response=response,
+                         cooldown=MODEL_ROUTING["slow_cooldown"] if slow else None)
+            if slow:
+                logger.warning(f"  🐢 {model_name} 응답 지연 ({latency:.1f}s), 당분간 후순위로 변경")
+            if cassette:
+                payload = {**cassette.encode_gemini(response), "route": route, "model": model_name}
+                cassette.record("gemini", cassette_key, payload, latency)
+            return response
+
+        raise RuntimeError(f"'{route}' 작업의 모든 모델 호출 실패: {last_error}")
+
+    def summary(self) -> list[dict]:
+        """작업/모델별 평균 지연, 실패율, 비용 요약"""
+        rows = []
+        for route, models in self.stats["routes"].items():
+            for model_name, entry in models.items():
+                calls = entry["calls"] or 1
+                rows.append({
+                    "route": route,
+                    "model": model_name,
+                    "calls": entry["calls"],
+                    "failure_rate": entry["failures"] / calls,
+                    "avg_latency": entry["total_latency"] / calls,
+                    "cost_usd": entry["cost_usd"],
+                })
+        return rows
+
+
+# 테스트: 누적 통계 출력
+if __name__ == "__main__":
+    router = ModelRouter()
+    for row in router.summary():
+        print(
+            f"{row['route']:<12} {row['model']:<24} 호출 {row['calls']:>4}회"
+            f" / 실패율 {row['failure_rate']:.0%} / 평균 {row['avg_latency']:.1f}s / ${row['cost_usd']:.4f}"
+        )
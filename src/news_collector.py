@@ -1,25 +1,113 @@
 """
 Google News RSS를 통한 뉴스 수집 모듈
 """
-import feedparser
+import hashlib
+import html
 import random
-from datetime import datetime
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Optional
 from urllib.parse import quote
 import sys
 import os
 
+import requests
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from config.settings import CATEGORIES
+from config.settings import CATEGORIES, ENRICHMENT
+from src.cassette import get_cassette
+from src.feed_parser import parse_feed
+from src.health import get_health
+from src.logs import get_logger
+from src.profiler import profile_stage
+from src.storage import atomic_write
+
+logger = get_logger("news_collector")
+
+
+class Headline:
+    """수집된 뉴스 한 건 (slotted 레코드)
+
+    출처/언어 문자열은 intern 처리해 같은 값을 공유하고,
+    요약(summary)은 원본 HTML만 보관했다가 접근할 때 텍스트로 변환한다.
+    """
+
+    __slots__ = ("title", "link", "published", "source", "lang", "country", "_summary_html")
+
+    def __init__(
+        self,
+        title: str,
+        link: str = "",
+        published: str = "",
+        source: str = "Unknown",
+        lang: str = "",
+        country: str = "",
+        summary_html: Optional[str] = None,
+    ):
+        self.title = title
+        self.link = link
+        self.published = published
+        self.source = sys.intern(source)
+        self.lang = sys.intern(lang)
+        self.country = sys.intern(country)
+        self._summary_html = summary_html
+
+    @property
+    def summary(self) -> str:
+        """요약 텍스트 (HTML 태그 제거는 접근 시점에 수행)"""
+        if not self._summary_html:
+            return ""
+        return html.unescape(re.sub(r"<[^>]+>", " ", self._summary_html)).strip()
+
+    def to_dict(self) -> dict:
+        """기존 dict 형식으로 변환"""
+        return {
+            "title": self.title,
+            "link": self.link,
+            "published": self.published,
+            "summary": self.summary,
+            "source": self.source,
+            "lang": self.lang,
+            "country": self.country,
+        }
+
+    def __repr__(self) -> str:
+        return f"Headline({self.title!r}, source={self.source!r}, lang={self.lang!r})"
+
+
+def dedupe_headlines(headlines, key: str = "title") -> list[Headline]:
+    """해시 기반 중복 제거 (처음 나온 항목 유지)"""
+    seen = set()
+    unique = []
+    for item in headlines:
+        value = getattr(item, key)
+        if value not in seen:
+            seen.add(value)
+            unique.append(item)
+    return unique
 
 
 class NewsCollector:
     """Google News RSS 기반 뉴스 수집기"""
 
     BASE_URL = "https://news.google.com/rss/search"
+    TIMEOUT = 15
+    # 마지막으로 받은 RSS 원본 (Google News 장애 시 대체용)
+    FEED_CACHE_DIR = Path(__file__).parent.parent / "data" / "feed_cache"
 
-    def __init__(self):
+    def __init__(self, headline_store=None):
         self.categories = CATEGORIES
+        self._headline_store = headline_store
+
+    @property
+    def headline_store(self):
+        """이미 본 헤드라인 저장소 (필요할 때 생성)"""
+        if self._headline_store is None:
+            from src.headline_store import HeadlineStore
+            self._headline_store = HeadlineStore()
+        return self._headline_store
 
     def _build_query(self, keywords: list[str], days: int = 2) -> str:
         """검색 쿼리 생성"""
@@ -28,35 +116,101 @@ class NewsCollector:
         query = " OR ".join(selected)
         return query
 
-    def _fetch_news(self, query: str, lang: str = "ko", country: str = "KR", max_results: int = 10) -> list[dict]:
-        """RSS 피드에서 뉴스 가져오기"""
+    def _feed_cache_path(self, url: str) -> Path:
+        return self.FEED_CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()[:16]}.xml"
+
+    def _cached_feed(self, url: str) -> bytes:
+        """같은 URL로 마지막에 받은 RSS (없으면 빈 응답)"""
+        path = self._feed_cache_path(url)
+        if not path.exists():
+            return b""
+        saved_at = datetime.fromtimestamp(path.stat().st_mtime).strftime("%m/%d %H:%M")
+        logger.info(f"  📦 캐시된 RSS 사용 ({saved_at} 수집분)")
+        return path.read_bytes()
+
+    def _save_feed(self, url: str, data: bytes):
+        atomic_write(self._feed_cache_path(url), data, fsync=False)
+
+    def _download(self, url: str) -> bytes:
+        """RSS 원본 다운로드 (카세트 녹화/재생 지원, 장애 시 마지막으로 받은 RSS 사용)"""
+        cassette = get_cassette()
+        if cassette and cassette.replaying:
+            return cassette.decode_bytes(cassette.play("rss", url))
+
+        health = get_health()
+        if not health.allow("google_news"):
+            logger.warning(f"Google News 일시 차단 중 ({health.retry_in('google_news'):.0f}초 후 재시도)")
+            return self._cached_feed(url)
+
+        started = time.perf_counter()
+        try:
+            response = requests.get(url, timeout=self.TIMEOUT)
+            response.raise_for_status()
+            data = response.content
+        except requests.RequestException as e:
+            logger.warning(f"RSS 다운로드 실패: {e}")
+            health.record_failure("google_news", e)
+            data = self._cached_feed(url)
+        else:
+            health.record_success("google_news")
+            self._save_feed(url, data)
+
+        if cassette:
+            cassette.record("rss", url, cassette.encode_bytes(data), time.perf_counter() - started)
+        return data
+
+    def _fetch_news(
+        self,
+        query: str,
+        lang: str = "ko",
+        country: str = "KR",
+        max_results: int = 10,
+        with_summary: bool = True,
+    ) -> list[Headline]:
+        """RSS 피드에서 뉴스 가져오기
+
+        with_summary=False 이면 요약 HTML을 보관하지 않는다 (제목 수집용).
+        """
         encoded_query = quote(query, safe='')
         url = f"{self.BASE_URL}?q={encoded_query}&hl={lang}&gl={country}&ceid={country}:{lang}"
 
-        feed = feedparser.parse(url)
+        data = self._download(url)
         articles = []
 
-        for entry in feed.entries[:max_results]:
-            articles.append({
-                "title": entry.title,
-                "link": entry.link,
-                "published": entry.get("published", ""),
-                "summary": entry.get("summary", ""),
-                "source": entry.get("source", {}).get("title", "Unknown"),
-            })
+        with profile_stage("parse"):
+            # Google News 형식이면 필요한 필드만 읽고 max_results개에서 중단 (아니면 feedparser)
+            for entry in parse_feed(data, max_results, with_summary):
+                articles.append(Headline(
+                    title=entry["title"],
+                    link=entry["link"],
+                    published=entry["published"],
+                    source=entry["source"],
+                    lang=lang,
+                    country=country,
+                    summary_html=entry["summary"],
+                ))
 
         return articles
 
+    def enrich(self, headlines: list) -> list[dict]:
+        """상위 헤드라인 링크의 본문 발췌 (동시 다운로드 + URL별 캐시)"""
+        from src.article_enricher import ArticleEnricher
+        with profile_stage("enrich"):
+            enriched = ArticleEnricher().enrich(headlines)
+        logger.info(f"  📄 본문 보강: {len(enriched)}/{min(len(headlines), ENRICHMENT['top_k'])}건")
+        return enriched
+
     def select_category(self) -> str:
-        """가중치 기반 카테고리 선택"""
-        categories = list(self.categories.keys())
-        weights = [self.categories[c]["weight"] for c in categories]
-        return random.choices(categories, weights=weights, k=1)[0]
+        """최근 생성 이력과 새 뉴스량을 반영한 가중치 기반 카테고리 선택"""
+        from src.category_scheduler import CategoryScheduler
+        scheduler = CategoryScheduler(categories=self.categories, headline_store=self.headline_store)
+        return scheduler.next_category()
 
     def collect_news(
         self,
         category: Optional[str] = None,
-        languages: Optional[list[tuple[str, str]]] = None
+        languages: Optional[list[tuple[str, str]]] = None,
+        enrich: Optional[bool] = None,
     ) -> dict:
         """뉴스 수집 메인 함수 (글로벌 뉴스 지원)
 
@@ -65,6 +219,7 @@ class NewsCollector:
             languages: (언어코드, 국가코드) 튜플 리스트
                        기본값: [("ko", "KR"), ("en", "US")]
                        예시: [("ja", "JP"), ("de", "DE")]
+            enrich: 주요/관련 기사 본문 발췌(enriched) 포함 (None이면 ENRICHMENT["enabled"])
         """
         if category is None:
             category = self.select_category()
@@ -78,31 +233,22 @@ class NewsCollector:
         # 여러 언어/국가에서 기사 수집
         all_articles = []
         for lang, country in languages:
-            articles = self._fetch_news(query, lang=lang, country=country)
-            for article in articles:
-                article["lang"] = lang
-                article["country"] = country
-            all_articles.extend(articles)
+            all_articles.extend(self._fetch_news(query, lang=lang, country=country))
 
         # 중복 제거 (링크 기준)
-        seen_links = set()
-        unique_articles = []
-        for article in all_articles:
-            if article["link"] not in seen_links:
-                seen_links.add(article["link"])
-                unique_articles.append(article)
+        unique_articles = dedupe_headlines(all_articles, key="link")
 
         if not unique_articles:
             # 폴백: AI 카테고리로 재시도
             if category != "ai":
-                return self.collect_news("ai", languages=languages)
+                return self.collect_news("ai", languages=languages, enrich=enrich)
             return {"category": category, "articles": [], "error": "No articles found"}
 
         # 가장 관련성 높은 기사 선택 (첫 번째 기사)
-        main_article = unique_articles[0]
-        related_articles = unique_articles[1:4]  # 참고용 관련 기사 3개
+        main_article = unique_articles[0].to_dict()
+        related_articles = [a.to_dict() for a in unique_articles[1:4]]  # 참고용 관련 기사 3개
 
-        return {
+        result = {
             "category": category,
             "category_name": cat_info["name"],
             "main_article": main_article,
@@ -110,12 +256,19 @@ class NewsCollector:
             "collected_at": datetime.now().isoformat(),
             "languages": languages,
         }
+        if ENRICHMENT["enabled"] if enrich is None else enrich:
+            result["enriched"] = self.enrich(unique_articles[:4])
+        return result
 
     def collect_news_titles(
         self,
         category: Optional[str] = None,
         languages: Optional[list[tuple[str, str]]] = None,
-        max_per_lang: int = 15
+        max_per_lang: int = 15,
+        only_new: bool = False,
+        with_trend: bool = False,
+        date: Optional[str] = None,
+        enrich: Optional[bool] = None,
     ) -> dict:
         """뉴스 제목만 다량 수집 (주제 선정용)
 
@@ -123,9 +276,13 @@ class NewsCollector:
             category: 수집할 카테고리 (None이면 가중치 기반 랜덤 선택)
             languages: (언어코드, 국가코드) 튜플 리스트
             max_per_lang: 언어별 최대 수집 개수 (기본 15개)
+            only_new: 이전 실행에서 본 헤드라인 제외 (mark_seen()으로 기록)
+            with_trend: 최근 일자별 헤드라인 수(trend_history) 포함
+            date: 특정 날짜(YYYY-MM-DD)의 뉴스만 수집 (과거 글 백필용)
+            enrich: 상위 헤드라인 본문 발췌(enriched) 포함 (None이면 ENRICHMENT["enabled"])
 
         Returns:
-            카테고리 정보와 뉴스 제목 리스트
+            카테고리 정보와 뉴스 제목(Headline) 리스트
         """
         if category is None:
             category = self.select_category()
@@ -137,36 +294,102 @@ class NewsCollector:
 
         # 모든 키워드 사용 (랜덤 선택 없이)
         query = " OR ".join(cat_info["keywords"][:5])
-
-        # 여러 언어/국가에서 제목 수집
+        if date:
+            # Google News 검색 연산자로 해당 날짜 하루만 조회
+            day = datetime.strptime(date, "%Y-%m-%d")
+            query = (
+                f"({query}) after:{(day - timedelta(days=1)).strftime('%Y-%m-%d')}"
+                f" before:{(day + timedelta(days=1)).strftime('%Y-%m-%d')}"
+            )
+
+        # 여러 언어/국가에서 제목 수집 (요약 HTML은 보관하지 않음)
         all_titles = []
         for lang, country in languages:
-            articles = self._fetch_news(query, lang=lang, country=country, max_results=max_per_lang)
-            for article in articles:
-                all_titles.append({
-                    "title": article["title"],
-                    "source": article["source"],
-                    "lang": lang,
-                })
+            all_titles.extend(self._fetch_news(
+                query, lang=lang, country=country, max_results=max_per_lang, with_summary=False,
+            ))
 
         # 중복 제거 (제목 기준)
-        seen_titles = set()
-        unique_titles = []
-        for item in all_titles:
-            if item["title"] not in seen_titles:
-                seen_titles.add(item["title"])
-                unique_titles.append(item)
+        unique_titles = dedupe_headlines(all_titles, key="title")
+        total_count = len(unique_titles)
 
-        return {
+        result = {
             "category": category,
             "category_name": cat_info["name"],
             "titles": unique_titles,
+            "total_count": total_count,
             "collected_at": datetime.now().isoformat(),
         }
+        if date:
+            result["date"] = date
+
+        if only_new or with_trend:
+            store = self.headline_store
+            new_titles, _ = store.split_new(category, unique_titles)
+            store.record_trend(category, total_count, len(new_titles))
+            if only_new:
+                result["titles"] = new_titles
+            if with_trend:
+                result["trend_history"] = store.trend_history(category)
+
+        if result["titles"] and (ENRICHMENT["enabled"] if enrich is None else enrich):
+            result["enriched"] = self.enrich(result["titles"])
+
+        return result
+
+    def mark_seen(self, news_data: dict):
+        """collect_news_titles() 결과의 헤드라인을 본 것으로 기록"""
+        self.headline_store.mark_seen(news_data["category"], news_data.get("titles", []))
+
+
+def benchmark_memory(n: int = 2000) -> dict:
+    """dict 기반 구조와 Headline 기반 구조의 메모리 사용량 비교 (tracemalloc)"""
+    import tracemalloc
+
+    sources = ["연합뉴스", "조선일보", "Reuters", "The Verge", "TechCrunch"]
+    langs = ["ko", "en"]
+    # 피드 파싱 결과처럼 항목마다 별도의 문자열 객체를 만든다
+    rows = [
+        (f"뉴스 제목 {i % (n // 2 or 1)}", sources[i % len(sources)].encode().decode(), langs[i % 2].encode().decode())
+        for i in range(n)
+    ]
+
+    def measure(build) -> int:
+        tracemalloc.start()
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return size
+
+    def build_dicts():
+        items = [{"title": t, "source": s, "lang": l} for t, s, l in rows]
+        seen_titles = set()
+        unique = []
+        for item in items:
+            if item["title"] not in seen_titles:
+                seen_titles.add(item["title"])
+                unique.append(item)
+        return unique
+
+    def build_headlines():
+        return dedupe_headlines(Headline(t, source=s, lang=l) for t, s, l in rows)
+
+    return {"items": n, "dict_bytes": measure(build_dicts), "headline_bytes": measure(build_headlines)}
 
 
 # 테스트
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        for size in (1000, 10000, 100000):
+            stats = benchmark_memory(size)
+            ratio = stats["headline_bytes"] / stats["dict_bytes"]
+            print(
+                f"{stats['items']:>7}건: dict {stats['dict_bytes'] / 1024:8.1f} KB"
+                f" / Headline {stats['headline_bytes'] / 1024:8.1f} KB ({ratio:.0%})"
+            )
+        sys.exit(0)
+
     collector = NewsCollector()
 
     # 기본: 한국어 + 영어 뉴스 수집
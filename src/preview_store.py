@@ -0,0 +1,70 @@
+"""
+글 미리보기 사전 렌더링 저장소 (data/previews/)
+글 저장 시점에 이메일과 같은 HTML을 한 번만 렌더링해서 압축 저장
+"""
+import gzip
+import json
+import sys
+import os
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.email_sender import EmailSender
+from src.storage import atomic_write, write_json
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성
+    brotli = None
+
+
+class PreviewStore:
+    """사전 렌더링된 미리보기 + 목록용 요약 정보 저장소"""
+
+    PREVIEW_DIR = Path(__file__).parent.parent / "data" / "previews"
+
+    def __init__(self, preview_dir: Path = None):
+        self.preview_dir = Path(preview_dir or self.PREVIEW_DIR)
+        self.preview_dir.mkdir(parents=True, exist_ok=True)
+        self._sender = None
+
+    def path_for(self, article_id: str, encoding: str = "gzip") -> Path:
+        """인코딩별 미리보기 파일 경로 (gzip 또는 br)"""
+        suffix = "br" if encoding == "br" else "gz"
+        return self.preview_dir / f"{article_id}.html.{suffix}"
+
+    def meta_path(self, article_id: str) -> Path:
+        """목록용 요약 정보 파일 경로"""
+        return self.preview_dir / f"{article_id}.meta.json"
+
+    def render(self, article: dict) -> str:
+        """이메일과 같은 HTML로 미리보기 렌더링 후 압축 저장"""
+        if self._sender is None:
+            self._sender = EmailSender()
+        html = self._sender._create_email_html(article)
+        data = html.encode("utf-8")
+
+        article_id = article["id"]
+        atomic_write(self.path_for(article_id, "gzip"), gzip.compress(data, compresslevel=9, mtime=0), fsync=False)
+        if brotli is not None:
+            atomic_write(self.path_for(article_id, "br"), brotli.compress(data, quality=11), fsync=False)
+
+        meta = {
+            "id": article_id,
+            "title": article.get("title", ""),
+            "category": article.get("category", ""),
+            "tags": article.get("tags", []),
+            "created_at": article.get("created_at", ""),
+        }
+        # 목록 조회가 meta를 기준으로 하므로 미리보기 파일 뒤에 기록
+        write_json(self.meta_path(article_id), meta, indent=None, fsync=False)
+
+        return html
+
+    def load_meta(self, article_id: str) -> dict | None:
+        """목록용 요약 정보 (없으면 None)"""
+        path = self.meta_path(article_id)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
@@ -0,0 +1,235 @@
+"""
+실행 프로파일링 모듈 (python main.py <명령> --profile cpu|mem|both)
+cProfile 통계, 단계별(parse/render) tracemalloc 상위 할당 위치, flamegraph용 collapsed stack을
+data/profiles/<run_id>/에 저장하고 종료 시 요약 출력
+"""
+import contextlib
+import cProfile
+import io
+import json
+import pstats
+import sys
+import os
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import PROFILING
+from src.storage import unique_id
+
+PROFILES_DIR = Path(__file__).parent.parent / "data" / "profiles"
+PROJECT_ROOT = str(Path(__file__).parent.parent)
+
+# 현재 실행에서 사용 중인 프로파일러 (없으면 None)
+_active = None
+
+# 프로파일러 자신의 할당은 통계에서 제외
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, contextlib.__file__),
+)
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+class _StackSampler(threading.Thread):
+    """메인 스레드 스택을 주기적으로 샘플링해서 collapsed stack으로 집계"""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """실행 1회 분량의 CPU/메모리 프로파일"""
+
+    MODES = ("cpu", "mem", "both")
+
+    def __init__(self, mode: str, run_id: str = None, output_dir: Path = None, config: dict = None):
+        if mode not in self.MODES:
+            raise ValueError(f"알 수 없는 프로파일 모드: {mode}")
+        self.config = {**PROFILING, **(config or {})}
+        self.cpu = mode in ("cpu", "both")
+        self.mem = mode in ("mem", "both")
+        self.run_id = run_id or unique_id()
+        self.output_dir = Path(output_dir or PROFILES_DIR / self.run_id)
+
+        self._profile = None
+        self._sampler = None
+        self._started = 0.0
+        self.elapsed = 0.0
+        # 단계별 메모리: {단계: {"calls", "net", "peak", "sites": Counter}}
+        self.stages = {}
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.mem:
+            tracemalloc.start(self.config["trace_frames"])
+        if self.cpu:
+            self._sampler = _StackSampler(threading.get_ident(), self.config["sample_interval"])
+            self._sampler.start()
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def stop(self) -> Path:
+        """프로파일 종료 후 결과 파일 저장"""
+        if self._profile is not None:
+            self._profile.disable()
+            self._sampler.stop()
+        self.elapsed = time.perf_counter() - self._started
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if self.cpu:
+            self._profile.dump_stats(str(self.output_dir / "cpu.pstats"))
+            report = io.StringIO()
+            pstats.Stats(self._profile, stream=report).sort_stats("cumulative").print_stats(100)
+            (self.output_dir / "cpu.txt").write_text(report.getvalue(), encoding="utf-8")
+            with open(self.output_dir / "stacks.collapsed", "w", encoding="utf-8") as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        if self.mem:
+            self._write_memory_report(_snapshot())
+            tracemalloc.stop()
+        return self.output_dir
+
+    # --- 메모리 ---
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        """단계 구간의 순증가 할당 위치와 최대 사용량 측정"""
+        if not self.mem or not tracemalloc.is_tracing():
+            yield
+            return
+
+        before = _snapshot()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            after = _snapshot()
+            entry = self.stages.setdefault(name, {"calls": 0, "net": 0, "peak": 0, "sites": Counter()})
+            entry["calls"] += 1
+            entry["peak"] = max(entry["peak"], peak - current)
+            for stat in after.compare_to(before, "lineno"):
+                if stat.size_diff > 0:
+                    entry["net"] += stat.size_diff
+                    entry["sites"][str(stat.traceback[0])] += stat.size_diff
+
+    def _write_memory_report(self, final: tracemalloc.Snapshot):
+        top_n = self.config["top_n"]
+        report = {
+            "stages": {
+                name: {
+                    "calls": entry["calls"],
+                    "net_bytes": entry["net"],
+                    "peak_bytes": entry["peak"],
+                    "top_allocators": [
+                        {"site": site, "bytes": size} for site, size in entry["sites"].most_common(top_n)
+                    ],
+                }
+                for name, entry in self.stages.items()
+            },
+            "end_of_run": [
+                {"site": str(stat.traceback[0]), "bytes": stat.size, "count": stat.count}
+                for stat in final.statistics("lineno")[:top_n]
+            ],
+        }
+        with open(self.output_dir / "memory.json", "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    # --- 요약 ---
+
+    def _top_functions(self) -> list[tuple[float, int, str]]:
+        """프로젝트 코드 중 누적 시간 상위 함수"""
+        stats = pstats.Stats(self._profile)
+        rows = []
+        for (filename, lineno, func), (_, calls, _, cumulative, _) in stats.stats.items():
+            if filename.startswith(PROJECT_ROOT) and not filename.endswith("profiler.py"):
+                rows.append((cumulative, calls, f"{os.path.relpath(filename, PROJECT_ROOT)}:{lineno}({func})"))
+        return sorted(rows, reverse=True)[:self.config["top_n"]]
+
+    def print_summary(self):
+        print(f"\n=== 프로파일 요약 ({self.output_dir}) ===")
+        print(f"실행 시간: {self.elapsed:.2f}s")
+
+        if self.cpu:
+            print(f"\n[CPU] 누적 시간 상위 함수 (샘플 {sum(self._sampler.stacks.values())}개)")
+            if self.mem:
+                print("  (both 모드는 메모리 스냅샷 시간이 포함됨, 정확한 시간은 --profile cpu)")
+            for cumulative, calls, name in self._top_functions():
+                print(f"  {cumulative:8.3f}s {calls:>7}회  {name}")
+
+        if self.mem:
+            print("\n[메모리] 단계별 할당")
+            if not self.stages:
+                print("  (측정된 단계 없음)")
+            for name, entry in self.stages.items():
+                print(
+                    f"  {name:<8} {entry['calls']:>4}회  순증가 {entry['net'] / 1024:,.1f}KB"
+                    f"  최대 {entry['peak'] / 1024:,.1f}KB"
+                )
+                for site, size in entry["sites"].most_common(3):
+                    if site.startswith(PROJECT_ROOT):
+                        site = os.path.relpath(site, PROJECT_ROOT)
+                    print(f"           {size / 1024:>9,.1f}KB  {site}")
+
+
+def get_profiler() -> RunProfiler | None:
+    """현재 사용 중인 프로파일러"""
+    return _active
+
+
+def use_profiler(profiler: RunProfiler | None):
+    """프로파일러 활성화 (None이면 해제)"""
+    global _active
+    _active = profiler
+
+
+@contextlib.contextmanager
+def profile_stage(name: str):
+    """단계 구간 표시 (프로파일러가 없으면 아무것도 하지 않음, 데코레이터로도 사용 가능)"""
+    if _active is None:
+        yield
+    else:
+        with _active.stage(name):
+            yield
+
+
+# 테스트: JSON 파싱 반복 프로파일
+if __name__ == "__main__":
+    profiler = RunProfiler("both", output_dir=Path("/tmp/profile_demo"))
+    use_profiler(profiler.start())
+    payload = json.dumps({"content": "<p>본문</p>" * 2000, "tags": ["AI"] * 10}, ensure_ascii=False)
+    for _ in range(200):
+        with profile_stage("parse"):
+            json.loads(payload)
+    use_profiler(None)
+    profiler.stop()
+    profiler.print_summary()
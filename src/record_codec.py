@@ -0,0 +1,353 @@
+"""
+저장 글/캐시 레코드 압축 모듈
+zstandard가 있으면 zstd, 없으면 표준 라이브러리 zlib으로 JSON을 압축 저장하고,
+작은 레코드는 기존 글로 학습한 공용 사전(data/dictionaries/)을 함께 써서 압축률을 높인다.
+gzip/lzma는 선택 코덱으로 지원하고, 예전 평문 JSON(.json)도 그대로 읽는다.
+
+확장자로 형식 구분: .json(평문) .json.zst(zstd) .json.zz(zlib + 사전 ID 헤더) .json.gz .json.xz
+"""
+import gzip
+import json
+import lzma
+import re
+import struct
+import sys
+import os
+import threading
+import zlib
+from pathlib import Path
+
+try:
+    import zstandard
+except ImportError:  # zstandard는 선택 의존성 (없으면 zlib 사용)
+    zstandard = None
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import RECORD_COMPRESSION
+from src.logs import get_logger
+from src.storage import atomic_write, read_json, write_json
+
+logger = get_logger("record_codec")
+
+DICTIONARY_DIR = Path(__file__).parent.parent / "data" / "dictionaries"
+
+# 확장자 → 코덱 (같은 ID의 파일이 여러 형식으로 있으면 앞쪽 형식 우선)
+SUFFIXES = {".json.zst": "zstd", ".json.zz": "zlib", ".json.xz": "lzma", ".json.gz": "gzip", ".json": "none"}
+CODEC_SUFFIXES = {codec: suffix for suffix, codec in SUFFIXES.items()}
+
+# zlib 레코드 헤더: 매직 + 사전 ID (0이면 사전 없음)
+ZLIB_HEADER = struct.Struct("<4sI")
+ZLIB_MAGIC = b"ABZ1"
+# zlib(deflate) 사전은 창 크기(32KB)까지만 의미 있음
+ZLIB_DICT_SIZE = 32 * 1024
+
+# 현재 프로세스에서 공유하는 코덱 (필요할 때 생성)
+_codec = None
+
+
+# --- 파일 이름 ---
+
+def split_record_name(name: str) -> tuple[str, str] | None:
+    """파일 이름 → (레코드 ID, 코덱). 레코드 파일이 아니면(임시 파일 포함) None"""
+    if name.startswith("."):
+        return None
+    for suffix, codec in SUFFIXES.items():
+        if name.endswith(suffix):
+            return name[:-len(suffix)], codec
+    return None
+
+
+def record_id(path) -> str:
+    """레코드 파일 경로 → ID (확장자 제외)"""
+    name = Path(path).name
+    parsed = split_record_name(name)
+    return parsed[0] if parsed else Path(name).stem
+
+
+def list_records(directory) -> dict[str, Path]:
+    """디렉토리의 레코드 ID → 파일 경로 (파일 내용은 읽지 않음)"""
+    priority = {codec: i for i, codec in enumerate(SUFFIXES.values())}
+    found = {}
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return {}
+    for entry in entries:
+        parsed = split_record_name(entry.name)
+        if parsed is None:
+            continue
+        rid, codec = parsed
+        if rid not in found or priority[codec] < priority[found[rid][1]]:
+            found[rid] = (Path(entry.path), codec)
+    return {rid: path for rid, (path, _) in found.items()}
+
+
+def find_record(directory, rid: str) -> Path | None:
+    """ID의 저장 파일 (형식 무관, 없으면 None)"""
+    for suffix in SUFFIXES:
+        path = Path(directory) / f"{rid}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+# --- 사전 학습 ---
+
+def build_zlib_dictionary(samples: list[bytes], size: int = ZLIB_DICT_SIZE) -> bytes:
+    """deflate용 사전: 최근 레코드 원문을 이어 붙인 끝부분 (zstd의 raw content 사전과 같은 방식)
+
+    JSON 키 순서와 자주 쓰는 태그/소제목 표현이 그대로 들어 있어서,
+    공통 조각만 골라 모은 사전보다 측정상 더 작게 압축된다.
+    """
+    return b"".join(samples)[-size:]
+
+
+class RecordCodec:
+    """레코드(dict) ↔ 압축 파일
+
+    사용법:
+        codec = get_codec()
+        path = codec.write(directory, record_id, article)
+        article = codec.read(path)
+    """
+
+    def __init__(self, config: dict = None, dictionary_dir: Path = None):
+        self.config = {**RECORD_COMPRESSION, **(config or {})}
+        self.dictionary_dir = Path(dictionary_dir or DICTIONARY_DIR)
+        self.codec = self.config["codec"]
+        if self.codec == "auto" or (self.codec == "zstd" and zstandard is None):
+            self.codec = "zstd" if zstandard is not None else "zlib"
+        if self.codec not in CODEC_SUFFIXES:
+            raise ValueError(f"알 수 없는 압축 코덱: {self.codec}")
+        self._dictionaries = {}
+        self._current = None
+        self._local = threading.local()  # zstd 압축기는 스레드 간 공유 불가
+
+    @property
+    def suffix(self) -> str:
+        """새로 저장할 파일의 확장자"""
+        return CODEC_SUFFIXES[self.codec]
+
+    # --- 사전 ---
+
+    def _dictionary_path(self, kind: str, dict_id: int) -> Path:
+        return self.dictionary_dir / f"records-{dict_id:08x}.{kind}"
+
+    def _dictionary(self, kind: str, dict_id: int) -> bytes:
+        key = (kind, dict_id)
+        if key not in self._dictionaries:
+            path = self._dictionary_path(kind, dict_id)
+            if not path.exists():
+                raise ValueError(f"압축 사전 없음: {path.name} (data/dictionaries/를 지우면 안 됨)")
+            self._dictionaries[key] = path.read_bytes()
+        return self._dictionaries[key]
+
+    def current_dictionary(self, kind: str) -> int:
+        """새로 저장할 때 쓸 사전 ID (없거나 사전을 끈 경우 0)"""
+        if not self.config["dictionary"]:
+            return 0
+        if self._current is None:
+            self._current = read_json(self.dictionary_dir / "current.json") or {}
+        return self._current.get(kind, 0)
+
+    def train(self, records: list) -> dict:
+        """레코드 샘플로 공용 사전 학습 후 현재 사전으로 지정 (이전 사전은 기존 파일을 읽기 위해 유지)
+
+        Returns:
+            {"zlib": 사전 ID, "zstd": 사전 ID} (zstandard가 없거나 샘플이 부족하면 zstd 없음)
+        """
+        samples = [self._serialize(record) for record in records]
+        trained = {}
+        zlib_dict = build_zlib_dictionary(samples)
+        if zlib_dict:
+            trained["zlib"] = zlib.crc32(zlib_dict) or 1
+            atomic_write(self._dictionary_path("zlib", trained["zlib"]), zlib_dict)
+        if zstandard is not None:
+            try:
+                zstd_dict = zstandard.train_dictionary(self.config["dict_size"], samples)
+            except zstandard.ZstdError as e:
+                logger.warning(f"zstd 사전 학습 실패 (샘플 부족 등): {e}")
+            else:
+                trained["zstd"] = zstd_dict.dict_id()
+                atomic_write(self._dictionary_path("zstd", trained["zstd"]), zstd_dict.as_bytes())
+
+        current = {**(read_json(self.dictionary_dir / "current.json") or {}), **trained}
+        write_json(self.dictionary_dir / "current.json", current)
+        self._current = current
+        self._local = threading.local()
+        return trained
+
+    # --- 인코딩 ---
+
+    @staticmethod
+    def _serialize(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _zstd_compressor(self, dict_id: int):
+        compressors = self._local.__dict__.setdefault("compressors", {})
+        if dict_id not in compressors:
+            dict_data = zstandard.ZstdCompressionDict(self._dictionary("zstd", dict_id)) if dict_id else None
+            compressors[dict_id] = zstandard.ZstdCompressor(level=self.config["levels"]["zstd"], dict_data=dict_data)
+        return compressors[dict_id]
+
+    def _zstd_decompressor(self, dict_id: int):
+        decompressors = self._local.__dict__.setdefault("decompressors", {})
+        if dict_id not in decompressors:
+            dict_data = zstandard.ZstdCompressionDict(self._dictionary("zstd", dict_id)) if dict_id else None
+            decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dict_data)
+        return decompressors[dict_id]
+
+    def encode(self, obj, codec: str = None) -> bytes:
+        """레코드 → 저장 바이트 (평문은 예전과 같은 indent=2 JSON, 압축본은 공백 없는 JSON)"""
+        codec = codec or self.codec
+        if codec == "none":
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+        raw = self._serialize(obj)
+        level = self.config["levels"].get(codec)
+        if codec == "zstd":
+            return self._zstd_compressor(self.current_dictionary("zstd")).compress(raw)
+        if codec == "zlib":
+            dict_id = self.current_dictionary("zlib")
+            if dict_id:
+                compressor = zlib.compressobj(level, zdict=self._dictionary("zlib", dict_id))
+            else:
+                compressor = zlib.compressobj(level)
+            return ZLIB_HEADER.pack(ZLIB_MAGIC, dict_id) + compressor.compress(raw) + compressor.flush()
+        if codec == "gzip":
+            return gzip.compress(raw, compresslevel=level, mtime=0)
+        return lzma.compress(raw, preset=level)
+
+    def decode(self, data: bytes, codec: str):
+        """저장 바이트 → 레코드"""
+        if codec == "zstd":
+            if zstandard is None:
+                raise ValueError("zstd로 압축된 레코드를 읽으려면 zstandard 설치 필요 (pip install zstandard)")
+            dict_id = zstandard.get_frame_parameters(data).dict_id
+            raw = self._zstd_decompressor(dict_id).decompress(data)
+        elif codec == "zlib":
+            magic, dict_id = ZLIB_HEADER.unpack_from(data)
+            if magic != ZLIB_MAGIC:
+                raise ValueError("zlib 레코드 형식이 아님")
+            decompressor = zlib.decompressobj(zdict=self._dictionary("zlib", dict_id)) if dict_id else zlib.decompressobj()
+            raw = decompressor.decompress(data[ZLIB_HEADER.size:]) + decompressor.flush()
+        elif codec == "gzip":
+            raw = gzip.decompress(data)
+        elif codec == "lzma":
+            raw = lzma.decompress(data)
+        else:
+            raw = data
+        return json.loads(raw)
+
+    # --- 파일 ---
+
+    def write(self, directory, rid: str, obj) -> Path:
+        """레코드 저장 (원자적 쓰기, 같은 ID의 다른 형식 파일은 삭제)"""
+        path = Path(directory) / f"{rid}{self.suffix}"
+        atomic_write(path, self.encode(obj))
+        for suffix in SUFFIXES:
+            if suffix != self.suffix:
+                (Path(directory) / f"{rid}{suffix}").unlink(missing_ok=True)
+        return path
+
+    def read(self, path):
+        """레코드 파일 읽기 (확장자로 형식 판단)"""
+        parsed = split_record_name(Path(path).name)
+        codec = parsed[1] if parsed else "none"
+        with open(path, "rb") as f:
+            return self.decode(f.read(), codec)
+
+    def migrate(self, directory) -> tuple[int, int, int]:
+        """디렉토리의 모든 레코드를 현재 코덱/사전으로 다시 저장
+
+        Returns:
+            (레코드 수, 변환 전 바이트, 변환 후 바이트)
+        """
+        count = before = after = 0
+        for rid, path in sorted(list_records(directory).items()):
+            before += path.stat().st_size
+            new_path = self.write(directory, rid, self.read(path))
+            after += new_path.stat().st_size
+            count += 1
+        return count, before, after
+
+
+def get_codec() -> RecordCodec:
+    """현재 프로세스의 레코드 코덱"""
+    global _codec
+    if _codec is None:
+        _codec = RecordCodec()
+    return _codec
+
+
+def read_record(path):
+    """레코드 파일 읽기 (평문/압축 모두)"""
+    return get_codec().read(path)
+
+
+# 테스트: 코덱/사전별 크기와 읽기 시간 비교 (학습과 측정에 서로 다른 글 사용)
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    from src.article_store import ArticleStore
+    from src.content_generator import ContentGenerator
+
+    # 실제 저장 글 + 캐시 글 (글이 적으면 캐시 글의 문단을 섞은 합성 글 추가)
+    articles = list(ArticleStore().iter_articles())
+    articles += [read_record(p).get("article") for p in list_records(ContentGenerator.CACHE_DIR).values()]
+    articles = [a for a in articles if a]
+    source = f"저장 글 {len(articles)}건"
+    if len(articles) < 40:
+        rng = random.Random(0)
+        bases = articles
+        synthetic = []
+        for i in range(200):
+            base = bases[i % len(bases)]
+            paragraphs = re.split(r"(?<=</p>)", base.get("content", ""))
+            rng.shuffle(paragraphs)
+            synthetic.append({**base, "id": f"synthetic_{i:03d}", "title": f"{base.get('title', '')} ({i})",
+                              "content": "".join(paragraphs[:rng.randint(len(paragraphs) // 2, len(paragraphs))])})
+        articles = synthetic
+        source = f"합성 글 {len(articles)}건 (캐시 글 {len(bases)}건 기반, 학습/측정은 원본 글 단위로 분리)"
+
+    # 원본 글이 겹치지 않게 학습/측정 분리
+    if source.startswith("합성"):
+        test_base = len(bases) - 1
+        train = [a for i, a in enumerate(articles) if i % len(bases) != test_base]
+        test = [a for i, a in enumerate(articles) if i % len(bases) == test_base]
+    else:
+        train, test = articles[::2], articles[1::2]
+
+    print(f"=== 레코드 압축 비교: {source}, 측정 {len(test)}건 ===")
+    plain_size = sum(len(json.dumps(a, ensure_ascii=False, indent=2).encode("utf-8")) for a in test)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        RecordCodec(dictionary_dir=Path(tmp) / "dict").train(train)
+
+        cases = [("none", False), ("gzip", False), ("lzma", False), ("zlib", False), ("zlib", True)]
+        if zstandard is not None:
+            cases += [("zstd", False), ("zstd", True)]
+        for codec_name, use_dict in cases:
+            codec = RecordCodec({"codec": codec_name, "dictionary": use_dict}, dictionary_dir=Path(tmp) / "dict")
+            directory = Path(tmp) / f"{codec_name}_{use_dict}"
+            directory.mkdir()
+
+            started = time.perf_counter()
+            for i, a in enumerate(test):
+                codec.write(directory, a.get("id") or f"record_{i:03d}", a)  # 캐시 글에는 id가 없음
+            write_ms = (time.perf_counter() - started) * 1000 / len(test)
+
+            paths = list(list_records(directory).values())
+            size = sum(p.stat().st_size for p in paths)
+            reader = RecordCodec({"codec": codec_name}, dictionary_dir=Path(tmp) / "dict")
+            started = time.perf_counter()
+            for _ in range(5):
+                for p in paths:
+                    reader.read(p)
+            read_ms = (time.perf_counter() - started) * 1000 / (5 * len(paths))
+
+            label = f"{codec_name}{' + 사전' if use_dict else ''}"
+            print(f"{label:<12} {size / 1024:8.1f} KB ({size / plain_size:6.1%})"
+                  f" / 읽기 {read_ms:6.3f} ms / 쓰기 {write_ms:6.3f} ms")
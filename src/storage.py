@@ -0,0 +1,228 @@
+"""
+data/ 저장소 공용 파일 쓰기 모듈
+임시 파일에 쓴 뒤 rename으로 교체(원자적 쓰기), 파일 잠금(advisory lock), 겹치지 않는 파일 이름을 한곳에서 처리
+같은 호스트에서 여러 실행(cron + 수동 실행, 백필 작업 프로세스)이 동시에 돌아도 파일이 깨지거나 덮어써지지 않도록 함
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class LockTimeout(TimeoutError):
+    """제한 시간 안에 잠금을 얻지 못함"""
+
+
+def unique_id(length: int = 6, at: datetime = None) -> str:
+    """생성 시각 + 난수 ID (이름순 정렬 = 생성순, 같은 초에 여러 프로세스가 만들어도 겹치지 않음)"""
+    return f"{(at or datetime.now()).strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:length]}"
+
+
+def temp_path(path) -> Path:
+    """같은 디렉토리의 임시 파일 경로 (프로세스/스레드마다 다르고, 숨김 파일이라 목록 조회에 안 잡힘)"""
+    path = Path(path)
+    return path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.{uuid.uuid4().hex[:6]}.tmp")
+
+
+# --- 원자적 쓰기 ---
+
+@contextmanager
+def atomic_open(path, mode: str = "wb", encoding: str = None, fsync: bool = True):
+    """임시 파일에 쓰고 블록이 정상 종료되면 path로 교체 (예외가 나면 기존 파일 유지)
+
+    읽는 쪽은 항상 이전 내용 전체 또는 새 내용 전체만 본다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if "b" not in mode:
+        encoding = encoding or "utf-8"
+    tmp_path = temp_path(path)
+    try:
+        with open(tmp_path, mode, encoding=encoding) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path, data: bytes | str, fsync: bool = True):
+    """bytes/str 전체를 원자적으로 쓰기"""
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with atomic_open(path, mode, fsync=fsync) as f:
+        f.write(data)
+
+
+def write_json(path, obj, indent: int | None = 2, fsync: bool = True):
+    """JSON 원자적 쓰기 (한글 그대로)"""
+    with atomic_open(path, "w", fsync=fsync) as f:
+        json.dump(obj, f, ensure_ascii=False, indent=indent)
+
+
+def read_json(path, default=None):
+    """JSON 읽기 (파일이 없으면 default)"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+# --- 잠금 ---
+
+def _try_lock(fd: int, shared: bool, blocking: bool) -> bool:
+    if fcntl is not None:
+        flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            return False
+        return True
+    # Windows는 공유 잠금이 없어서 배타 잠금으로 처리 (대기도 직접 반복)
+    try:
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path, shared: bool = False, timeout: float = None, poll: float = 0.02):
+    """path에 대한 advisory 잠금 (옆에 <이름>.lock 파일 사용)
+
+    데이터 파일은 rename으로 교체되므로 잠금은 따로 둔 .lock 파일에 건다.
+    timeout=None이면 얻을 때까지 대기, 0이면 한 번만 시도하고 실패 시 LockTimeout.
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        blocking = timeout is None and fcntl is not None
+        deadline = time.monotonic() + (timeout or 0)
+        while not _try_lock(fd, shared, blocking):
+            if timeout is not None and time.monotonic() >= deadline:
+                raise LockTimeout(f"잠금 대기 시간 초과: {lock_path}")
+            time.sleep(poll)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def locked_json(path, default=dict, timeout: float = None, indent: int | None = 2):
+    """잠금 안에서 JSON 읽기 → 수정 → 원자적 저장 (다른 프로세스가 그사이 쓴 내용을 덮어쓰지 않음)
+
+    사용법:
+        with locked_json(path) as data:
+            data["count"] = data.get("count", 0) + 1
+
+    블록에서 예외가 나면 저장하지 않는다.
+    """
+    with file_lock(path, timeout=timeout):
+        data = read_json(path)
+        if data is None:
+            data = default()
+        yield data
+        write_json(path, data, indent=indent)
+
+
+def claim_file(path) -> Path | None:
+    """파일을 rename으로 선점 (여러 프로세스 중 한 곳만 성공, 실패하면 None)"""
+    path = Path(path)
+    claimed = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:6]}.claimed")
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return None
+    return claimed
+
+
+# 테스트: 여러 프로세스가 동시에 같은 파일을 고치고 쓰는 상황에서 유실/깨짐 확인
+if __name__ == "__main__":
+    import multiprocessing
+    import sys
+    import tempfile
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.article_store import ArticleStore
+    from src.model_router import ModelRouter
+
+    PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    def unsafe_increment(path: Path):
+        data = read_json(path, {"count": 0})
+        data["count"] += 1
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    def worker(root: str, worker_id: int, ids):
+        root = Path(root)
+        store = ArticleStore(root / "articles")
+        router = ModelRouter(routes={}, stats_path=root / "model_stats.json")
+        for i in range(ROUNDS):
+            with locked_json(root / "counter.json") as data:
+                data["count"] = data.get("count", 0) + 1
+            try:
+                unsafe_increment(root / "unsafe.json")
+            except ValueError:
+                pass  # 다른 프로세스가 쓰는 도중의 파일을 읽음 (잠금/원자적 쓰기 없이 생기는 문제)
+            # 큰 파일을 계속 덮어써도 읽는 쪽은 항상 완전한 내용만 봐야 함
+            write_json(root / "shared.json", {"writer": worker_id, "payload": "가" * (20_000 + i)}, fsync=False)
+            read_json(root / "shared.json")["payload"]
+            ids.append(store.save({"title": f"{worker_id}-{i}"}))
+            router._record("unified", "test-model", 0.01)
+
+    with tempfile.TemporaryDirectory() as tmp, multiprocessing.Manager() as manager:
+        ids = manager.list()
+        started = time.perf_counter()
+        processes = [multiprocessing.Process(target=worker, args=(tmp, n, ids)) for n in range(PROCESSES)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        elapsed = time.perf_counter() - started
+
+        expected = PROCESSES * ROUNDS
+        root = Path(tmp)
+        articles = ArticleStore(root / "articles").list_files()  # 압축 형식과 관계없이 저장된 글
+        calls = read_json(root / "model_stats.json")["routes"]["unified"]["test-model"]["calls"]
+        leftovers = [p.name for p in root.rglob("*.tmp")]
+        unsafe = (read_json(root / "unsafe.json") or {}).get("count", 0) if (root / "unsafe.json").stat().st_size else 0
+
+        print(f"=== {PROCESSES}개 프로세스 x {ROUNDS}회 ({elapsed:.2f}초) ===")
+        print(f"잠금 카운터      {read_json(root / 'counter.json')['count']:>6} / {expected}")
+        print(f"잠금 없는 카운터 {unsafe:>6} / {expected} (비교용)")
+        print(f"글 저장          {len(articles):>6} / {expected} (ID 중복 {len(ids) - len(set(ids))}건)")
+        print(f"모델 통계 호출 수 {calls:>5} / {expected}")
+        print(f"남은 임시 파일   {len(leftovers):>6}")
+        for path in articles:
+            ArticleStore.load_file(path)  # 모두 완전한 JSON
+        assert read_json(root / "counter.json")["count"] == expected
+        assert len(articles) == expected == len(set(ids))
+        assert calls == expected and not leftovers
+        print("OK")
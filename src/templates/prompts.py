@@ -13,6 +13,27 @@ CHANGE_SUB_TITLE_PROMPT = """
 {article_content}
 """
 
+CHANGE_SUB_TITLE_JSON_PROMPT = """
+당신은 구글 애드센스에 최적화된 글을 작성하는 티스토리 블로거입니다.
+아래는 블로그 글의 제목과 소제목(h2, h3) 목록이다. 각 소제목을 ‘검색 의도’가 느껴지게 변경해라.
+소제목 순서와 개수는 유지하고, 바꿀 필요가 없는 소제목은 결과에서 빼라.
+
+## 글 제목
+{title}
+
+## 소제목 목록
+{headings}
+
+## 출력 형식 (JSON)
+```json
+{{
+    "기존 소제목": "새 소제목"
+}}
+```
+
+JSON만 출력하라.
+"""
+
 UNIFIED_ARTICLE_PROMPT = """
 아래는 Google News RSS에서 수집한 최근 기사 제목들이다.
 
@@ -150,6 +171,23 @@ JSON만 출력하라.
 """
 
 
+# 최근에 다룬 주제와 겹칠 때 통합 프롬프트 뒤에 붙이는 제외 힌트
+AVOID_TOPICS_HINT = """
+
+## 제외할 주제
+아래 주제는 최근에 이미 글로 다뤘다. 같은 주제나 비슷한 제목은 피하고, 다른 키워드/관점으로 주제를 선정하라.
+{topics}
+"""
+
+# 상위 헤드라인 본문 발췌 (collect_news_titles(enrich=True)의 enriched)
+ENRICHED_CONTEXT_HINT = """
+
+## 주요 기사 본문 발췌
+아래는 상위 헤드라인 기사의 본문 일부다. 주제 선정과 본문 작성 시 사실 확인용으로 참고하되, 문장을 그대로 옮기지 마라.
+{articles}
+"""
+
+
 # ============================================================
 # 체험형 글 프롬프트
 # ============================================================
@@ -223,3 +261,33 @@ EXPERIENCE_ARTICLE_PROMPT = """
 
 JSON만 출력하세요.
 """
+
+
+# ============================================================
+# 글 보정 프롬프트 (검증 기준 미달 시)
+# ============================================================
+
+REPAIR_ARTICLE_PROMPT = """
+당신은 구글 애드센스에 최적화된 글을 작성하는 티스토리 블로거다.
+아래 글은 품질 기준을 통과하지 못했다. 지적된 문제만 고치고 나머지 내용과 문체는 최대한 유지하라.
+
+## 기준
+- 본문 텍스트 {min_length}~{max_length}자 (HTML 태그 제외)
+- 대표 키워드 '{main_keyword}'를 자연스럽게 반복 (전체 단어의 약 {keyword_density:.1%})
+- h2 소제목 {min_headings}개 이상, 첫 소제목은 h2
+
+## 문제 목록
+{issues}
+
+## 글 (HTML)
+{article_content}
+
+## 출력 형식 (JSON)
+```json
+{{
+    "content": "<h2>...</h2><p>...</p>..."
+}}
+```
+
+JSON만 출력하라.
+"""
@@ -1,16 +1,52 @@
 """
 Pollinations.ai를 사용한 무료 썸네일 생성 모듈
+원격 생성이 느리거나 실패하면 로컬 렌더러(thumbnail_renderer)로 즉시 대체
+원본은 내용 해시 파일명으로 한 번만 저장하고, 블로그/이메일용 축소본(WebP/JPEG)은 백그라운드 스레드에서 생성
 """
+import hashlib
 import os
+import threading
+import time
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import quote
-from datetime import datetime
 import sys
 
+try:
+    from PIL import Image
+except ImportError:  # Pillow는 선택 의존성 (없으면 축소본 없이 원본 사용)
+    Image = None
+
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import CATEGORIES, THUMBNAIL
+from src.health import CircuitOpenError, get_health
+from src.logs import get_logger
+from src.storage import atomic_open, atomic_write, temp_path
+from src.thumbnail_renderer import render_thumbnail
+
+logger = get_logger("thumbnail_generator")
 
 # 썸네일 저장 경로
 THUMBNAIL_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "thumbnails")
+# 로컬 렌더링 캐시 (프롬프트 해시별)
+LOCAL_THUMBNAIL_DIR = os.path.join(THUMBNAIL_DIR, "local")
+
+# 응답 Content-Type → 확장자
+IMAGE_EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg", "image/webp": ".webp"}
+# 축소본 포맷 → 확장자
+VARIANT_EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg"}
+
+# 축소본 생성용 스레드 (프로세스에 하나, 요청 흐름을 막지 않음)
+_variant_executor = None
+_variant_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _variant_executor
+    with _variant_lock:
+        if _variant_executor is None:
+            _variant_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnail-variants")
+        return _variant_executor
 
 
 class ThumbnailGenerator:
@@ -26,8 +62,25 @@ class ThumbnailGenerator:
         "no text, no letters, no words, no watermark, no people, no humans, no faces"
     )
 
-    def __init__(self):
+    # 카테고리별 추가 스타일 (로컬 렌더러 색상도 같은 톤 사용)
+    CATEGORY_STYLES = {
+        "ai": "futuristic, neural network visualization, blue and purple tones",
+        "health": "wellness, healthy lifestyle, fresh and clean, green and white tones",
+        "economy": "business, finance, growth charts, professional, gold and navy tones",
+        "lifestyle": "cozy home, modern living, warm and comfortable, neutral tones",
+    }
+
+    def __init__(self, config: dict = None):
+        self.config = {**THUMBNAIL, **(config or {})}
         os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        # 글에는 카테고리 이름("AI/인공지능")이 저장되므로 키로 변환
+        self._name_to_key = {info["name"]: key for key, info in CATEGORIES.items()}
+
+    def _category_key(self, category: str) -> str:
+        category = (category or "").strip()
+        if category.lower() in self.CATEGORY_STYLES:
+            return category.lower()
+        return self._name_to_key.get(category, "")
 
     def _translate_to_english(self, title: str, tags: list[str]) -> str:
         """제목과 태그를 영어 키워드로 변환 (간단한 매핑)"""
@@ -102,15 +155,7 @@ class ThumbnailGenerator:
         """이미지 생성용 프롬프트 구성"""
         keywords = self._translate_to_english(title, tags)
 
-        # 카테고리별 추가 스타일
-        category_style = {
-            "ai": "futuristic, neural network visualization, blue and purple tones",
-            "health": "wellness, healthy lifestyle, fresh and clean, green and white tones",
-            "economy": "business, finance, growth charts, professional, gold and navy tones",
-            "lifestyle": "cozy home, modern living, warm and comfortable, neutral tones",
-        }
-
-        extra_style = category_style.get(category.lower(), "modern, professional")
+        extra_style = self.CATEGORY_STYLES.get(self._category_key(category), "modern, professional")
 
         prompt = f"{keywords}, {extra_style}, {self.STYLE_PROMPT}"
         return prompt
@@ -124,30 +169,134 @@ class ThumbnailGenerator:
         url = f"{self.BASE_URL}/{encoded_prompt}?width=1024&height=1024&nologo=true"
         return url
 
-    def download_thumbnail(self, title: str, tags: list[str], category: str = "", filename: str = None) -> str:
-        """썸네일 이미지 다운로드 및 저장"""
-        url = self.generate_thumbnail_url(title, tags, category)
+    def render_local(self, title: str, tags: list[str], category: str = "") -> str:
+        """로컬 썸네일 렌더링 (같은 프롬프트면 캐시된 파일 재사용, 파일 경로 반환)"""
+        prompt = self._build_prompt(title, tags, category)
+        digest = hashlib.sha1(f"{self.config['size']}:{prompt}".encode("utf-8")).hexdigest()[:16]
+        filepath = os.path.join(LOCAL_THUMBNAIL_DIR, f"{digest}.png")
+        if os.path.exists(filepath):
+            return filepath
 
-        # 파일명 생성
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"thumbnail_{timestamp}.png"
+        png = render_thumbnail(self._category_key(category), seed=prompt, size=self.config["size"])
+        # 동시에 같은 썸네일을 만들어도 깨진 파일이 보이지 않도록 임시 파일 후 교체
+        atomic_write(filepath, png, fsync=False)
+        self.create_variants(filepath)
+        return filepath
 
-        filepath = os.path.join(THUMBNAIL_DIR, filename)
+    def get_thumbnail(self, title: str, tags: list[str], category: str = "") -> str:
+        """설정(default)에 따라 로컬 렌더링 또는 원격 다운로드 (원격 실패 시 로컬)"""
+        if self.config["default"] == "local":
+            return self.render_local(title, tags, category)
+        return self.download_thumbnail(title, tags, category)
 
-        try:
-            response = requests.get(url, timeout=60)
-            response.raise_for_status()
+    def download_thumbnail(
+        self,
+        title: str,
+        tags: list[str],
+        category: str = "",
+        filename: str = None,
+        fallback: bool = True,
+    ) -> str:
+        """썸네일 이미지를 조금씩 받아 바로 디스크에 저장 (실패하면 fallback=True일 때 로컬 렌더링 경로 반환)
 
-            with open(filepath, "wb") as f:
-                f.write(response.content)
+        파일명을 주지 않으면 내용 해시로 저장해서 같은 이미지는 한 번만 남는다.
+        """
+        health = get_health()
+        if not health.allow("pollinations"):
+            # 최근 연속 실패 → 시간 초과를 기다리지 않고 바로 대체
+            error = CircuitOpenError("pollinations", health.retry_in("pollinations"))
+            return self._download_failed(error, title, tags, category, fallback)
 
-            print(f"썸네일 저장 완료: {filepath}")
-            return filepath
+        url = self.generate_thumbnail_url(title, tags, category)
+        os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+        # 파일명은 내용 해시로 정하므로 다 받을 때까지 임시 파일에 씀
+        tmp_path = temp_path(os.path.join(THUMBNAIL_DIR, "download"))
+        digest = hashlib.sha256()
+        deadline = time.monotonic() + self.config["remote_timeout"]
 
+        try:
+            with requests.get(url, timeout=self.config["remote_timeout"], stream=True) as response:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.config["chunk_size"]):
+                        # timeout은 읽기 한 번 기준이라 전체 대기 시간은 따로 확인
+                        if time.monotonic() > deadline:
+                            raise requests.Timeout(f"{self.config['remote_timeout']}초 안에 다운로드하지 못함")
+                        digest.update(chunk)
+                        f.write(chunk)
         except requests.RequestException as e:
-            print(f"썸네일 다운로드 실패: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            health.record_failure("pollinations", e)
+            return self._download_failed(e, title, tags, category, fallback)
+        health.record_success("pollinations")
+
+        content_named = filename is None
+        if content_named:
+            filename = f"thumbnail_{digest.hexdigest()[:16]}{IMAGE_EXTENSIONS.get(content_type, '.png')}"
+        filepath = os.path.join(THUMBNAIL_DIR, filename)
+        if content_named and os.path.exists(filepath):
+            os.remove(tmp_path)
+            logger.info(f"같은 썸네일이 이미 있음: {filepath}")
+        else:
+            os.replace(tmp_path, filepath)
+            logger.info(f"썸네일 저장 완료: {filepath}")
+
+        self.create_variants(filepath)
+        return filepath
+
+    def _download_failed(self, error: Exception, title: str, tags: list[str], category: str, fallback: bool) -> str:
+        if not fallback:
+            logger.warning(f"썸네일 다운로드 실패: {error}")
             return ""
+        logger.warning(f"썸네일 다운로드 실패, 로컬 썸네일 사용: {error}")
+        return self.render_local(title, tags, category)
+
+    # --- 축소본 ---
+
+    def variant_paths(self, path: str) -> dict[str, str]:
+        """축소본 경로 (원본 파일명 기준이라 원본이 같으면 축소본도 한 번만 생성)"""
+        stem = os.path.splitext(path)[0]
+        return {
+            name: f"{stem}_{name}{VARIANT_EXTENSIONS[spec['format']]}"
+            for name, spec in self.config["variants"].items()
+        }
+
+    def _write_variants(self, path: str) -> dict[str, str]:
+        paths = self.variant_paths(path)
+        missing = {name: out for name, out in paths.items() if not os.path.exists(out)}
+        if missing:
+            largest = max(self.config["variants"][name]["size"] for name in missing)
+            try:
+                with Image.open(path) as source:
+                    # JPEG 원본은 필요한 크기 근처로만 디코딩
+                    source.draft("RGB", (largest, largest))
+                    source = source.convert("RGB")
+                    for name, out in missing.items():
+                        spec = self.config["variants"][name]
+                        image = source.copy()
+                        image.thumbnail((spec["size"], spec["size"]), Image.LANCZOS)
+                        with atomic_open(out, "wb", fsync=False) as f:
+                            image.save(f, format=spec["format"].upper(), quality=spec["quality"], optimize=True)
+            except OSError as e:
+                logger.warning(f"썸네일 축소본 생성 실패 (원본 사용): {e}")
+                return {}
+        return paths
+
+    def create_variants(self, path: str) -> Future:
+        """블로그/이메일용 축소본을 백그라운드에서 생성 (결과: {이름: 경로}, Pillow가 없으면 {})"""
+        if Image is None or not self.config["variants"]:
+            future = Future()
+            future.set_result({})
+            return future
+        return _executor().submit(self._write_variants, path)
+
+    def variant(self, path: str, name: str) -> str:
+        """축소본 경로 (생성 중이면 기다림, 만들 수 없으면 원본 경로)"""
+        if not path:
+            return path
+        return self.create_variants(path).result().get(name, path)
 
 
 # 테스트
@@ -164,8 +313,19 @@ if __name__ == "__main__":
     print(f"\n=== 썸네일 URL ===")
     print(url)
 
+    # 로컬 렌더링 테스트
+    print("\n=== 로컬 썸네일 ===")
+    print(generator.render_local(test_title, test_tags, test_category))
+
     # 다운로드 테스트
     print(f"\n=== 썸네일 다운로드 ===")
     filepath = generator.download_thumbnail(test_title, test_tags, test_category)
     if filepath:
         print(f"저장 위치: {filepath}")
+
+    # 축소본 테스트 (Pillow 설치 시)
+    print("\n=== 축소본 ===")
+    for name in generator.config["variants"]:
+        variant = generator.variant(filepath, name)
+        print(f"{name:<6} {os.path.getsize(variant) / 1024:7.1f} KB  {variant}")
+    print(f"원본   {os.path.getsize(filepath) / 1024:7.1f} KB  {filepath}")
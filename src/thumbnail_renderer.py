@@ -0,0 +1,227 @@
+"""
+로컬 썸네일 렌더러 (표준 라이브러리만 사용, zlib PNG)
+카테고리별 색상(그라디언트 배경 + 장식 원 + 아이콘)으로 1024x1024 썸네일을 즉시 생성
+외부 이미지 서비스가 느리거나 실패할 때의 기본값/대체용
+"""
+import math
+import struct
+import zlib
+from random import Random
+
+# 카테고리별 색상 (ThumbnailGenerator.CATEGORY_STYLES의 톤과 맞춤)
+# background: 위 → 아래 그라디언트, accents: 장식 원, icon: 아이콘, card: 아이콘 뒤 원
+CATEGORY_PALETTES = {
+    "ai": {  # blue and purple tones
+        "background": ((24, 24, 72), (76, 29, 149)),
+        "accents": ((96, 165, 250), (167, 139, 250), (56, 189, 248)),
+        "card": (49, 46, 129),
+        "icon": (224, 231, 255),
+    },
+    "health": {  # green and white tones
+        "background": ((240, 253, 244), (167, 243, 208)),
+        "accents": ((52, 211, 153), (255, 255, 255), (110, 231, 183)),
+        "card": (255, 255, 255),
+        "icon": (5, 150, 105),
+    },
+    "economy": {  # gold and navy tones
+        "background": ((15, 23, 42), (30, 58, 138)),
+        "accents": ((234, 179, 8), (250, 204, 21), (59, 130, 246)),
+        "card": (23, 37, 84),
+        "icon": (250, 204, 21),
+    },
+    "lifestyle": {  # warm neutral tones
+        "background": ((250, 245, 235), (231, 211, 186)),
+        "accents": ((251, 191, 36), (217, 119, 6), (255, 255, 255)),
+        "card": (255, 251, 245),
+        "icon": (146, 64, 14),
+    },
+    "default": {
+        "background": ((241, 245, 249), (203, 213, 225)),
+        "accents": ((148, 163, 184), (100, 116, 139), (255, 255, 255)),
+        "card": (255, 255, 255),
+        "icon": (51, 65, 85),
+    },
+}
+
+
+def _mix(a: tuple, b: tuple, t: float) -> tuple:
+    return tuple(round(x + (y - x) * t) for x, y in zip(a, b))
+
+
+class Canvas:
+    """행(row) 단위 스팬 채우기 방식의 간단한 RGB 캔버스
+
+    픽셀 하나씩 칠하지 않고 행마다 [x0, x1) 구간을 bytes 슬라이스로 채워서
+    순수 파이썬으로도 1024x1024를 빠르게 그린다.
+    """
+
+    def __init__(self, width: int, height: int, top: tuple, bottom: tuple):
+        self.width = width
+        self.height = height
+        # 세로 그라디언트 배경 (행마다 단색이므로 반투명 합성 기준색으로도 사용)
+        self.base = [_mix(top, bottom, y / max(height - 1, 1)) for y in range(height)]
+        self.rows = [bytearray(bytes(color) * width) for color in self.base]
+
+    def _fill(self, y: int, x0: float, x1: float, color: tuple, alpha: float):
+        if not 0 <= y < self.height:
+            return
+        x0 = max(int(round(x0)), 0)
+        x1 = min(int(round(x1)), self.width)
+        if x1 <= x0:
+            return
+        pixel = bytes(color if alpha >= 1 else _mix(self.base[y], color, alpha))
+        self.rows[y][x0 * 3:x1 * 3] = pixel * (x1 - x0)
+
+    def rect(self, x0: float, y0: float, x1: float, y1: float, color: tuple, alpha: float = 1.0):
+        for y in range(max(int(y0), 0), min(int(y1), self.height)):
+            self._fill(y, x0, x1, color, alpha)
+
+    def circle(self, cx: float, cy: float, r: float, color: tuple, alpha: float = 1.0):
+        for y in range(max(int(cy - r), 0), min(int(cy + r) + 1, self.height)):
+            dy = y + 0.5 - cy
+            if abs(dy) <= r:
+                dx = math.sqrt(r * r - dy * dy)
+                self._fill(y, cx - dx, cx + dx, color, alpha)
+
+    def ring(self, cx: float, cy: float, r: float, width: float, color: tuple, alpha: float = 1.0):
+        inner = r - width
+        for y in range(max(int(cy - r), 0), min(int(cy + r) + 1, self.height)):
+            dy = y + 0.5 - cy
+            if abs(dy) > r:
+                continue
+            outer_dx = math.sqrt(r * r - dy * dy)
+            if abs(dy) >= inner:
+                self._fill(y, cx - outer_dx, cx + outer_dx, color, alpha)
+            else:
+                inner_dx = math.sqrt(inner * inner - dy * dy)
+                self._fill(y, cx - outer_dx, cx - inner_dx, color, alpha)
+                self._fill(y, cx + inner_dx, cx + outer_dx, color, alpha)
+
+    def polygon(self, points: list[tuple], color: tuple, alpha: float = 1.0):
+        """볼록 다각형 채우기 (행마다 변과의 교점 최소/최대 구간)"""
+        ys = [p[1] for p in points]
+        edges = list(zip(points, points[1:] + points[:1]))
+        for y in range(max(int(min(ys)), 0), min(int(max(ys)) + 1, self.height)):
+            sy = y + 0.5
+            xs = []
+            for (ax, ay), (bx, by) in edges:
+                if (ay <= sy < by) or (by <= sy < ay):
+                    xs.append(ax + (sy - ay) * (bx - ax) / (by - ay))
+            if len(xs) >= 2:
+                self._fill(y, min(xs), max(xs), color, alpha)
+
+    def line(self, x0: float, y0: float, x1: float, y1: float, width: float, color: tuple, alpha: float = 1.0):
+        """두께 있는 선 (사각형 다각형으로 채움)"""
+        length = math.hypot(x1 - x0, y1 - y0) or 1.0
+        nx, ny = -(y1 - y0) / length * width / 2, (x1 - x0) / length * width / 2
+        self.polygon([(x0 + nx, y0 + ny), (x1 + nx, y1 + ny), (x1 - nx, y1 - ny), (x0 - nx, y0 - ny)], color, alpha)
+
+    def to_png(self) -> bytes:
+        """PNG 인코딩 (8비트 RGB, 행 필터 없음)"""
+        raw = b"".join(b"\x00" + bytes(row) for row in self.rows)
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b"")
+
+
+# --- 카테고리별 아이콘 (중심 c, 크기 s 기준) ---
+
+def _icon_ai(canvas: Canvas, c: float, s: float, color: tuple):
+    """신경망: 3-4-3 노드와 연결선"""
+    layers = [
+        [(c - s * 0.6, c + (i - 1) * s * 0.45) for i in range(3)],
+        [(c, c + (i - 1.5) * s * 0.4) for i in range(4)],
+        [(c + s * 0.6, c + (i - 1) * s * 0.45) for i in range(3)],
+    ]
+    for left, right in zip(layers, layers[1:]):
+        for ax, ay in left:
+            for bx, by in right:
+                canvas.line(ax, ay, bx, by, s * 0.025, color, 0.55)
+    for layer in layers:
+        for x, y in layer:
+            canvas.circle(x, y, s * 0.09, color)
+
+
+def _icon_health(canvas: Canvas, c: float, s: float, color: tuple):
+    """십자 + 고리"""
+    canvas.ring(c, c, s * 0.75, s * 0.07, color, 0.6)
+    arm, thick = s * 0.5, s * 0.17
+    canvas.rect(c - thick, c - arm, c + thick, c + arm, color)
+    canvas.rect(c - arm, c - thick, c + arm, c + thick, color)
+
+
+def _icon_economy(canvas: Canvas, c: float, s: float, color: tuple):
+    """막대 그래프 + 상승 화살표"""
+    base_y = c + s * 0.55
+    for i, height in enumerate((0.35, 0.55, 0.75, 1.0)):
+        x = c - s * 0.6 + i * s * 0.33
+        canvas.rect(x, base_y - height * s * 0.9, x + s * 0.22, base_y, color, 0.85)
+    canvas.line(c - s * 0.65, c + s * 0.15, c + s * 0.45, c - s * 0.55, s * 0.07, color)
+    canvas.polygon([(c + s * 0.65, c - s * 0.75), (c + s * 0.3, c - s * 0.68), (c + s * 0.58, c - s * 0.4)], color)
+
+
+def _icon_lifestyle(canvas: Canvas, c: float, s: float, color: tuple, background: tuple):
+    """집: 지붕 + 몸체 + 문"""
+    canvas.polygon([(c - s * 0.75, c - s * 0.05), (c, c - s * 0.7), (c + s * 0.75, c - s * 0.05)], color)
+    canvas.rect(c - s * 0.55, c - s * 0.05, c + s * 0.55, c + s * 0.65, color)
+    canvas.rect(c - s * 0.14, c + s * 0.2, c + s * 0.14, c + s * 0.65, background)
+
+
+def _icon_default(canvas: Canvas, c: float, s: float, color: tuple):
+    for i in range(3):
+        canvas.ring(c, c, s * (0.75 - i * 0.25), s * 0.07, color, 1.0 - i * 0.2)
+
+
+def render_thumbnail(category: str, seed: str = "", size: int = 1024) -> bytes:
+    """카테고리 스타일 썸네일 PNG (같은 seed면 같은 이미지)"""
+    palette = CATEGORY_PALETTES.get(category, CATEGORY_PALETTES["default"])
+    top, bottom = palette["background"]
+    canvas = Canvas(size, size, top, bottom)
+    rng = Random(seed)
+
+    # 장식 원 (seed에 따라 위치/크기/색 변화)
+    for _ in range(rng.randint(6, 9)):
+        r = rng.uniform(0.06, 0.22) * size
+        canvas.circle(
+            rng.uniform(-0.05, 1.05) * size,
+            rng.uniform(-0.05, 1.05) * size,
+            r,
+            rng.choice(palette["accents"]),
+            rng.uniform(0.12, 0.3),
+        )
+    for _ in range(rng.randint(10, 16)):
+        canvas.circle(rng.uniform(0, size), rng.uniform(0, size), rng.uniform(4, 10) * size / 1024,
+                      rng.choice(palette["accents"]), 0.6)
+
+    # 가운데 아이콘
+    c, s = size / 2, size * 0.24
+    canvas.circle(c, c, s * 1.35, palette["card"], 0.9)
+    if category == "ai":
+        _icon_ai(canvas, c, s, palette["icon"])
+    elif category == "health":
+        _icon_health(canvas, c, s, palette["icon"])
+    elif category == "economy":
+        _icon_economy(canvas, c, s, palette["icon"])
+    elif category == "lifestyle":
+        _icon_lifestyle(canvas, c, s, palette["icon"], palette["card"])
+    else:
+        _icon_default(canvas, c, s, palette["icon"])
+
+    return canvas.to_png()
+
+
+# 테스트: 카테고리별 렌더링 시간 측정 후 /tmp에 저장
+if __name__ == "__main__":
+    import time
+
+    for category in ("ai", "health", "economy", "lifestyle", "default"):
+        start = time.perf_counter()
+        png = render_thumbnail(category, seed="test")
+        elapsed = (time.perf_counter() - start) * 1000
+        path = f"/tmp/thumbnail_{category}.png"
+        with open(path, "wb") as f:
+            f.write(png)
+        print(f"{category:<10} {elapsed:6.1f} ms / {len(png) / 1024:6.1f} KB → {path}")
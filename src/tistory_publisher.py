@@ -0,0 +1,363 @@
+"""
+티스토리 Open API 비동기 발행 모듈
+httpx.AsyncClient 연결 풀을 공유하며, 속도 제한 안에서 승인된 글을 동시에 발행
+"""
+import asyncio
+import hashlib
+import json
+import mimetypes
+import random
+import sys
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import TISTORY_ACCESS_TOKEN, TISTORY_BLOG_NAME, TISTORY_PUBLISH
+from src.storage import write_json
+from src.thumbnail_generator import ThumbnailGenerator
+
+
+class PublishError(Exception):
+    """발행 실패 (재시도 후에도 실패한 경우)"""
+
+
+class _RateLimiter:
+    """초당 요청 수 제한 (비동기)"""
+
+    def __init__(self, rate_per_sec: float):
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class TistoryPublisher:
+    """httpx 연결 풀 기반 티스토리 발행기
+
+    사용법:
+        async with TistoryPublisher() as publisher:
+            results = await publisher.publish_many(articles)
+    """
+
+    PUBLISHED_DIR = Path(__file__).parent.parent / "data" / "published"
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        access_token: str = None,
+        blog_name: str = None,
+        api_url: str = None,
+        published_dir: Path = None,
+        config: dict = None,
+    ):
+        self.config = {**TISTORY_PUBLISH, **(config or {})}
+        self.access_token = access_token or TISTORY_ACCESS_TOKEN
+        self.blog_name = blog_name or TISTORY_BLOG_NAME
+        self.api_url = (api_url or self.config["api_url"]).rstrip("/")
+        self.published_dir = Path(published_dir or self.PUBLISHED_DIR)
+        self.published_dir.mkdir(parents=True, exist_ok=True)
+        self.thumbnail_generator = ThumbnailGenerator()
+
+        self._client = None
+        self._limiter = _RateLimiter(self.config["rate_per_sec"])
+        self._semaphore = asyncio.Semaphore(self.config["max_concurrency"])
+        self._in_flight = {}
+
+    async def __aenter__(self):
+        if not self.access_token:
+            raise ValueError("TISTORY_ACCESS_TOKEN이 설정되지 않았습니다.")
+        limits = httpx.Limits(
+            max_connections=self.config["max_concurrency"] * 2,
+            max_keepalive_connections=self.config["max_concurrency"],
+        )
+        self._client = httpx.AsyncClient(timeout=self.config["timeout"], limits=limits, follow_redirects=True)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        self._client = None
+
+    # --- 멱등성 ---
+
+    @staticmethod
+    def idempotency_key(article: dict) -> str:
+        """글 ID + 제목 + 본문 기반 멱등 키 (같은 글은 한 번만 발행)"""
+        content = f"{article.get('id', '')}\x00{article.get('title', '')}\x00{article.get('content', '')}"
+        return hashlib.sha256(content.encode()).hexdigest()[:32]
+
+    def _record_path(self, article_id: str) -> Path:
+        return self.published_dir / f"{article_id}.json"
+
+    def get_record(self, article_id: str) -> dict | None:
+        """발행 기록 (없으면 미발행)"""
+        path = self._record_path(article_id)
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_record(self, record: dict):
+        write_json(self._record_path(record["id"]), record)
+
+    # --- HTTP ---
+
+    async def _request(self, method: str, path: str, retry: bool = True, **kwargs) -> dict:
+        """속도 제한 + 지수 백오프 재시도가 적용된 API 요청
+
+        retry=False면 한 번만 보냄 (글 작성/수정처럼 응답을 못 받아도 서버에는 반영됐을 수 있는 요청)
+        """
+        url = f"{self.api_url}{path}"
+        params = {"access_token": self.access_token, "output": "json", **kwargs.pop("params", {})}
+        last_error = None
+        attempts = self.config["max_retries"] + 1 if retry else 1
+
+        for attempt in range(attempts):
+            if attempt:
+                # 지수 백오프 + 지터
+                await asyncio.sleep(min(2 ** attempt, 30) * (0.5 + random.random() / 2))
+            await self._limiter.wait()
+            try:
+                response = await self._client.request(method, url, params=params, **kwargs)
+            except httpx.TransportError as e:
+                last_error = e
+                continue
+
+            if response.status_code in self.RETRY_STATUS:
+                last_error = PublishError(f"HTTP {response.status_code}: {response.text[:200]}")
+                continue
+            if response.status_code >= 400:
+                raise PublishError(f"HTTP {response.status_code}: {response.text[:200]}")
+
+            data = response.json().get("tistory", {})
+            if str(data.get("status")) != "200":
+                raise PublishError(f"티스토리 API 오류: {data.get('error_message', data)}")
+            return data
+
+        if not retry:
+            raise PublishError(f"요청 실패 (재시도하지 않음): {last_error}")
+        raise PublishError(f"재시도 {self.config['max_retries']}회 실패: {last_error}")
+
+    async def find_post(self, title: str, since: str) -> dict | None:
+        """최근 글 목록에서 since(ISO 시각) 날짜 이후에 올라온 같은 제목의 글 찾기"""
+        data = await self._request("GET", "/post/list", params={"blogName": self.blog_name, "page": 1})
+        for post in (data.get("item") or {}).get("posts") or []:
+            if post.get("title") == title and str(post.get("date", ""))[:10] >= since[:10]:
+                return post
+        return None
+
+    async def upload_thumbnail(self, article: dict) -> dict | None:
+        """썸네일 업로드 (파일이 없으면 설정에 따라 로컬 렌더링 또는 원격 다운로드, 블로그용 축소본 우선)"""
+        generator = self.thumbnail_generator
+        thumbnail_path = article.get("thumbnail_path")
+        if not (thumbnail_path and os.path.exists(thumbnail_path)):
+            thumbnail_path = await asyncio.to_thread(
+                generator.get_thumbnail,
+                title=article.get("title", ""),
+                tags=article.get("tags", []),
+                category=article.get("category_key") or article.get("category", ""),
+            )
+        thumbnail_path = await asyncio.to_thread(generator.variant, thumbnail_path, "blog")
+
+        with open(thumbnail_path, "rb") as f:
+            image = f.read()
+        filename = os.path.basename(thumbnail_path)
+        content_type = mimetypes.guess_type(filename)[0] or "image/png"
+
+        data = await self._request(
+            "POST",
+            "/post/attach",
+            params={"blogName": self.blog_name},
+            files={"uploadedfile": (filename, image, content_type)},
+        )
+        return {"url": data.get("url"), "replacer": data.get("replacer")}
+
+    # --- 발행 ---
+
+    async def publish(self, article: dict, with_thumbnail: bool = True) -> dict:
+        """글 한 건 발행
+
+        같은 멱등 키로 이미 발행된 글은 건너뛰고,
+        발행 후 내용이 바뀐 글은 새 글 대신 기존 글을 수정한다.
+        글 작성 요청은 재시도하지 않고 보내기 전에 pending 기록을 남기며,
+        다음 실행에서 pending 기록이 있으면 글 목록에서 이미 올라간 글을 찾아 새로 쓰지 않고 수정한다.
+        """
+        key = self.idempotency_key(article)
+        record = self.get_record(article["id"])
+        if record and record.get("idempotency_key") == key and not record.get("pending"):
+            return {**record, "skipped": True}
+
+        # 같은 배치 안에서 같은 글이 중복 요청되면 첫 요청 결과를 공유
+        if key in self._in_flight:
+            return await self._in_flight[key]
+        post_id = record.get("post_id") if record else None
+        pending = record if record and record.get("pending") else None
+        task = asyncio.ensure_future(self._publish(article, key, with_thumbnail, post_id, pending))
+        self._in_flight[key] = task
+        try:
+            return await task
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _publish(
+        self, article: dict, key: str, with_thumbnail: bool, post_id: str = None, pending: dict = None
+    ) -> dict:
+        async with self._semaphore:
+            if pending:
+                # 지난 실행의 작성 요청이 응답 없이 끝남: 실제로 올라갔으면 그 글을 수정
+                post = await self.find_post(article.get("title", ""), pending["started_at"])
+                post_id = post.get("id") if post else None
+
+            content = article.get("content", "")
+            thumbnail = await self.upload_thumbnail(article) if with_thumbnail else None
+            if thumbnail and thumbnail.get("replacer"):
+                content = f"<p>{thumbnail['replacer']}</p>{content}"
+
+            form = {
+                "blogName": self.blog_name,
+                "title": article.get("title", ""),
+                "content": content,
+                "visibility": str(self.config["visibility"]),
+                "tag": ",".join(article.get("tags", [])),
+            }
+            if post_id:
+                form["postId"] = post_id
+            else:
+                self._save_record({
+                    "id": article["id"],
+                    "idempotency_key": key,
+                    "pending": True,
+                    "started_at": datetime.now().isoformat(),
+                })
+            data = await self._request(
+                "POST",
+                "/post/modify" if post_id else "/post/write",
+                retry=False,
+                headers={"Idempotency-Key": key},
+                data=form,
+            )
+
+        record = {
+            "id": article["id"],
+            "idempotency_key": key,
+            "post_id": data.get("postId") or post_id,
+            "url": data.get("url"),
+            "thumbnail_url": thumbnail.get("url") if thumbnail else None,
+            "published_at": datetime.now().isoformat(),
+        }
+        self._save_record(record)
+        return record
+
+    async def publish_many(self, articles: list[dict], with_thumbnail: bool = True) -> list[dict]:
+        """여러 글 동시 발행 (실패한 글은 error 필드로 반환)"""
+        async def publish_one(article: dict) -> dict:
+            try:
+                return await self.publish(article, with_thumbnail=with_thumbnail)
+            except (PublishError, httpx.HTTPError) as e:
+                return {"id": article.get("id"), "error": str(e)}
+
+        return await asyncio.gather(*(publish_one(article) for article in articles))
+
+
+# 테스트: 로컬 목(mock) 서버를 띄워서 발행 흐름 확인
+if __name__ == "__main__":
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from src.thumbnail_renderer import render_thumbnail
+
+    from urllib.parse import parse_qs
+
+    class MockTistoryHandler(BaseHTTPRequestHandler):
+        posts = {}  # 글 ID → 제목
+        writes = 0
+        lose_next_write = False  # 글은 올리고 응답은 503으로 (응답 유실 흉내)
+
+        def do_GET(self):
+            posts = [
+                {"id": post_id, "title": title, "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+                for post_id, title in self.posts.items()
+            ]
+            self._reply({"status": "200", "item": {"posts": posts}})
+
+        def do_POST(self):
+            raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if self.path.startswith("/apis/post/attach"):
+                body = {"status": "200", "url": "https://mock/img.png", "replacer": "[##_Image|mock|_##]"}
+            else:
+                form = {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+                post_id = form.get("postId")
+                if post_id is None:
+                    MockTistoryHandler.writes += 1
+                    post_id = str(len(self.posts) + 1)
+                self.posts[post_id] = form.get("title", "")
+                if MockTistoryHandler.lose_next_write:
+                    MockTistoryHandler.lose_next_write = False
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                body = {"status": "200", "postId": post_id, "url": f"https://mock.tistory.com/{post_id}"}
+            self._reply(body)
+
+        def _reply(self, body: dict):
+            payload = json.dumps({"tistory": body}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockTistoryHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_port}/apis"
+
+    async def run():
+        with tempfile.TemporaryDirectory() as tmp:
+            thumbnail_path = os.path.join(tmp, "thumbnail.png")
+            with open(thumbnail_path, "wb") as f:
+                f.write(render_thumbnail("ai", size=64))
+            articles = [
+                {"id": f"test-{i:03d}", "title": f"테스트 글 {i}", "content": "<p>본문</p>",
+                 "tags": ["AI"], "thumbnail_path": thumbnail_path}
+                for i in range(10)
+            ]
+
+            publisher = TistoryPublisher(
+                access_token="mock-token",
+                blog_name="mock",
+                api_url=api_url,
+                published_dir=Path(tmp),
+                config={"rate_per_sec": 20},
+            )
+            async with publisher:
+                start = time.perf_counter()
+                results = await publisher.publish_many(articles)
+                print(f"발행 {len(results)}건: {time.perf_counter() - start:.2f}s")
+                print(f"예시: {results[0]}")
+                again = await publisher.publish_many(articles)
+                print(f"재발행 시 건너뜀: {sum(1 for r in again if r.get('skipped'))}건")
+
+                # 작성 응답이 유실된 글: 재시도하지 않고 pending으로 남긴 뒤 다음 발행에서 기존 글을 찾아 수정
+                lost = {**articles[0], "id": "test-lost", "title": "응답 유실 글"}
+                MockTistoryHandler.lose_next_write = True
+                first = (await publisher.publish_many([lost]))[0]
+                print(f"응답 유실: {first.get('error')} / 기록: {publisher.get_record('test-lost')}")
+                second = (await publisher.publish_many([lost]))[0]
+                print(f"다음 발행: {second.get('url')} (작성 요청 {MockTistoryHandler.writes}회, 글 {len(MockTistoryHandler.posts)}개)")
+
+    asyncio.run(run())
+    server.shutdown()